@@ -0,0 +1,89 @@
+"""Combo detection benchmark over a synthetic combo database.
+
+Usage: python -m benchmarks.bench_combos [--combos 40000] [--cards 32000] [--decks 500] [--seed 0]
+
+Builds a ComboIndex from tens of thousands of synthetic 2-5 card combos,
+whose cards are skewed towards a popular few as in real combo databases,
+then matches random 100-card decks with a few combos planted in each.
+Reports the build time and per-deck match latency, next to a naive scan
+that checks every combo against the deck as a set.
+"""
+import argparse
+import random
+import time
+from typing import List
+import numpy as np
+from src.data.combos import Combo, ComboIndex
+
+DECK_SIZE = 100
+PLANTED = 3  # Combos put into every deck
+
+
+def make_combos(count: int, card_count: int, rng: random.Random) -> List[Combo]:
+    """Make combos of 2 to 5 cards, most of them using some popular cards."""
+    popular = card_count // 20
+    combos = []
+    for index in range(count):
+        size = rng.choices((2, 3, 4, 5), weights=(35, 40, 18, 7))[0]
+        cards = set()
+        while len(cards) < size:
+            pool = popular if rng.random() < 0.6 else card_count
+            cards.add(f"Card {rng.randrange(pool):05d}")
+        combos.append(Combo(str(index), sorted(cards), ["Infinite mana"]))
+    return combos
+
+
+def percentile(values: List[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--combos', type=int, default=40_000, help="Combos in the database")
+    parser.add_argument('--cards', type=int, default=32_000, help="Cards in the snapshot")
+    parser.add_argument('--decks', type=int, default=500, help="Decks to match")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    card_ids = {f"card {card_id:05d}": card_id for card_id in range(args.cards)}
+    combos = make_combos(args.combos, args.cards, rng)
+
+    start = time.perf_counter()
+    index = ComboIndex(combos, card_ids, args.cards)
+    print(f"Indexed {len(index):,} combos over {args.cards:,} cards in {time.perf_counter() - start:.2f}s")
+
+    decks = []
+    for _ in range(args.decks):
+        deck = set()
+        for combo in rng.sample(combos, PLANTED):
+            deck.update(card_ids[name.lower()] for name in combo.cards)
+        while len(deck) < DECK_SIZE:
+            deck.add(rng.randrange(args.cards))
+        decks.append(np.array(sorted(deck), dtype=np.int32))
+
+    combo_sets = [frozenset(card_ids[name.lower()] for name in combo.cards) for combo in combos]
+    indexed, naive, found = [], [], 0
+    for deck in decks:
+        start = time.perf_counter()
+        matches = index.match(deck)
+        indexed.append(time.perf_counter() - start)
+        found += len(matches.complete)
+
+        deck_set = set(deck.tolist())
+        start = time.perf_counter()
+        expected = sum(cards <= deck_set for cards in combo_sets)
+        naive.append(time.perf_counter() - start)
+        assert expected == len(matches.complete), "Index and naive scan disagree"
+
+    print(f"{args.decks} decks, {found / args.decks:.1f} combos and "
+          f"{len(matches.near)} near misses in the last deck")
+    for label, timings in (("indexed", indexed), ("naive scan", naive)):
+        print(f"{label:>10}: p50 {percentile(timings, 0.5) * 1e6:8.0f} µs  "
+              f"p99 {percentile(timings, 0.99) * 1e6:8.0f} µs per deck")
+
+
+if __name__ == "__main__":
+    main()
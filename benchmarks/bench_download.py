@@ -0,0 +1,102 @@
+"""End-to-end benchmark of CardDataDownloader.download() against local stand-ins.
+
+Usage: python -m benchmarks.bench_download [--scale 0.1] [--latency 0.02] [--error-rate 0.01]
+                                           [--rate-limit-rate 0.02] [--concurrency 8] [--average-decks]
+                                           [--cassette DIR [--record]]
+
+Serves a synthetic corpus (or a recorded cassette) from FakeServices and runs
+a full download into a temporary directory: bulk data lookup, streaming the
+oracle file, processing, and EDHREC enrichment with its retries. Reports the
+time taken and what the server saw. With --record the real Scryfall and
+EDHREC are fetched once through the server and saved to the cassette, so
+later runs replay them offline.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+from benchmarks.fake_services import Cassette, FakeServices
+from benchmarks.synthetic_corpus import CorpusGenerator
+from src.data.card_data_downloader import CardDataDownloader
+
+
+async def run_download(services: FakeServices, concurrency: int, average_decks: bool,
+                       retry_delay: float) -> dict:
+    """Run one download against the services and summarize it."""
+    await services.start()
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            downloader = CardDataDownloader(
+                fetch_average_decks=average_decks,
+                data_dir=Path(data_dir),
+                scryfall_api=services.scryfall_api,
+                edhrec_api=services.edhrec_api,
+                max_concurrent_requests=concurrency,
+            )
+            downloader.RETRY_DELAY = retry_delay
+            log = io.StringIO()
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(log):
+                await downloader.download()
+            elapsed = time.perf_counter() - start
+            saved_file = Path(data_dir) / 'oracle_cards.json'
+            cards = json.loads(saved_file.read_text(encoding='utf-8')) if saved_file.exists() else {}
+    finally:
+        await services.stop()
+
+    return {
+        'seconds': elapsed,
+        'cards': len(cards),
+        'enriched': sum('edhrec_data' in card for card in cards.values()),
+        'average_decks': len(downloader.average_decks),
+        'retries': downloader.retries,
+        'gave_up': log.getvalue().count('Giving up'),
+        'server': dict(services.stats),
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=0.1, help="Synthetic corpus size as a multiple of the oracle cards")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--latency', type=float, default=0.02, help="Seconds every response is delayed")
+    parser.add_argument('--error-rate', type=float, default=0.01, help="Share of requests answered with a 500")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.02, help="Share of requests answered with a 429")
+    parser.add_argument('--retry-after', type=float, default=0.05, help="Retry-After seconds sent with each 429")
+    parser.add_argument('--retry-delay', type=float, default=0.05, help="Downloader's first backoff, in seconds")
+    parser.add_argument('--concurrency', type=int, default=CardDataDownloader.MAX_CONCURRENT_REQUESTS,
+                        help="EDHREC requests in flight at once")
+    parser.add_argument('--average-decks', action='store_true', help="Also fetch average decks")
+    parser.add_argument('--cassette', type=Path, help="Directory of recorded responses to replay")
+    parser.add_argument('--record', action='store_true', help="Record the real services into --cassette")
+    args = parser.parse_args()
+
+    cards = [] if args.record else list(CorpusGenerator(args.scale, args.seed).raw_cards())
+    services = FakeServices(
+        cards,
+        cassette=Cassette(args.cassette) if args.cassette else None,
+        record=args.record,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+    summary = asyncio.run(run_download(services, args.concurrency, args.average_decks, args.retry_delay))
+
+    server = summary['server']
+    print(f"Downloaded {summary['cards']:,} cards, {summary['enriched']:,} commanders enriched, "
+          f"{summary['average_decks']:,} average decks in {summary['seconds']:.2f}s")
+    print(f"Server: {server.get('requests', 0):,} requests, {server.get('rate_limited', 0)} rate limited, "
+          f"{server.get('errors', 0)} errors, {server.get('replayed', 0)} replayed, "
+          f"{server.get('recorded', 0)} recorded")
+    print(f"Downloader: {summary['retries']} retries, gave up on {summary['gave_up']} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Throughput benchmark for the unbracketed card name detector.
+
+Usage: python -m benchmarks.bench_name_detector [--data oracle_cards.json] [--corpus chat.txt] [--rounds N]
+
+Scans every line of a recorded chat corpus (one message per line) with the
+detector built from a card snapshot and reports messages per second.
+"""
+import argparse
+import time
+from pathlib import Path
+from src.data.card_data import CardData
+from src.data.name_detector import NameDetector
+
+DEFAULT_CORPUS = Path(__file__).parent / 'data' / 'chat_corpus.txt'
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=None, help="Card snapshot, defaults to reference/oracle_cards.json")
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS, help="Chat corpus, one message per line")
+    parser.add_argument('--rounds', type=int, default=200, help="Times to scan the whole corpus")
+    args = parser.parse_args()
+
+    card_data = CardData(args.data)
+    messages = [line for line in args.corpus.read_text(encoding='utf-8').splitlines() if line.strip()]
+
+    start = time.perf_counter()
+    detector = NameDetector(card_data)
+    build_seconds = time.perf_counter() - start
+    print(f"Built detector over {detector.pattern_count} names "
+          f"({len(detector.automaton)} states) in {build_seconds:.2f}s")
+
+    detections = sum(len(detector.detect(message)) for message in messages)
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        for message in messages:
+            detector.detect(message)
+    elapsed = time.perf_counter() - start
+
+    scanned = len(messages) * args.rounds
+    print(f"{len(messages)} messages, {detections} card names detected per pass")
+    print(f"{scanned / elapsed:,.0f} messages/s ({elapsed / scanned * 1e6:.1f} µs/message)")
+
+
+if __name__ == "__main__":
+    main()
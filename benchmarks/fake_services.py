@@ -0,0 +1,250 @@
+"""Local stand-ins for Scryfall and EDHREC, with fault injection and record/replay.
+
+FakeServices serves everything the bot and the downloader fetch:
+
+    /scryfall/bulk-data                       bulk data index
+    /scryfall-data/oracle-cards.json          the oracle cards bulk file
+    /scryfall/cards/{id}/rulings              rulings
+    /edhrec/pages/commanders/{slug}.json      EDHREC commander pages
+    /edhrec/pages/average-decks/{slug}.json   EDHREC average decks
+
+Responses come from a cassette when it has the request, otherwise they are
+synthesized from the given raw cards. Every response can be delayed, and a
+share of them fail with a 500 or are rate limited with a 429.
+
+In record mode requests are forwarded to the real services instead, and the
+responses saved to the cassette with the real hosts pointing at the local
+server, so replays work on any port.
+"""
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+import aiohttp
+from aiohttp import web
+
+UPSTREAMS = {
+    'scryfall': 'https://api.scryfall.com',
+    'scryfall-data': 'https://data.scryfall.io',
+    'edhrec': 'https://json.edhrec.com',
+}
+BASE_URL_PLACEHOLDER = '{{base_url}}'
+EDHREC_SECTIONS = (('highsynergycards', 'High Synergy Cards'), ('topcards', 'Top Cards'),
+                   ('creatures', 'Creatures'), ('instants', 'Instants'), ('utilitylands', 'Utility Lands'))
+
+
+class Cassette:
+    """Recorded responses by request path, stored as an index plus one file per body."""
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.index_file = self.directory / 'index.json'
+        self.entries: Dict[str, dict] = {}
+        if self.index_file.exists():
+            self.entries = json.loads(self.index_file.read_text(encoding='utf-8'))
+
+    def get(self, path: str) -> Optional[web.Response]:
+        """Get the recorded response for a path, if any, with the base URL still a placeholder."""
+        entry = self.entries.get(path)
+        if entry is None:
+            return None
+        body = (self.directory / entry['body']).read_bytes()
+        return web.Response(status=entry['status'], body=body, content_type=entry['content_type'])
+
+    def put(self, path: str, status: int, content_type: str, body: bytes):
+        """Record a response."""
+        name = hashlib.sha1(path.encode('utf-8')).hexdigest()[:16] + '.body'
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / name).write_bytes(body)
+        self.entries[path] = {'status': status, 'content_type': content_type, 'body': name}
+
+    def save(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.index_file.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding='utf-8')
+
+
+class FakeServices:
+    """Serves Scryfall and EDHREC responses locally, with configurable latency and faults."""
+
+    def __init__(
+        self,
+        cards: Optional[List[dict]] = None,
+        cassette: Optional[Cassette] = None,
+        record: bool = False,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 0.05,
+        rulings_per_card: int = 2,
+        seed: int = 0,
+        upstreams: Dict[str, str] = UPSTREAMS,
+    ):
+        """Create the services.
+
+        Args:
+            cards: Raw Scryfall cards to serve as the oracle bulk file and to synthesize EDHREC pages from.
+            cassette: Recorded responses, served in preference to synthesized ones.
+            record: Forward requests to the upstreams and record the responses into the cassette.
+            latency: Seconds every response is delayed.
+            error_rate: Share of requests answered with a 500.
+            rate_limit_rate: Share of requests answered with a 429.
+            retry_after: Retry-After seconds sent with each 429.
+            rulings_per_card: Rulings synthesized for every card.
+            seed: Seed for the faults and synthesized pages.
+            upstreams: Real base URL for each path prefix, used when recording.
+        """
+        if record and cassette is None:
+            raise ValueError("Recording needs a cassette")
+        self.cards = cards or []
+        self.cassette = cassette
+        self.record = record
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rulings_per_card = rulings_per_card
+        self.seed = seed
+        self.upstreams = upstreams
+        self.rng = random.Random(seed)
+        self.stats: Counter = Counter()
+        self.base_url = ''
+        self._names = [card['name'] for card in self.cards]
+        self._oracle_body: Optional[bytes] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def scryfall_api(self) -> str:
+        return f"{self.base_url}/scryfall"
+
+    @property
+    def edhrec_api(self) -> str:
+        return f"{self.base_url}/edhrec/pages"
+
+    def rulings_uri(self, card_id: int) -> str:
+        """Get the rulings URL to store on a card."""
+        return f"{self.scryfall_api}/cards/{card_id}/rulings"
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        """Apply latency and faults, then answer from the upstream, the cassette or the synthetic handlers."""
+        self.stats['requests'] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            self.stats['rate_limited'] += 1
+            return web.Response(status=429, headers={'Retry-After': f"{self.retry_after:g}"})
+        if roll < self.rate_limit_rate + self.error_rate:
+            self.stats['errors'] += 1
+            return web.Response(status=500)
+
+        if self.record:
+            self.stats['recorded'] += 1
+            return await self._forward(request.path_qs)
+        response = self.cassette.get(request.path_qs) if self.cassette else None
+        if response is not None:
+            self.stats['replayed'] += 1
+            return self._localize(response)
+        self.stats['synthesized'] += 1
+        return await handler(request)
+
+    async def _forward(self, path: str) -> web.Response:
+        """Fetch a path from its upstream and record the response."""
+        prefix, _, rest = path.lstrip('/').partition('/')
+        if prefix not in self.upstreams:
+            return web.Response(status=404)
+        async with self._session.get(f"{self.upstreams[prefix]}/{rest}") as upstream:
+            body = await upstream.read()
+            status, content_type = upstream.status, upstream.content_type
+        if content_type == 'application/json':
+            text = body.decode('utf-8')
+            for name, url in self.upstreams.items():
+                text = text.replace(url, f"{BASE_URL_PLACEHOLDER}/{name}")
+            body = text.encode('utf-8')
+        self.cassette.put(path, status, content_type, body)
+        return self._localize(web.Response(status=status, body=body, content_type=content_type))
+
+    def _localize(self, response: web.Response) -> web.Response:
+        """Point recorded URLs at this server."""
+        if response.content_type == 'application/json' and BASE_URL_PLACEHOLDER.encode() in response.body:
+            response.body = response.body.replace(BASE_URL_PLACEHOLDER.encode(), self.base_url.encode())
+        return response
+
+    async def _handle_bulk_data(self, request: web.Request) -> web.Response:
+        return web.json_response({'object': 'list', 'has_more': False, 'data': [{
+            'object': 'bulk_data',
+            'type': 'oracle_cards',
+            'name': 'Oracle Cards',
+            'download_uri': f"{self.base_url}/scryfall-data/oracle-cards.json",
+            'content_type': 'application/json',
+        }]})
+
+    async def _handle_oracle_cards(self, request: web.Request) -> web.Response:
+        if self._oracle_body is None:
+            self._oracle_body = json.dumps(self.cards, ensure_ascii=False).encode('utf-8')
+        return web.Response(body=self._oracle_body, content_type='application/json')
+
+    async def _handle_rulings(self, request: web.Request) -> web.Response:
+        card_id = request.match_info['card_id']
+        data = [
+            {
+                "object": "ruling",
+                "source": "wotc",
+                "published_at": "2021-06-18",
+                "comment": f"Ruling {index + 1} for card {card_id}.",
+            }
+            for index in range(self.rulings_per_card)
+        ]
+        return web.json_response({"object": "list", "has_more": False, "data": data})
+
+    async def _handle_commander(self, request: web.Request) -> web.Response:
+        """Synthesize a commander page, the same for a slug every time."""
+        rng = random.Random(f"{self.seed}:{request.match_info['slug']}")
+        potential_decks = rng.randint(50, 20000)
+        cardlists = [
+            {'tag': tag, 'header': header, 'cardviews': [
+                {'name': name, 'synergy': round(rng.uniform(-0.2, 0.8), 2),
+                 'num_decks': rng.randint(0, potential_decks), 'potential_decks': potential_decks}
+                for name in rng.sample(self._names, min(len(self._names), 60))
+            ]}
+            for tag, header in EDHREC_SECTIONS
+        ]
+        return web.json_response({'container': {'json_dict': {
+            'card': {'name': request.match_info['slug'], 'potential_decks': potential_decks},
+            'cardlists': cardlists,
+        }}})
+
+    async def _handle_average_deck(self, request: web.Request) -> web.Response:
+        rng = random.Random(f"{self.seed}:deck:{request.match_info['slug']}")
+        names = rng.sample(self._names, min(len(self._names), 99))
+        return web.json_response({'deck': [f"1 {name}" for name in names]})
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        app = web.Application(middlewares=[self._middleware], client_max_size=0)
+        app.router.add_get('/scryfall/bulk-data', self._handle_bulk_data)
+        app.router.add_get('/scryfall-data/oracle-cards.json', self._handle_oracle_cards)
+        app.router.add_get('/scryfall/cards/{card_id}/rulings', self._handle_rulings)
+        app.router.add_get('/edhrec/pages/commanders/{slug}.json', self._handle_commander)
+        app.router.add_get('/edhrec/pages/average-decks/{slug}.json', self._handle_average_deck)
+        if self.record:
+            self._session = aiohttp.ClientSession()
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        """Stop serving, saving what was recorded."""
+        if self._session:
+            await self._session.close()
+        if self._runner:
+            await self._runner.cleanup()
+        if self.record:
+            self.cassette.save()
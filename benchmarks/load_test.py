@@ -0,0 +1,206 @@
+"""Synthetic load test for the /card command path, no Discord connection needed.
+
+Usage: python -m benchmarks.load_test [--data oracle_cards.json] [--rate 20] [--requests 200]
+                                      [--mix exact=0.6,misspelled=0.3,ambiguous=0.1]
+
+Fake interactions are sent through the /card handler registered by the bot
+(defer -> CardInfoCommand.execute -> _format_card_info -> followup send) at a
+target rate, with rulings served by a local Scryfall stand-in. Reports
+throughput and p50/p95/p99 latency per stage.
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+from benchmarks.fake_services import FakeServices
+from src.bot.discord_bot import CommanderBot
+from src.data.card_data import CardData
+from src.monitoring.metrics import STAGE_SECONDS
+
+QUERY_KINDS = ('exact', 'misspelled', 'ambiguous')
+
+
+class FakeResponse:
+    """Stands in for discord.InteractionResponse with a simulated round trip."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.deferred = False
+
+    def is_done(self) -> bool:
+        return self.deferred
+
+    async def defer(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.deferred = True
+
+    async def send_message(self, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.deferred = True
+
+
+class FakeFollowup:
+    """Stands in for the interaction webhook, counting messages sent."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.messages = 0
+
+    async def send(self, *args, **kwargs):
+        await asyncio.sleep(self.latency)
+        self.messages += 1
+
+
+class FakeInteraction:
+    def __init__(self, latency: float):
+        self.response = FakeResponse(latency)
+        self.followup = FakeFollowup(latency)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """Parse "exact=0.6,misspelled=0.3,ambiguous=0.1" into normalized weights."""
+    mix = {}
+    for part in text.split(','):
+        kind, _, weight = part.partition('=')
+        if kind.strip() not in QUERY_KINDS:
+            raise ValueError(f"Unknown query kind {kind!r}, expected one of {QUERY_KINDS}")
+        mix[kind.strip()] = float(weight)
+    total = sum(mix.values())
+    return {kind: weight / total for kind, weight in mix.items()}
+
+
+def _misspell(name: str, rng: random.Random) -> str:
+    """Apply one typo: drop, swap or replace a letter."""
+    if len(name) < 4:
+        return name
+    index = rng.randrange(1, len(name) - 1)
+    typo = rng.choice(('drop', 'swap', 'replace'))
+    if typo == 'drop':
+        return name[:index] + name[index + 1:]
+    if typo == 'swap':
+        return name[:index - 1] + name[index] + name[index - 1] + name[index + 1:]
+    return name[:index] + rng.choice('aeiourstln') + name[index + 1:]
+
+
+def make_queries(card_data: CardData, mix: Dict[str, float], count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """Build (kind, query) pairs: exact names, names with a typo, and partial names that match many cards."""
+    rng = random.Random(seed)
+    names = [card_data.cards[key]['name'] for key in card_data.names]
+    multi_word = [name for name in names if ' ' in name] or names
+    kinds = rng.choices(list(mix), weights=list(mix.values()), k=count)
+    queries = []
+    for kind in kinds:
+        if kind == 'exact':
+            query = rng.choice(names)
+        elif kind == 'misspelled':
+            query = _misspell(rng.choice(names), rng)
+        else:
+            query = rng.choice(multi_word).split()[0]
+        queries.append((kind, query))
+    return queries
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Get the p50/p95/p99 of samples in milliseconds."""
+    values = np.percentile(np.array(samples) * 1000, [50, 95, 99])
+    return {'count': len(samples), 'p50_ms': values[0], 'p95_ms': values[1], 'p99_ms': values[2]}
+
+
+async def run_load_test(card_data: CardData, queries: List[Tuple[str, str]], rate: float,
+                        discord_latency: float = 0.03, rulings_latency: float = 0.05) -> dict:
+    """Replay queries through the /card handler at a target rate and collect per-stage latencies."""
+    scryfall = FakeServices(latency=rulings_latency)
+    await scryfall.start()
+    for card_id, key in enumerate(card_data.names):
+        card_data.cards[key]['rulings_uri'] = scryfall.rulings_uri(card_id)
+
+    bot = CommanderBot(card_data)
+    bot._register_commands()
+    handler = bot.tree.get_command('card').callback
+
+    totals: Dict[str, List[float]] = {kind: [] for kind in QUERY_KINDS}
+    errors = 0
+
+    async def one(kind: str, query: str):
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            await handler(FakeInteraction(discord_latency), query)
+        except Exception as e:
+            errors += 1
+            print(f"Error for {query!r}: {e}")
+            return
+        totals[kind].append(time.perf_counter() - start)
+
+    STAGE_SECONDS.capture_samples()
+    tasks = []
+    start = time.perf_counter()
+    try:
+        for index, (kind, query) in enumerate(queries):
+            # Open-loop arrivals: requests keep coming even when the bot falls behind
+            delay = start + index / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(one(kind, query)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        samples = STAGE_SECONDS.samples()
+    finally:
+        STAGE_SECONDS.capture_samples(False)
+        if bot.card_info.session:
+            await bot.card_info.session.close()
+        await scryfall.stop()
+
+    stages = {stage: percentiles(stage_samples)
+              for (command, stage), stage_samples in samples.items() if command == 'card'}
+    completed = sum(len(samples) for samples in totals.values())
+    return {
+        'requests': len(queries),
+        'errors': errors,
+        'target_rate': rate,
+        'throughput': completed / elapsed,
+        'stages': stages,
+        'totals': {kind: percentiles(samples) for kind, samples in totals.items() if samples},
+        'rulings_requests': scryfall.stats['requests'],
+    }
+
+
+def print_report(report: dict):
+    """Print the load test results as a table."""
+    print(f"{report['requests']} requests at {report['target_rate']:g}/s target: "
+          f"{report['throughput']:.1f}/s completed, {report['errors']} errors, "
+          f"{report['rulings_requests']} rulings fetched")
+    print(f"{'':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = [(f"stage {stage}", stats) for stage, stats in report['stages'].items()]
+    rows += [(f"total {kind}", stats) for kind, stats in report['totals'].items()]
+    for label, stats in rows:
+        print(f"{label:<22}{stats['count']:>7}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', type=Path, default=None, help="Card snapshot, defaults to reference/oracle_cards.json")
+    parser.add_argument('--rate', type=float, default=20.0, help="Target requests per second")
+    parser.add_argument('--requests', type=int, default=200, help="Number of requests to send")
+    parser.add_argument('--mix', default='exact=0.6,misspelled=0.3,ambiguous=0.1', help="Query mix weights")
+    parser.add_argument('--discord-latency', type=float, default=0.03, help="Simulated Discord round trip, seconds")
+    parser.add_argument('--rulings-latency', type=float, default=0.05, help="Simulated Scryfall rulings latency")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help="Also write the report as JSON")
+    args = parser.parse_args()
+
+    card_data = CardData(args.data)
+    queries = make_queries(card_data, parse_mix(args.mix), args.requests, args.seed)
+    report = asyncio.run(run_load_test(card_data, queries, args.rate, args.discord_latency, args.rulings_latency))
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
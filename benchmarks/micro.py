@@ -0,0 +1,305 @@
+"""Micro-benchmarks for card loading, lookup, fuzzy matching and rendering.
+
+Usage: python -m benchmarks.micro [--baseline FILE] [--tolerance 0.25] [--output FILE]
+                                  [--update-baseline] [--only NAME ...]
+
+Runs against the pinned fixture in benchmarks/data/fixture_cards.json.gz: a
+Scryfall bulk download of 2.5k synthetic cards, and the EDHREC cardlists of
+its commanders, which are attached after processing as the downloader's
+enrichment step does. Rendering measures formatting only, as the rulings
+URLs aren't served. Each benchmark's best time per operation is compared
+with the stored baseline; anything slower by more than the tolerance is a
+regression and the run exits with status 1. The ratio scaled by a
+calibration workload is printed too, as a hint of how busy the machine was.
+
+The fixture is built by the synthetic corpus generator and can be
+reproduced exactly with:
+
+    python -m benchmarks.synthetic_corpus --fixture
+
+Baselines are machine specific: record one with --update-baseline on the
+machine that runs the comparison, and again whenever the fixture changes.
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import gzip
+import hashlib
+import io
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from src.commands.card_info import CardInfoCommand
+from src.data.card_data import CardData
+from src.data.card_data_downloader import CardDataDownloader
+from src.data.power import tag_power_features
+from benchmarks.synthetic_corpus import FIXTURE
+BASELINE = Path(__file__).parent / 'data' / 'micro_baseline.json'
+DEFAULT_TOLERANCE = 0.25  # Allowed slowdown vs. the baseline, as a fraction
+MIN_SAMPLE_SECONDS = 0.1  # Each timed sample loops until it takes at least this long
+REPEAT = 7
+CALIBRATION_REPEAT = 21  # More samples than a benchmark, for a steadier median
+
+
+class Comparison(NamedTuple):
+    """One benchmark's result against the baseline."""
+    name: str
+    baseline: Optional[float]  # Seconds per operation as recorded, None for a new benchmark
+    current: float
+    status: str  # "ok", "faster", "regression" or "new"
+    scaled_baseline: Optional[float] = None  # The baseline scaled by the calibration workload
+
+    @property
+    def ratio(self) -> Optional[float]:
+        return self.current / self.baseline if self.baseline else None
+
+    @property
+    def scaled_ratio(self) -> Optional[float]:
+        return self.current / self.scaled_baseline if self.scaled_baseline else None
+
+
+def fixture_digest(path: Path) -> str:
+    """Identify a fixture by its uncompressed content, so results are only compared on the same data."""
+    with gzip.open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def load_fixture(path: Path = FIXTURE) -> Tuple[List[dict], Dict[str, dict]]:
+    """Get a fixture's raw bulk cards and its commanders' EDHREC cardlists by snapshot key."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        data = json.load(f)
+    return data['cards'], data['edhrec']
+
+
+def measure(run: Callable[[], None], ops: int, repeat: int = REPEAT) -> Dict[str, float]:
+    """Time a benchmark, returning its best and median seconds per operation.
+
+    Like timeit, garbage collection is paused while timing.
+    """
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _measure(run, ops, repeat)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _measure(run: Callable[[], None], ops: int, repeat: int) -> Dict[str, float]:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        if time.perf_counter() - start >= MIN_SAMPLE_SECONDS:
+            break
+        number *= 2
+
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            run()
+        samples.append((time.perf_counter() - start) / (number * ops))
+    samples.sort()
+    return {'seconds_per_op': samples[0], 'median_per_op': samples[len(samples) // 2], 'ops': ops, 'loops': number}
+
+
+def _calibration_workload():
+    """Fixed pure-Python work used to gauge the speed of the machine."""
+    words = [f"card {index * 7919 % 100003}" for index in range(20000)]
+    counts: Dict[str, int] = {}
+    for word in sorted(words):
+        counts[word.lower()] = counts.get(word.lower(), 0) + 1
+
+
+class Suite:
+    """The benchmarks, sharing one CardData loaded from the fixture."""
+
+    def __init__(self, raw_cards: List[dict], edhrec: Dict[str, dict], work_dir: Path, seed: int = 0):
+        self.raw_cards = raw_cards
+        self.downloader = CardDataDownloader()
+        self.processed = self.downloader._process_cards(raw_cards)
+        for key, edhrec_data in edhrec.items():
+            self.processed[key]['edhrec_data'] = edhrec_data
+        # Rendering is measured without fetching rulings
+        for card in self.processed.values():
+            card.pop('rulings_uri', None)
+        # Saved snapshots carry the power features tagged at download
+        tag_power_features(self.processed.values())
+        data_file = work_dir / 'oracle_cards.json'
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump(self.processed, f)
+        self.card_data = CardData(data_file)
+        self.card_info = CardInfoCommand(self.card_data)
+        self.loop = asyncio.new_event_loop()
+
+        rng = random.Random(seed)
+        names = [self.card_data.cards[key]['name'] for key in self.card_data.names]
+        self.lookup_names = rng.sample(names, 500) + [f"{name}x" for name in rng.sample(names, 100)]
+        words = sorted({word for name in names for word in name.split() if len(word) > 3})
+        self.search_queries = rng.sample(words, 20) + ['zzz', 'of the']
+        # One dropped letter, as users typically misspell
+        self.misspelled = []
+        for name in rng.sample(names, 10):
+            index = rng.randrange(1, len(name) - 1)
+            self.misspelled.append(name[:index] + name[index + 1:])
+        commanders = [card for card in self.card_data.cards.values() if 'edhrec_data' in card]
+        self.format_cards = rng.sample(commanders, 50) + rng.sample(list(self.card_data.cards.values()), 150)
+
+    def benchmarks(self) -> Dict[str, Tuple[Callable[[], None], int]]:
+        """Get each benchmark's single round and the number of operations in it."""
+        return {
+            'load_cards': (self.card_data._load_cards, 1),
+            'get_card': (self._get_card, len(self.lookup_names)),
+            'search_cards': (self._search_cards, len(self.search_queries)),
+            'fuzzy_execute': (self._fuzzy_execute, len(self.misspelled)),
+            'process_cards': (lambda: self.downloader._process_cards(self.raw_cards), 1),
+            'is_commander': (self._is_commander, 1),
+            'format_card_info': (self._format_card_info, len(self.format_cards)),
+        }
+
+    def _get_card(self):
+        for name in self.lookup_names:
+            self.card_data.get_card(name)
+
+    def _search_cards(self):
+        for query in self.search_queries:
+            self.card_data.search_cards(query)
+
+    def _fuzzy_execute(self):
+        async def run():
+            for query in self.misspelled:
+                await self.card_info.execute(query)
+        self.loop.run_until_complete(run())
+
+    def _is_commander(self):
+        sum(CardDataDownloader._is_commander(card) for card in self.processed.values())
+
+    def _format_card_info(self):
+        async def run():
+            for card in self.format_cards:
+                await self.card_info._format_card_info(card)
+        self.loop.run_until_complete(run())
+
+    def close(self):
+        self.loop.close()
+
+
+def _calibrate() -> float:
+    """Time the calibration workload, taking the median as a single best sample is too noisy."""
+    return measure(_calibration_workload, 1, CALIBRATION_REPEAT)['median_per_op']
+
+
+def run_suite(fixture: Path = FIXTURE, only: Optional[List[str]] = None) -> dict:
+    """Run the benchmarks against a fixture and return the results document."""
+    raw_cards, edhrec = load_fixture(fixture)
+
+    results = {}
+    calibration = _calibrate()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # CardData reports every reload; keep the benchmark output readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            suite = Suite(raw_cards, edhrec, Path(work_dir))
+        try:
+            for name, (run, ops) in suite.benchmarks().items():
+                if only and name not in only:
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results[name] = measure(run, ops)
+                print(f"{name:<18}{results[name]['seconds_per_op'] * 1e6:>14,.2f} µs/op")
+        finally:
+            suite.close()
+    calibration = min(calibration, _calibrate())
+
+    return {
+        'fixture': fixture_digest(fixture),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+        'recorded': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'calibration': calibration,
+        'results': results,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> List[Comparison]:
+    """Compare each benchmark's best time per operation with the baseline.
+
+    The status comes from the recorded times. The baseline scaled by how
+    much faster or slower the calibration workload ran is reported alongside
+    to help tell a busy machine from a real regression, but isn't used to
+    pass or fail: on a shared machine the calibration varies as much as the
+    benchmarks do.
+    """
+    if results['fixture'] != baseline['fixture']:
+        raise ValueError(
+            f"Baseline was recorded on fixture {baseline['fixture']}, not {results['fixture']}; "
+            f"record a new one with --update-baseline"
+        )
+    scale = results['calibration'] / baseline['calibration']
+    comparisons = []
+    for name, result in results['results'].items():
+        current = result['seconds_per_op']
+        previous = baseline['results'].get(name, {}).get('seconds_per_op')
+        if previous is None:
+            status = 'new'
+        elif current > previous * (1 + tolerance):
+            status = 'regression'
+        elif current < previous / (1 + tolerance):
+            status = 'faster'
+        else:
+            status = 'ok'
+        scaled = previous * scale if previous is not None else None
+        comparisons.append(Comparison(name, previous, current, status, scaled))
+    return comparisons
+
+
+def print_comparison(comparisons: List[Comparison]):
+    """Print the comparison as a table."""
+    print(f"\n{'benchmark':<18}{'base µs':>14}{'current µs':>14}{'ratio':>8}{'scaled':>8}  status")
+    for comparison in comparisons:
+        baseline = f"{comparison.baseline * 1e6:,.2f}" if comparison.baseline else '-'
+        ratio = f"{comparison.ratio:.2f}x" if comparison.ratio else '-'
+        scaled_ratio = f"{comparison.scaled_ratio:.2f}x" if comparison.scaled_ratio else '-'
+        status = comparison.status.upper() if comparison.status == 'regression' else comparison.status
+        print(f"{comparison.name:<18}{baseline:>14}{comparison.current * 1e6:>14,.2f}{ratio:>8}{scaled_ratio:>8}  {status}")
+
+
+def main():
+    """Run the suite and compare it with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', type=Path, default=BASELINE, help="Stored baseline results")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before failing, e.g. 0.25 for 25%%")
+    parser.add_argument('--output', type=Path, help="Write this run's results as JSON")
+    parser.add_argument('--update-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--only', nargs='+', help="Only run these benchmarks")
+    args = parser.parse_args()
+
+    results = run_suite(only=args.only)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; record one with --update-baseline")
+        return
+
+    comparisons = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+    print_comparison(comparisons)
+    regressions = [comparison.name for comparison in comparisons if comparison.status == 'regression']
+    if regressions:
+        print(f"\nREGRESSION: {', '.join(regressions)} slower than the baseline by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
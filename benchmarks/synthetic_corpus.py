@@ -0,0 +1,491 @@
+"""Synthetic Scryfall-shaped card corpus at any multiple of the oracle corpus size.
+
+Usage: python -m benchmarks.synthetic_corpus --scale 10 [--output FILE] [--raw] [--seed 0]
+       python -m benchmarks.synthetic_corpus --fixture
+
+Generates cards with the shape and rough statistics of Scryfall's oracle
+cards: name lengths and word frequencies, multi-face layouts with card_faces,
+token all_parts, mana curves, color identities, legalities and oracle text
+built from ability templates. By default cards are run through the
+downloader's processing and written as the snapshot it saves, with EDHREC
+cardlists on every commander, so the result loads straight into CardData.
+With --raw the Scryfall bulk file is written instead, before processing.
+With --fixture the micro-benchmark fixture is regenerated: the bulk file
+and the EDHREC cardlists of its commanders, kept apart as they are
+downloaded, at FIXTURE_SCALE.
+
+Cards are written as they are generated, so only the card names are kept in
+memory, even at 100x.
+"""
+import argparse
+import gzip
+import json
+import math
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from src.data.card_data_downloader import Card, CardDataDownloader
+from src.data.edhrec_lists import MAX_CARDS_PER_SECTION, encode_cardlists
+from src.data.power import tag_power_features
+
+ORACLE_CARDS = 32_000  # Cards in Scryfall's oracle bulk file, the 1x scale
+CHUNK_SIZE = 1000  # Cards processed and written at a time
+FIXTURE_SCALE = 2500 / ORACLE_CARDS  # Size of the micro-benchmark fixture
+FIXTURE = Path(__file__).parent / 'data' / 'fixture_cards.json.gz'
+
+COLORS = 'WUBRG'
+BASIC_LANDS = {'W': 'Plains', 'U': 'Island', 'B': 'Swamp', 'R': 'Mountain', 'G': 'Forest'}
+FORMATS = (
+    'standard', 'future', 'historic', 'timeless', 'gladiator', 'pioneer', 'explorer', 'modern', 'legacy',
+    'pauper', 'vintage', 'penny', 'commander', 'oathbreaker', 'standardbrawl', 'brawl', 'alchemy',
+    'paupercommander', 'duel', 'oldschool', 'premodern', 'predh',
+)
+
+# Share of each kind of card, roughly as in the oracle file
+CARD_KINDS = (
+    ('creature', 0.40), ('legendary_creature', 0.09), ('instant', 0.11), ('sorcery', 0.10),
+    ('enchantment', 0.09), ('artifact', 0.09), ('land', 0.05), ('planeswalker', 0.015), ('token', 0.055),
+)
+MULTI_FACE_LAYOUTS = (('transform', 0.025), ('modal_dfc', 0.015), ('adventure', 0.01), ('split', 0.01))
+COLOR_COUNTS = ((0, 0.10), (1, 0.64), (2, 0.19), (3, 0.05), (4, 0.005), (5, 0.015))
+MANA_VALUES = ((0, 0.03), (1, 0.12), (2, 0.22), (3, 0.22), (4, 0.17), (5, 0.11), (6, 0.07), (7, 0.04), (8, 0.02))
+RARITIES = (('common', 0.35), ('uncommon', 0.30), ('rare', 0.28), ('mythic', 0.07))
+SETS = (
+    ('lea', 'Limited Edition Alpha'), ('mir', 'Mirage'), ('ulg', "Urza's Legacy"), ('ody', 'Odyssey'),
+    ('rav', 'Ravnica: City of Guilds'), ('zen', 'Zendikar'), ('isd', 'Innistrad'), ('c13', 'Commander 2013'),
+    ('khm', 'Kaldheim'), ('mh2', 'Modern Horizons 2'), ('neo', 'Kamigawa: Neon Dynasty'),
+    ('dmu', 'Dominaria United'), ('woe', 'Wilds of Eldraine'), ('lci', 'The Lost Caverns of Ixalan'),
+    ('cmm', 'Commander Masters'), ('otj', 'Outlaws of Thunder Junction'), ('dsk', 'Duskmourn: House of Horror'),
+)
+
+# Real card names reuse a small set of words heavily ("of", "the", "Dragon", ...)
+COMMON_WORDS = (
+    'Angel', 'Ancient', 'Blade', 'Blood', 'Bond', 'Call', 'Champion', 'Dark', 'Dawn', 'Death', 'Dragon', 'Dream',
+    'Elder', 'Fire', 'Flame', 'Force', 'Ghost', 'Giant', 'Golden', 'Grave', 'Guardian', 'Heart', 'Hunter', 'Iron',
+    'Knight', 'Life', 'Light', 'Lord', 'Mind', 'Moon', 'Night', 'Oath', 'Primal', 'Rage', 'Sacred', 'Sea',
+    'Shadow', 'Shield', 'Silver', 'Sky', 'Soul', 'Spirit', 'Stone', 'Storm', 'Sun', 'Sword', 'Thorn', 'Thunder',
+    'Time', 'Vampire', 'Vision', 'War', 'Wild', 'Wind', 'Witch', 'Wolf', 'World',
+)
+ONSETS = ('', 'b', 'br', 'c', 'ch', 'cr', 'd', 'dr', 'f', 'g', 'gr', 'h', 'k', 'kh', 'l', 'm', 'n', 'p', 'r',
+          's', 'sh', 'sk', 'st', 't', 'th', 'tr', 'v', 'vr', 'w', 'z')
+NUCLEI = ('a', 'e', 'i', 'o', 'u', 'ae', 'ai', 'au', 'ea', 'ei', 'ia', 'io', 'ou', 'y')
+CODAS = ('', '', '', 'l', 'm', 'n', 'r', 's', 'th', 'x', 'k', 'nd', 'rn', 'sh', 'st')
+LEXICON_SIZE = 6000
+NAME_TEMPLATES = (
+    ('{w}', 0.10), ('{w} {w}', 0.44), ('{w} {w} {w}', 0.15), ('{w} of {w}', 0.08), ('{w} of the {w}', 0.06),
+    ("{w}'s {w}", 0.06), ('{w} {w} {w} {w}', 0.04), ('{w}-{w} {w}', 0.04), ('the {w} {w}', 0.03),
+)
+LEGENDARY_TEMPLATES = (('{w}, {w} {w}', 0.45), ('{w} the {w}', 0.25), ('{w}, {w} of {w}', 0.20), ('{w} {w}', 0.10))
+
+CREATURE_TYPES = (
+    'Human', 'Elf', 'Goblin', 'Merfolk', 'Zombie', 'Vampire', 'Angel', 'Dragon', 'Spirit', 'Wizard', 'Warrior',
+    'Cleric', 'Rogue', 'Shaman', 'Knight', 'Beast', 'Horror', 'Soldier', 'Elemental', 'Faerie', 'Dwarf',
+    'Demon', 'Giant', 'Cat', 'Bird', 'Insect', 'Sliver', 'Construct', 'Phyrexian', 'Dinosaur',
+)
+TOKEN_TYPES = ('Soldier', 'Spirit', 'Zombie', 'Goblin', 'Saproling', 'Elemental', 'Thopter', 'Beast', 'Insect')
+KEYWORDS = (
+    'Flying', 'Trample', 'Haste', 'Vigilance', 'Deathtouch', 'Lifelink', 'First strike', 'Reach', 'Flash',
+    'Menace', 'Defender', 'Hexproof', 'Indestructible', 'Double strike', 'Ward {2}', 'Prowess', 'Changeling',
+    'Cycling {2}', 'Kicker {1}{G}', 'Flashback {3}{R}', 'Convoke', 'Cascade', 'Partner',
+)
+TRIGGERS = (
+    'When {self} enters the battlefield', 'Whenever {self} attacks', 'At the beginning of your upkeep',
+    'Whenever you cast a noncreature spell', 'Whenever another creature you control dies',
+    'When {self} dies', 'At the beginning of your end step', 'Whenever a land enters the battlefield under your control',
+    'Whenever {self} deals combat damage to a player', 'Whenever you gain life',
+)
+EFFECTS = (
+    'draw a card', 'each opponent loses {n} life and you gain {n} life', 'create a {n}/{n} {color} {token} creature token',
+    'put a +1/+1 counter on target creature', 'target player mills {many} cards', 'scry {n}',
+    'return target creature card from your graveyard to your hand', 'destroy target artifact or enchantment',
+    'exile target nonland permanent an opponent controls until {self} leaves the battlefield',
+    'you may search your library for a basic land card, put it onto the battlefield tapped, then shuffle',
+    'counter target spell unless its controller pays {{{n}}}', 'deal {n} damage to any target',
+    'untap target permanent', 'proliferate', 'add one mana of any color',
+)
+ACTIVATED = (
+    '{cost}: {self} gets +{n}/+{n} until end of turn.', '{{T}}: Add {mana}.', '{cost}, {{T}}: Draw a card, then discard a card.',
+    'Sacrifice a creature: Scry 1.', '{cost}, Sacrifice {self}: Destroy target creature.',
+    '{cost}: Return {self} to its owner\'s hand.', '{{T}}: Add {{C}}.',
+)
+STATIC = (
+    'Other creatures you control get +1/+1.', 'Spells you cast cost {{1}} less to cast.',
+    'Creatures your opponents control enter the battlefield tapped.', 'You have no maximum hand size.',
+    '{self} can\'t be blocked.', 'Each creature you control with a +1/+1 counter on it has trample.',
+)
+SPELL_TEXT = (
+    'Counter target spell.', '{self} deals {n} damage to any target.', 'Draw {many} cards.',
+    'Destroy all creatures. They can\'t be regenerated.',
+    'Search your library for a card, put that card into your hand, then shuffle.',
+    'Return target nonland permanent to its owner\'s hand.', 'Create {many} {n}/{n} {color} {token} creature tokens.',
+    'Target creature gets +{n}/+{n} and gains trample until end of turn.', 'Exile target creature.',
+    'Each player sacrifices a creature.', 'Target player discards {many} cards.', 'Take an extra turn after this one.',
+    'Destroy all lands.', 'Put target creature card from a graveyard onto the battlefield under your control.',
+)
+EDHREC_SECTIONS = (
+    ('newcards', 'New Cards'), ('highsynergycards', 'High Synergy Cards'), ('topcards', 'Top Cards'),
+    ('gamechangers', 'Game Changers'), ('creatures', 'Creatures'), ('instants', 'Instants'),
+    ('sorceries', 'Sorceries'), ('utilityartifacts', 'Utility Artifacts'), ('enchantments', 'Enchantments'),
+    ('planeswalkers', 'Planeswalkers'), ('utilitylands', 'Utility Lands'), ('manaartifacts', 'Mana Artifacts'),
+    ('lands', 'Lands'),
+)
+
+
+def _weighted(rng: random.Random, choices: Sequence[Tuple[object, float]]):
+    return rng.choices([value for value, _ in choices], weights=[weight for _, weight in choices])[0]
+
+
+class CorpusGenerator:
+    """Deterministic generator for a synthetic corpus of scale x the oracle cards."""
+
+    def __init__(self, scale: float = 1.0, seed: int = 0):
+        self.scale = scale
+        self.count = max(1, round(ORACLE_CARDS * scale))
+        self.rng = random.Random(seed)
+        self.lexicon = self._build_lexicon()
+        # Zipf-like word frequencies, so a few words appear in many names
+        self.word_weights = list(self._cumulative(1 / (rank + 1) ** 1.05 for rank in range(len(self.lexicon))))
+        self.used_names: set = set()
+        self.token_names: List[str] = []
+
+    @staticmethod
+    def _cumulative(weights) -> Iterator[float]:
+        total = 0.0
+        for weight in weights:
+            total += weight
+            yield total
+
+    def _build_lexicon(self) -> List[str]:
+        words = list(COMMON_WORDS)
+        seen = {word.lower() for word in words}
+        while len(words) < LEXICON_SIZE:
+            word = ''.join(
+                self.rng.choice(ONSETS) + self.rng.choice(NUCLEI) + self.rng.choice(CODAS)
+                for _ in range(self.rng.choice((1, 2, 2, 3)))
+            )
+            if len(word) >= 3 and word not in seen:
+                seen.add(word)
+                words.append(word.capitalize())
+        return words
+
+    def _word(self) -> str:
+        return self.rng.choices(self.lexicon, cum_weights=self.word_weights)[0]
+
+    def _name(self, templates=NAME_TEMPLATES) -> str:
+        """Get a card name not used before in this corpus."""
+        for attempt in range(20):
+            template = _weighted(self.rng, templates)
+            if attempt >= 10:
+                template += ' {w}'
+            name = template.format_map(_Words(self))
+            name = name[0].upper() + name[1:]
+            if name not in self.used_names:
+                self.used_names.add(name)
+                return name
+        raise RuntimeError("Could not generate a unique card name")
+
+    def _colors(self) -> List[str]:
+        return sorted(self.rng.sample(COLORS, _weighted(self.rng, COLOR_COUNTS)), key=COLORS.index)
+
+    def _mana_cost(self, colors: List[str], mana_value: int) -> str:
+        pips = [self.rng.choice(colors) for _ in range(min(mana_value, len(colors) + self.rng.randint(0, 1)))] \
+            if colors else []
+        generic = mana_value - len(pips)
+        return (f"{{{generic}}}" if generic or not pips else '') + ''.join(f"{{{color}}}" for color in pips)
+
+    def _fill(self, template: str, name: str, colors: List[str]) -> str:
+        return template.format(
+            self=name.split(',')[0],
+            n=self.rng.choice((1, 1, 2, 2, 3, 4)),
+            many=self.rng.choice(('two', 'two', 'three', 'four')),
+            color=self.rng.choice(('white', 'blue', 'black', 'red', 'green', 'colorless')),
+            token=self.rng.choice(TOKEN_TYPES),
+            cost=self._mana_cost(colors, self.rng.randint(1, 4)),
+            mana='{' + (self.rng.choice(colors) if colors else 'C') + '}',
+        )
+
+    def _oracle_text(self, name: str, kind: str, colors: List[str]) -> Tuple[str, List[str]]:
+        """Get the rules text and keywords for a card."""
+        lines = []
+        keywords = []
+        if kind in ('creature', 'legendary_creature') and self.rng.random() < 0.55:
+            keywords = self.rng.sample(KEYWORDS[:-1], self.rng.choice((1, 1, 1, 2, 3)))
+            lines.append(', '.join(keywords).capitalize())
+        if kind in ('instant', 'sorcery'):
+            lines.append(self._fill(self.rng.choice(SPELL_TEXT), name, colors))
+            if self.rng.random() < 0.2:
+                lines.append(self._fill(self.rng.choice(SPELL_TEXT), name, colors))
+        elif kind == 'land':
+            lines.append(self._fill(self.rng.choice(('{{T}}: Add {mana}.', '{{T}}: Add {{C}}.')), name, colors))
+            if self.rng.random() < 0.5:
+                lines.append(f"{name} enters the battlefield tapped.")
+        elif kind == 'planeswalker':
+            for loyalty in ('+1', '−2', '−7'):
+                lines.append(f"{loyalty}: " + self._fill(self.rng.choice(EFFECTS), name, colors).capitalize() + '.')
+        elif kind != 'token' or self.rng.random() < 0.3:
+            for _ in range(self.rng.choice((0, 1, 1, 2, 2, 3)) if lines else self.rng.choice((1, 1, 2, 2, 3))):
+                roll = self.rng.random()
+                if roll < 0.5:
+                    effect = self._fill(self.rng.choice(EFFECTS), name, colors)
+                    lines.append(f"{self._fill(self.rng.choice(TRIGGERS), name, colors)}, {effect}.")
+                elif roll < 0.8:
+                    lines.append(self._fill(self.rng.choice(ACTIVATED), name, colors))
+                else:
+                    lines.append(self._fill(self.rng.choice(STATIC), name, colors))
+        if kind == 'legendary_creature' and self.rng.random() < 0.06:
+            lines.append("Partner (You can have two commanders if both have partner.)")
+            keywords.append('Partner')
+        return '\n'.join(lines), keywords
+
+    def _legalities(self, kind: str) -> Dict[str, str]:
+        if kind == 'token':
+            return {fmt: 'not_legal' for fmt in FORMATS}
+        legalities = {fmt: 'legal' if self.rng.random() < 0.6 else 'not_legal' for fmt in FORMATS}
+        for fmt in ('legacy', 'vintage', 'commander', 'oathbreaker', 'duel', 'predh'):
+            legalities[fmt] = 'legal'
+        if self.rng.random() < 0.005:
+            legalities['commander'] = 'banned'
+        return legalities
+
+    def _face(self, kind: str, colors: List[str], name: Optional[str] = None) -> Dict[str, object]:
+        """Get the per-face fields: name, cost, types, text and stats."""
+        name = name or self._name(LEGENDARY_TEMPLATES if kind == 'legendary_creature' else NAME_TEMPLATES)
+        mana_value = 0 if kind in ('land', 'token') else _weighted(self.rng, MANA_VALUES) or 1
+        face = {
+            'name': name,
+            'mana_cost': '' if kind in ('land', 'token') else self._mana_cost(colors, mana_value),
+        }
+        subtypes = ' '.join(self.rng.sample(CREATURE_TYPES, self.rng.choice((1, 2, 2))))
+        face['type_line'] = {
+            'creature': f"Creature — {subtypes}",
+            'legendary_creature': f"Legendary Creature — {subtypes}",
+            'token': f"Token Creature — {self.rng.choice(TOKEN_TYPES)}",
+            'land': 'Land',
+            'planeswalker': f"Legendary Planeswalker — {name.split(',')[0].split()[0]}",
+        }.get(kind, kind.capitalize())
+        face['oracle_text'], face['keywords'] = self._oracle_text(name, kind, colors)
+        if kind in ('creature', 'legendary_creature', 'token'):
+            face['power'] = str(max(0, mana_value + self.rng.randint(-2, 1)))
+            face['toughness'] = str(max(1, mana_value + self.rng.randint(-1, 2)))
+        if kind == 'planeswalker':
+            face['loyalty'] = str(self.rng.randint(2, 6))
+        face['mana_value'] = mana_value
+        return face
+
+    def _card(self, index: int) -> Card:
+        """Generate one Scryfall oracle card object."""
+        kind = _weighted(self.rng, CARD_KINDS)
+        colors = [] if kind == 'land' else self._colors()
+        card_id = uuid.UUID(int=self.rng.getrandbits(128))
+        if kind == 'token':
+            face = self._face(kind, colors, self._name((('{w} {w} Token', 1.0),)))
+            self.token_names.append(face['name'])
+        else:
+            face = self._face(kind, colors)
+        mana_value = face.pop('mana_value')
+        set_code, set_name = self.rng.choice(SETS)
+        collector_number = str(self.rng.randint(1, 400))
+        card = {
+            'object': 'card',
+            'id': str(card_id),
+            'oracle_id': str(uuid.UUID(int=self.rng.getrandbits(128))),
+            'lang': 'en',
+            'released_at': f"{1993 + index % 32}-{1 + index % 12:02d}-{1 + index % 28:02d}",
+            'uri': f"https://api.scryfall.com/cards/{card_id}",
+            'scryfall_uri': f"https://scryfall.com/card/{set_code}/{collector_number}",
+            'layout': 'token' if kind == 'token' else 'normal',
+            **face,
+            'cmc': float(mana_value),
+            'colors': colors,
+            'color_identity': colors,
+            'legalities': self._legalities(kind),
+            'set': set_code,
+            'set_name': set_name,
+            'collector_number': collector_number,
+            'rarity': 'common' if kind == 'token' else _weighted(self.rng, RARITIES),
+            'rulings_uri': f"https://api.scryfall.com/cards/{card_id}/rulings",
+            'edhrec_rank': self.rng.randint(1, self.count),
+        }
+        image = {'normal': f"https://cards.scryfall.io/normal/front/{card_id}.jpg"}
+
+        layout = _weighted(self.rng, MULTI_FACE_LAYOUTS + (('normal', 0.94),)) if kind != 'token' else 'normal'
+        if layout == 'normal':
+            card['image_uris'] = image
+        else:
+            back_kind = kind if layout in ('transform', 'modal_dfc') else self.rng.choice(('instant', 'sorcery'))
+            back = self._face(back_kind, colors)
+            back_value = back.pop('mana_value')
+            if layout == 'transform':
+                back['mana_cost'] = ''
+            faces = [{'object': 'card_face', **face}, {'object': 'card_face', **back}]
+            for card_face in faces:
+                card_face.pop('keywords')
+            card.update(layout=layout, name=f"{face['name']} // {back['name']}",
+                        type_line=f"{face['type_line']} // {back['type_line']}", card_faces=faces)
+            for field in ('oracle_text', 'power', 'toughness', 'loyalty'):
+                card.pop(field, None)
+            if layout in ('transform', 'modal_dfc'):
+                card.pop('mana_cost')
+                for side, card_face in zip(('front', 'back'), faces):
+                    card_face['image_uris'] = {'normal': f"https://cards.scryfall.io/normal/{side}/{card_id}.jpg"}
+            else:
+                card['mana_cost'] = f"{face['mana_cost']} // {back['mana_cost']}"
+                card['cmc'] = float(mana_value + back_value if layout == 'split' else mana_value)
+                card['image_uris'] = image
+
+        if self.token_names and 'create' in card.get('oracle_text', '') and self.rng.random() < 0.8:
+            card['all_parts'] = [
+                {'object': 'related_card', 'component': 'combo_piece', 'name': card['name'], 'type_line': card['type_line']},
+                {'object': 'related_card', 'component': 'token', 'name': self.rng.choice(self.token_names),
+                 'type_line': 'Token Creature'},
+            ]
+        return card
+
+    def _basic_lands(self) -> Iterator[Card]:
+        for color, land in BASIC_LANDS.items():
+            self.used_names.add(land)
+            card_id = uuid.UUID(int=self.rng.getrandbits(128))
+            yield {
+                'object': 'card', 'id': str(card_id), 'lang': 'en', 'layout': 'normal', 'name': land,
+                'mana_cost': '', 'cmc': 0.0, 'type_line': f"Basic Land — {land}", 'oracle_text': f"({{T}}: Add {{{color}}}.)",
+                'colors': [], 'color_identity': [color], 'keywords': [], 'legalities': self._legalities('land'),
+                'set': 'lea', 'set_name': 'Limited Edition Alpha', 'collector_number': str(len(self.used_names)),
+                'rarity': 'common', 'rulings_uri': f"https://api.scryfall.com/cards/{card_id}/rulings",
+                'image_uris': {'normal': f"https://cards.scryfall.io/normal/front/{card_id}.jpg"},
+            }
+
+    def raw_cards(self) -> Iterator[Card]:
+        """Generate the Scryfall bulk objects, as downloaded."""
+        yield from self._basic_lands()
+        for index in range(self.count - len(BASIC_LANDS)):
+            yield self._card(index)
+
+    def edhrec_data(self, names: List[str]) -> dict:
+        """Get the stored form of a commander's EDHREC cardlists, referencing names in the corpus."""
+        potential_decks = int(math.exp(self.rng.gauss(6.0, 1.8)))
+        cardlists = []
+        for tag, header in self.rng.sample(EDHREC_SECTIONS, self.rng.randint(6, len(EDHREC_SECTIONS))):
+            cardlists.append({'tag': tag, 'header': header, 'cardviews': [
+                {
+                    'name': self.rng.choice(names),
+                    'synergy': round(self.rng.uniform(-0.2, 0.8), 2),
+                    'num_decks': self.rng.randint(0, potential_decks),
+                    'potential_decks': potential_decks,
+                }
+                for _ in range(self.rng.randint(10, MAX_CARDS_PER_SECTION))
+            ]})
+        return {'cardlists': encode_cardlists(cardlists), 'potential_decks': potential_decks}
+
+    def processed_cards(self) -> Iterator[Tuple[str, Card]]:
+        """Generate the (key, card) entries of the downloader's saved snapshot.
+
+        Cards go through CardDataDownloader._process_cards in chunks, are
+        tagged with their power features, and commanders get EDHREC
+        cardlists as the enrichment step stores them.
+        """
+        downloader = CardDataDownloader()
+        names: List[str] = []
+        chunk: List[Card] = []
+        for card in self.raw_cards():
+            chunk.append(card)
+            if len(chunk) == CHUNK_SIZE:
+                yield from self._process_chunk(downloader, chunk, names)
+                chunk = []
+        yield from self._process_chunk(downloader, chunk, names)
+
+    def _process_chunk(self, downloader: CardDataDownloader, chunk: List[Card], names: List[str]):
+        processed = downloader._process_cards(chunk)
+        tag_power_features(processed.values())
+        names.extend(card['name'] for card in processed.values())
+        for key, card in processed.items():
+            if downloader._is_commander(card):
+                card['edhrec_data'] = self.edhrec_data(names)
+            yield key, card
+
+
+class _Words(dict):
+    """Fills each {w} in a name template with a new word."""
+
+    def __init__(self, generator: CorpusGenerator):
+        super().__init__()
+        self.generator = generator
+
+    def __missing__(self, key: str) -> str:
+        return self.generator._word()
+
+
+def write_corpus(generator: CorpusGenerator, path: Path, raw: bool = False) -> int:
+    """Stream the corpus to a JSON file, returning the number of cards written.
+
+    Snapshots are formatted exactly as CardDataDownloader._save_cards writes them.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        if raw:
+            f.write('[')
+            for card in generator.raw_cards():
+                f.write((',\n' if written else '\n') + json.dumps(card, ensure_ascii=False))
+                written += 1
+            f.write('\n]')
+        else:
+            f.write('{')
+            for key, card in generator.processed_cards():
+                # Indented as one entry of json.dump(cards, indent=2)
+                entry = json.dumps({key: card}, indent=2, ensure_ascii=False)[2:-2]
+                f.write((',\n' if written else '\n') + entry)
+                written += 1
+            f.write('\n}' if written else '}')
+    return written
+
+
+def write_fixture(generator: CorpusGenerator, path: Path = FIXTURE) -> int:
+    """Write the micro-benchmark fixture, returning the number of cards written.
+
+    The fixture holds the raw bulk objects under "cards" and each
+    commander's stored EDHREC cardlists under "edhrec", by snapshot key.
+    The gzip header carries no name or timestamp, so regenerating it with
+    the same seed gives the same bytes.
+    """
+    cards = list(generator.raw_cards())
+    downloader = CardDataDownloader()
+    processed = downloader._process_cards(cards)
+    names = [card['name'] for card in processed.values()]
+    edhrec = {
+        key: generator.edhrec_data(names)
+        for key, card in processed.items() if downloader._is_commander(card)
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', filename='', mtime=0) as f:
+        f.write(json.dumps({'cards': cards, 'edhrec': edhrec}, ensure_ascii=False).encode('utf-8'))
+    return len(cards)
+
+
+def main():
+    """Generate a corpus."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=1.0, help="Multiple of the oracle corpus size, e.g. 1, 10 or 100")
+    parser.add_argument('--output', type=Path, help="Output file, defaults to reference/synthetic_cards_<scale>x.json")
+    parser.add_argument('--raw', action='store_true', help="Write the Scryfall bulk file instead of the processed snapshot")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fixture', action='store_true',
+                        help=f"Regenerate the micro-benchmark fixture ({FIXTURE.name}) at FIXTURE_SCALE")
+    args = parser.parse_args()
+
+    if args.fixture:
+        output = args.output or FIXTURE
+        written = write_fixture(CorpusGenerator(FIXTURE_SCALE, args.seed), output)
+        print(f"Wrote {written:,} cards to {output} ({output.stat().st_size / 1e3:,.0f} KB)")
+        return
+
+    output = args.output or Path(__file__).parent.parent / 'reference' / f"synthetic_cards_{args.scale:g}x.json"
+    start = time.perf_counter()
+    written = write_corpus(CorpusGenerator(args.scale, args.seed), output, args.raw)
+    print(f"Wrote {written:,} cards to {output} ({output.stat().st_size / 1e6:,.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
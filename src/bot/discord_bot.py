@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
@@ -8,20 +9,53 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from src.data.card_data import CardData
 from src.commands.card_info import CardInfoCommand
+from src.commands.average_deck import AverageDeckCommand
+from src.commands.search import SearchCommand
+from src.commands.text_search import TextSearchCommand
+from src.commands.rule import RuleCommand
+from src.commands.card_mentions import CardMentionHandler
+from src.commands.response import send_channel_embeds, send_embeds
+from src.commands.debug import DebugCommand
+from src.commands.deck import DeckCommand, DeckImportModal
+from src.commands.build import BuildCommand
+from src.monitoring.metrics import STAGE_SECONDS, start_metrics_server
+from src.monitoring.loop_monitor import LoopMonitor
+from src.monitoring.profiler import MAX_SECONDS
 from src.data.card_data_downloader import CardDataDownloader
+from src.data.rules_index import RulesIndex
+from src.data.combos import ComboIndex, load_or_ingest
+from src.data.deck_session import SessionStore
+from src.data.synergy import SynergyIndex
 
 class CommanderBot(commands.Bot):
     """Discord bot for Commander format assistance."""
+
+    SESSION_SAVE_SECONDS = 60.0  # How often changed deckbuilding sessions are saved
     
-    def __init__(self):
-        """Initialize the bot with command prefix and intents."""
+    def __init__(self, card_data: Optional[CardData] = None):
+        """Initialize the bot with command prefix and intents.
+
+        Args:
+            card_data: Already loaded card data, defaults to the local snapshot.
+        """
         intents = discord.Intents.default()
         intents.message_content = True
         super().__init__(command_prefix="!", intents=intents)
-        self.card_data = CardData()
+        self.card_data = card_data or CardData()
         self.card_info = CardInfoCommand(self.card_data)
+        self.average_deck = AverageDeckCommand(self.card_data)
+        self.card_search = SearchCommand(self.card_data)
+        self.text_search = TextSearchCommand(self.card_data)
+        self.rule_lookup = RuleCommand()
+        self.deck = DeckCommand(self.card_data)
+        self.build = BuildCommand(self.card_data)
+        self._session_saver: Optional[asyncio.Task] = None
+        # Channels where card names are also detected without [[brackets]]
+        detect_channels = [int(channel) for channel in os.getenv("NAME_DETECTION_CHANNELS", "").split(",") if channel.strip()]
+        self.card_mentions = CardMentionHandler(self.card_info, detect_channels)
         self.data_dir = Path(__file__).parent.parent.parent / 'reference'
         self.last_download_file = self.data_dir / "last_download.json"
+        self.debug = DebugCommand(self.data_dir.parent / 'logs' / 'profiles')
         
     async def _check_and_update_data(self):
         """Check if card data needs to be updated and download if necessary."""
@@ -29,8 +63,58 @@ class CommanderBot(commands.Bot):
         self.data_dir.mkdir(exist_ok=True)
         
         # Use CardDataDownloader to check and update data
-        downloader = CardDataDownloader()
+        fetch_average_decks = os.getenv("FETCH_AVERAGE_DECKS", "").lower() in ("1", "true", "yes")
+        downloader = CardDataDownloader(fetch_average_decks=fetch_average_decks)
         await downloader.download()
+    
+    async def _load_rules(self):
+        """Load the prebuilt rules index, ingesting the newest rules PDF only if needed."""
+        rules_pdfs = sorted(self.data_dir.glob('MagicCompRules_*.pdf'))
+        if not rules_pdfs:
+            print("No comprehensive rules PDF found, /rule is disabled")
+            return
+        # Building the index parses the PDF, so keep it off the event loop
+        self.rule_lookup.rules = await asyncio.to_thread(RulesIndex.load_or_build, rules_pdfs[-1])
+        self.card_info.rules = self.rule_lookup.rules
+
+    async def _load_combos(self):
+        """Load the combo database, ingesting the combo dump only if needed."""
+        dump = self.data_dir / 'variants.json'
+        if not dump.exists():
+            print("No combo dump found, /deck combos is disabled")
+            return
+        combos = await asyncio.to_thread(load_or_ingest, dump)
+        if combos is not None:
+            self.deck.combos = await asyncio.to_thread(ComboIndex.for_card_data, combos, self.card_data)
+
+    async def _load_sessions(self):
+        """Build the synergy index and load the saved deckbuilding sessions."""
+        index = await asyncio.to_thread(SynergyIndex, self.card_data)
+        sessions = SessionStore(self.data_dir / 'deck_sessions.json', self.card_data, index)
+        await asyncio.to_thread(sessions.load)
+        self.build.sessions = sessions
+        self._session_saver = asyncio.create_task(self._save_sessions())
+
+    def _save_sessions_if_dirty(self):
+        """Save changed deckbuilding sessions, logging rather than raising on failure."""
+        try:
+            self.build.sessions.save_if_dirty()
+        except Exception as e:
+            print(f"Error saving deckbuilding sessions: {e}")
+
+    async def _save_sessions(self):
+        """Save changed deckbuilding sessions every so often."""
+        while True:
+            await asyncio.sleep(self.SESSION_SAVE_SECONDS)
+            self._save_sessions_if_dirty()
+
+    async def close(self):
+        """Save the deckbuilding sessions before shutting down."""
+        if self._session_saver:
+            self._session_saver.cancel()
+        if self.build.sessions:
+            self._save_sessions_if_dirty()
+        await super().close()
         
     async def setup_hook(self):
         """Set up the bot's commands and sync them with Discord."""
@@ -38,18 +122,10 @@ class CommanderBot(commands.Bot):
         
         # Check and update card data
         await self._check_and_update_data()
-        
-        # Register slash commands
-        @self.tree.command(name="card", description="Get detailed information about a specific card")
-        async def card(interaction: discord.Interaction, card_name: str):
-            """Get information about a specific card."""
-            await interaction.response.defer()
-            embeds, view = await self.card_info.execute(card_name)
-            for embed in embeds:
-                if view:
-                    await interaction.followup.send(embed=embed, view=view)
-                else:
-                    await interaction.followup.send(embed=embed)
+        await self._load_rules()
+        await self._load_combos()
+        await self._load_sessions()
+        self._register_commands()
         
         # Sync commands with Discord
         print("Syncing commands with Discord...")
@@ -61,6 +137,140 @@ class CommanderBot(commands.Bot):
         except Exception as e:
             print(f"Error syncing commands: {e}")
     
+    def _register_commands(self):
+        """Register the slash commands on the command tree."""
+        @self.tree.command(name="card", description="Get detailed information about a specific card")
+        @app_commands.describe(rules="Also list the keyword rules the card's text refers to")
+        async def card(interaction: discord.Interaction, card_name: str, rules: bool = False):
+            """Get information about a specific card."""
+            with STAGE_SECONDS.labels("card", "defer").time():
+                await interaction.response.defer()
+            embeds, view = await self.card_info.execute(card_name, with_rules=rules)
+            await send_embeds(interaction, embeds, view, command="card")
+        
+        @self.tree.command(name="avgdeck", description="Show the EDHREC average decklist for a commander")
+        async def avgdeck(interaction: discord.Interaction, commander_name: str):
+            """Show the average decklist for a commander."""
+            with STAGE_SECONDS.labels("avgdeck", "defer").time():
+                await interaction.response.defer()
+            embeds, view = await self.average_deck.execute(commander_name)
+            await send_embeds(interaction, embeds, view, command="avgdeck")
+        
+        @self.tree.command(name="search", description="Search cards with Scryfall syntax, e.g. t:creature id<=wu mv<=3")
+        async def search(interaction: discord.Interaction, query: str):
+            """Search the local card data."""
+            with STAGE_SECONDS.labels("search", "defer").time():
+                await interaction.response.defer()
+            embeds, view = await self.card_search.execute(query)
+            await send_embeds(interaction, embeds, view, command="search")
+        
+        @self.tree.command(name="oracle", description="Search card rules text, use quotes for exact phrases")
+        async def oracle(interaction: discord.Interaction, text: str):
+            """Search card rules text."""
+            with STAGE_SECONDS.labels("oracle", "defer").time():
+                await interaction.response.defer()
+            embeds, view = await self.text_search.execute(text)
+            await send_embeds(interaction, embeds, view, command="oracle")
+        
+        @self.tree.command(name="rule", description="Look up a comprehensive rule by number or search the rules")
+        async def rule(interaction: discord.Interaction, query: str):
+            """Look up or search the comprehensive rules."""
+            with STAGE_SECONDS.labels("rule", "defer").time():
+                await interaction.response.defer()
+            embeds, view = await self.rule_lookup.execute(query)
+            await send_embeds(interaction, embeds, view, command="rule")
+        
+        deck_group = app_commands.Group(name="deck", description="Import a decklist and analyze it")
+
+        @deck_group.command(name="import", description="Import a decklist file, or paste one into a form")
+        @app_commands.describe(decklist="A .txt decklist; leave empty to paste the list instead")
+        async def deck_import(interaction: discord.Interaction, decklist: Optional[discord.Attachment] = None):
+            """Import a decklist as the user's current deck."""
+            if decklist is None:
+                await interaction.response.send_modal(DeckImportModal(self.deck))
+                return
+            with STAGE_SECONDS.labels("deck", "defer").time():
+                await interaction.response.defer()
+            embeds = await self.deck.import_attachment(interaction.user.id, decklist)
+            await send_embeds(interaction, embeds, command="deck")
+
+        @deck_group.command(name="stats", description="Show the mana curve, color pips and card types of your deck")
+        async def deck_stats(interaction: discord.Interaction):
+            """Show the statistics of the user's imported deck."""
+            with STAGE_SECONDS.labels("deck", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.deck.stats(interaction.user.id), command="deck")
+
+        @deck_group.command(name="check", description="Check your deck against the Commander deck rules")
+        async def deck_check(interaction: discord.Interaction):
+            """Check the user's imported deck for Commander legality."""
+            with STAGE_SECONDS.labels("deck", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.deck.check(interaction.user.id), command="deck")
+
+        @deck_group.command(name="combos", description="Find known combos in your deck")
+        async def deck_combos(interaction: discord.Interaction):
+            """List the combos in the user's imported deck."""
+            with STAGE_SECONDS.labels("deck", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.deck.find_combos(interaction.user.id), command="deck")
+
+        @deck_group.command(name="bracket", description="Estimate the power bracket of your deck")
+        async def deck_bracket(interaction: discord.Interaction):
+            """Estimate the bracket of the user's imported deck."""
+            with STAGE_SECONDS.labels("deck", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.deck.bracket(interaction.user.id), command="deck")
+
+        self.tree.add_command(deck_group)
+
+        build_group = app_commands.Group(name="build", description="Build a deck card by card and see which commanders fit it")
+
+        @build_group.command(name="add", description="Add a card to the deck you are building")
+        async def build_add(interaction: discord.Interaction, card_name: str, copies: app_commands.Range[int, 1, 99] = 1):
+            """Add a card and show the updated commander recommendations."""
+            with STAGE_SECONDS.labels("build", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.build.add(interaction.user.id, card_name, copies), command="build")
+
+        @build_group.command(name="remove", description="Remove a card from the deck you are building")
+        async def build_remove(interaction: discord.Interaction, card_name: str):
+            """Remove a card and show the updated commander recommendations."""
+            with STAGE_SECONDS.labels("build", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.build.remove(interaction.user.id, card_name), command="build")
+
+        @build_group.command(name="show", description="Show the deck you are building and the commanders that fit it")
+        async def build_show(interaction: discord.Interaction):
+            """Show the user's deckbuilding session."""
+            with STAGE_SECONDS.labels("build", "defer").time():
+                await interaction.response.defer()
+            await send_embeds(interaction, self.build.show(interaction.user.id), command="build")
+
+        @build_group.command(name="clear", description="Start the deck you are building over")
+        async def build_clear(interaction: discord.Interaction):
+            """End the user's deckbuilding session."""
+            await interaction.response.send_message(embeds=self.build.clear(interaction.user.id), ephemeral=True)
+
+        self.tree.add_command(build_group)
+
+        debug_group = app_commands.Group(name="debug", description="Owner-only diagnostics")
+
+        @debug_group.command(name="profile", description=f"Profile the bot for up to {MAX_SECONDS:g} seconds")
+        async def profile(interaction: discord.Interaction, seconds: app_commands.Range[float, 1.0, MAX_SECONDS]):
+            """Run the sampling profiler and send its summary and collapsed stacks."""
+            if not await self.is_owner(interaction.user):
+                await interaction.response.send_message("This command is only available to the bot owner.", ephemeral=True)
+                return
+            await interaction.response.defer(ephemeral=True)
+            embed, path = await self.debug.profile(seconds)
+            if path:
+                await interaction.followup.send(embed=embed, file=discord.File(path), ephemeral=True)
+            else:
+                await interaction.followup.send(embed=embed, ephemeral=True)
+
+        self.tree.add_command(debug_group)
+    
     async def on_ready(self):
         """Called when the bot is ready and connected to Discord."""
         print(f"Logged in as {self.user.name} (ID: {self.user.id})")
@@ -80,6 +290,20 @@ class CommanderBot(commands.Bot):
         )
         print(f"\nInvite link with correct permissions:\n{invite_link}\n")
 
+    async def on_interaction(self, interaction: discord.Interaction):
+        """Answer clicks on card suggestion buttons, which have no per-message view."""
+        if interaction.type == discord.InteractionType.component:
+            await self.card_info.handle_suggestion(interaction)
+
+    async def on_message(self, message: discord.Message):
+        """Answer [[Card Name]] references in chat, then process prefix commands."""
+        if message.author.bot:
+            return
+        embeds = await self.card_mentions.handle(message.channel.id, message.content)
+        if embeds:
+            await send_channel_embeds(message.channel, embeds)
+        await self.process_commands(message)
+
 def run_bot():
     """Run the Discord bot."""
     # Get Discord token from environment
@@ -87,6 +311,30 @@ def run_bot():
     if not token:
         raise ValueError("No Discord token found in environment variables")
     
+    # Serve metrics locally unless METRICS_PORT is 0
+    metrics_host = os.getenv("METRICS_HOST", "127.0.0.1")
+    metrics_port = int(os.getenv("METRICS_PORT", "9108"))
+
     # Create and run the bot
     bot = CommanderBot()
-    bot.run(token) 
\ No newline at end of file
+    loop_monitor = LoopMonitor(
+        threshold=float(os.getenv("SLOW_CALLBACK_SECONDS", "0.25")),
+        log_file=bot.data_dir.parent / 'logs' / 'loop_monitor.log',
+    )
+
+    async def runner():
+        metrics_runner = await start_metrics_server(metrics_host, metrics_port) if metrics_port else None
+        loop_monitor.start()
+        try:
+            async with bot:
+                await bot.start(token)
+        finally:
+            loop_monitor.stop()
+            if metrics_runner:
+                await metrics_runner.cleanup()
+
+    discord.utils.setup_logging()
+    try:
+        asyncio.run(runner())
+    except KeyboardInterrupt:
+        pass 
\ No newline at end of file
@@ -0,0 +1,70 @@
+from typing import List
+import discord
+from src.commands.base import Command
+from src.commands.pagination import PaginatedView
+
+
+class AverageDeckCommand(Command):
+    """Command to show a commander's EDHREC average decklist from the local store."""
+
+    PAGE_SIZE = 25  # Cards per page
+
+    def __init__(self, card_data):
+        self.card_data = card_data
+
+    @property
+    def name(self) -> str:
+        return "avgdeck"
+
+    @property
+    def description(self) -> str:
+        return "Show the EDHREC average decklist for a commander"
+
+    @property
+    def usage(self) -> str:
+        return "!avgdeck <commander name>"
+
+    def _find_commander(self, args: str):
+        """Find a commander with a stored average deck by exact or partial name."""
+        card = self.card_data.get_card(args)
+        if card and card['name'] in self.card_data.average_decks:
+            return card
+        for match in self.card_data.search_cards(args, limit=25):
+            if match['name'] in self.card_data.average_decks:
+                return match
+        return None
+
+    def _render_page(self, commander: dict, page: int, page_count: int) -> discord.Embed:
+        """Render one page of a commander's average deck."""
+        start = page * self.PAGE_SIZE
+        lines = []
+        for card_id, quantity in self.card_data.average_decks.entries(
+            commander['name'], start, start + self.PAGE_SIZE
+        ):
+            card = self.card_data.get_card_by_id(card_id)
+            if card:
+                lines.append(f"{quantity} {card['name']}")
+
+        embed = discord.Embed(
+            title=f"Average Deck: {commander['name']}",
+            description="\n".join(lines) or "No cards",
+        )
+        embed.set_footer(text=f"Page {page + 1}/{page_count}")
+        return embed
+
+    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the average deck command."""
+        if not args:
+            return [discord.Embed(description=self.usage)], None
+
+        commander = self._find_commander(args)
+        if not commander:
+            return [discord.Embed(description=f"No average deck found for: {args}")], None
+
+        count = self.card_data.average_decks.count(commander['name'])
+        page_count = max(1, -(-count // self.PAGE_SIZE))
+        render = lambda page: self._render_page(commander, page, page_count)
+
+        if page_count == 1:
+            return [render(0)], None
+        return [render(0)], PaginatedView(page_count, render)
@@ -0,0 +1,114 @@
+from typing import List, Optional
+import discord
+from src.commands.base import Command
+from src.data.card_data import CardData
+from src.data.card_table import mask_to_colors
+from src.data.deck_session import DeckSession, SessionStore
+from src.data.decklist import NO_CARD
+
+
+class BuildCommand(Command):
+    """A deck built card by card, with commander recommendations updated as it changes."""
+
+    RECOMMENDATIONS = 5  # Commanders shown after every change
+    MAX_RECOMMENDATIONS = 10  # Commanders shown by /build show
+    MAX_LISTED = 40  # Cards listed by /build show
+
+    def __init__(self, card_data: CardData):
+        self.card_data = card_data
+        # Set once the synergy index is built and saved sessions are loaded
+        self.sessions: Optional[SessionStore] = None
+
+    @property
+    def name(self) -> str:
+        return "build"
+
+    @property
+    def description(self) -> str:
+        return "Build a deck card by card and see which commanders fit it"
+
+    @property
+    def usage(self) -> str:
+        return "!build add <card name>, !build remove <card name>, !build show or !build clear"
+
+    def _card_name(self, card_id: int) -> str:
+        return self.card_data.get_card_by_id(card_id)['name']
+
+    def _resolve(self, name: str) -> Optional[int]:
+        card_ids, _ = self.card_data.resolve_name_ids([name])
+        return None if card_ids[0] == NO_CARD else int(card_ids[0])
+
+    def _summary(self, session: DeckSession, title: str, limit: int) -> discord.Embed:
+        copies = sum(session.cards.values())
+        colors = mask_to_colors(session.identity) or "colorless"
+        embed = discord.Embed(title=title, description=f"{copies} cards in your deck ({colors})")
+        recommendations = [
+            f"{self._card_name(card_id)}: fit {fit:.1f}" for card_id, fit in session.recommend(limit)
+        ]
+        embed.add_field(
+            name="Best commanders",
+            value="\n".join(recommendations) or "No commander's EDHREC lists cover these cards yet",
+            inline=False,
+        )
+        return embed
+
+    def _unavailable(self) -> List[discord.Embed]:
+        return [discord.Embed(description="Deckbuilding sessions are still loading, try again shortly.")]
+
+    def add(self, user_id: int, name: str, copies: int = 1) -> List[discord.Embed]:
+        """Add a card to a user's deck, starting one if needed."""
+        if self.sessions is None:
+            return self._unavailable()
+        card_id = self._resolve(name)
+        if card_id is None:
+            return [discord.Embed(description=f"Card not found: {name}")]
+        session = self.sessions.get(user_id, create=True)
+        session.add(card_id, copies)
+        self.sessions.changed()
+        return [self._summary(session, f"Added {self._card_name(card_id)}", self.RECOMMENDATIONS)]
+
+    def remove(self, user_id: int, name: str) -> List[discord.Embed]:
+        """Remove a card from a user's deck."""
+        if self.sessions is None:
+            return self._unavailable()
+        session = self.sessions.get(user_id)
+        card_id = self._resolve(name)
+        if session is None or card_id is None or not session.remove(card_id):
+            return [discord.Embed(description=f"{name} isn't in your deck.")]
+        self.sessions.changed()
+        return [self._summary(session, f"Removed {self._card_name(card_id)}", self.RECOMMENDATIONS)]
+
+    def show(self, user_id: int) -> List[discord.Embed]:
+        """Show a user's deck and the commanders that fit it best."""
+        if self.sessions is None:
+            return self._unavailable()
+        session = self.sessions.get(user_id)
+        if session is None or not session.cards:
+            return [discord.Embed(description="Your deck is empty, add cards with /build add.")]
+        embed = self._summary(session, "Your deck", self.MAX_RECOMMENDATIONS)
+        cards = sorted(f"{copies} {self._card_name(card_id)}" for card_id, copies in session.cards.items())
+        shown = cards[:self.MAX_LISTED]
+        if len(cards) > len(shown):
+            shown.append(f"…and {len(cards) - len(shown)} more")
+        embed.add_field(name="Cards", value="\n".join(shown)[:1024], inline=False)
+        return [embed]
+
+    def clear(self, user_id: int) -> List[discord.Embed]:
+        """End a user's session."""
+        if self.sessions is None:
+            return self._unavailable()
+        self.sessions.discard(user_id)
+        return [discord.Embed(description="Your deck has been cleared.")]
+
+    async def execute(self, args: str, user_id: int = 0) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the build command."""
+        action, _, name = args.strip().partition(' ')
+        if action == "add" and name:
+            return self.add(user_id, name.strip()), None
+        if action == "remove" and name:
+            return self.remove(user_id, name.strip()), None
+        if action == "show":
+            return self.show(user_id), None
+        if action == "clear":
+            return self.clear(user_id), None
+        return [discord.Embed(description=self.usage)], None
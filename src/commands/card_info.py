@@ -1,36 +1,50 @@
-from typing import List
+from typing import List, Optional, Tuple
 import discord
 from discord.ui import Button, View
 from src.commands.base import Command
 from src.data.card_data import CardData
-from fuzzywuzzy import process
 import aiohttp
+import time
 from datetime import datetime
+from src.monitoring.metrics import CARD_LOOKUPS, STAGE_SECONDS
+
+SUGGESTION_PREFIX = "card"
+
+
+def suggestion_custom_id(version: str, card_id: int) -> str:
+    """Encode a suggestion button as "card:<data version>:<card id>"."""
+    return f"{SUGGESTION_PREFIX}:{version}:{card_id}"
+
+
+def parse_suggestion_custom_id(custom_id: str) -> Optional[Tuple[str, int]]:
+    """Decode a suggestion button's custom_id into (data version, card id), or None if it is not one."""
+    prefix, _, rest = custom_id.partition(':')
+    version, _, card_id = rest.partition(':')
+    if prefix != SUGGESTION_PREFIX or not card_id.isdigit():
+        return None
+    return version, int(card_id)
+
 
 class CardSuggestionView(View):
-    def __init__(self, card_data, suggestions):
-        super().__init__(timeout=60)  # Buttons expire after 60 seconds
-        self.card_data = card_data
-        self.card_info = CardInfoCommand(card_data)  # Create an instance for formatting
-        
-        # Create a button for each suggestion
-        for card_name, _ in suggestions:
-            button = Button(
-                label=card_name,
+    """Suggestion buttons that only carry compact card ids.
+
+    The view is stopped right away, so discord.py does not keep it per
+    message; clicks are answered by CardInfoCommand.handle_suggestion, which
+    the bot registers once. Buttons keep working across restarts as long as
+    the card data version is unchanged.
+    """
+
+    MAX_LABEL = 80  # Discord's button label limit
+
+    def __init__(self, version: str, suggestions: List[Tuple[int, str]]):
+        super().__init__(timeout=None)
+        for card_id, card_name in suggestions:
+            self.add_item(Button(
+                label=card_name[:self.MAX_LABEL],
                 style=discord.ButtonStyle.primary,
-                custom_id=f"card_{card_name}"
-            )
-            button.callback = self.button_callback
-            self.add_item(button)
-    
-    async def button_callback(self, interaction: discord.Interaction):
-        # Get the card name from the button's custom_id
-        card_name = interaction.data["custom_id"][5:]  # Remove "card_" prefix
-        card = self.card_data.cards[card_name]
-        
-        # Create and send the card info embed
-        embed = await self.card_info._format_card_info(card)
-        await interaction.response.edit_message(embed=embed, view=None)
+                custom_id=suggestion_custom_id(version, card_id),
+            ))
+        self.stop()
 
 class CardInfoCommand(Command):
     """Command to get detailed information about a specific card."""
@@ -38,10 +52,13 @@ class CardInfoCommand(Command):
     MIN_MATCH_SCORE = 80  # Minimum score for a single match
     HIGH_CONFIDENCE_THRESHOLD = 95  # Score above which we automatically use the match
     MAX_SUGGESTIONS = 5   # Maximum number of suggestions to show
+    MAX_EDHREC_CARDS = 5  # Maximum number of EDHREC cards to show per section
+    MAX_FIELD_LENGTH = 1024  # Discord's embed field value limit
     
     def __init__(self, card_data):
         self.card_data = card_data
         self.session = None
+        self.rules = None  # RulesIndex, set once the comprehensive rules are loaded
     
     async def _get_rulings(self, card: dict) -> List[dict]:
         """Fetch rulings for a card from Scryfall's API."""
@@ -79,21 +96,25 @@ class CardInfoCommand(Command):
     def usage(self) -> str:
         return "!card <card name>"
     
-    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
-        """Execute the card info command."""
+    async def execute(self, args: str, with_rules: bool = False) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the card info command.
+
+        Args:
+            args: The card name to look up.
+            with_rules: Also list the keyword rules the card's text refers to.
+        """
         if not args:
             return [discord.Embed(description=self.usage)], None
             
         # Try exact match first
-        card = self.card_data.get_card(args)
+        with STAGE_SECONDS.labels("card", "exact_lookup").time():
+            card = self.card_data.get_card(args)
         
         # If no exact match, try fuzzy matching
         if not card:
-            # Get all card names for fuzzy matching
-            card_names = list(self.card_data.cards.keys())
-            
             # Find the best matches
-            matches = process.extract(args, card_names, limit=self.MAX_SUGGESTIONS)
+            with STAGE_SECONDS.labels("card", "fuzzy").time():
+                matches = self.card_data.fuzzy_matches(args, self.MAX_SUGGESTIONS)
             
             # Check if we have any good matches
             good_matches = [match for match in matches if match[1] >= self.MIN_MATCH_SCORE]
@@ -101,17 +122,20 @@ class CardInfoCommand(Command):
             if good_matches:
                 # If we have a high confidence match, use it
                 if good_matches[0][1] >= self.HIGH_CONFIDENCE_THRESHOLD:
+                    CARD_LOOKUPS.labels("fuzzy_confident").inc()
                     card_name, score = good_matches[0]
                     card = self.card_data.cards[card_name]
-                    return [await self._format_card_info(card)], None
+                    return [await self._format_card_info(card, with_rules)], None
                 
                 # If we have exactly one good match, use it
                 if len(good_matches) == 1:
+                    CARD_LOOKUPS.labels("fuzzy_single").inc()
                     card_name, score = good_matches[0]
                     card = self.card_data.cards[card_name]
-                    return [await self._format_card_info(card)], None
+                    return [await self._format_card_info(card, with_rules)], None
                 
                 # Otherwise, show suggestions
+                CARD_LOOKUPS.labels("suggestions").inc()
                 suggestions = []
                 for card_name, score in good_matches:
                     # Properly capitalize the card name
@@ -124,15 +148,47 @@ class CardInfoCommand(Command):
                 )
                 
                 # Create a view with buttons for each suggestion
-                view = CardSuggestionView(self.card_data, good_matches)
+                view = CardSuggestionView(self.card_data.version, [
+                    (self.card_data.card_ids[card_name], self.card_data.cards[card_name]['name'])
+                    for card_name, _ in good_matches
+                ])
                 return [embed], view
             else:
+                CARD_LOOKUPS.labels("not_found").inc()
                 return [discord.Embed(description=f"Card not found: {args}")], None
         
-        return [await self._format_card_info(card)], None
+        CARD_LOOKUPS.labels("exact").inc()
+        return [await self._format_card_info(card, with_rules)], None
     
-    async def _format_card_info(self, card: dict) -> discord.Embed:
+    def _format_rule_refs(self, card: dict) -> str:
+        """Format the keyword rules linked to a card at snapshot build."""
+        lines = []
+        for number in card.get('rule_refs', []):
+            text = self.rules.get_rule(number) if self.rules else None
+            lines.append(f"**{number}** {text}" if text else f"**{number}**")
+        value = "\n".join(lines)
+        return value if len(value) <= self.MAX_FIELD_LENGTH else value[:self.MAX_FIELD_LENGTH - 1] + '…'
+
+    async def handle_suggestion(self, interaction: discord.Interaction) -> bool:
+        """Answer a click on a suggestion button, returning False if it is not one."""
+        parsed = parse_suggestion_custom_id(interaction.data.get("custom_id", ""))
+        if parsed is None:
+            return False
+        version, card_id = parsed
+        card = self.card_data.get_card_by_id(card_id) if version == self.card_data.version else None
+        if card is None:
+            # The card data was updated since the suggestions were made, so the ids changed
+            await interaction.response.send_message(
+                "These suggestions are out of date, please search for the card again.", ephemeral=True
+            )
+            return True
+        embed = await self._format_card_info(card)
+        await interaction.response.edit_message(embed=embed, view=None)
+        return True
+
+    async def _format_card_info(self, card: dict, with_rules: bool = False) -> discord.Embed:
         """Format card information into a Discord embed."""
+        start = time.perf_counter()
         embed = discord.Embed(title=card['name'])
         
         # Add mana cost to title if available
@@ -165,42 +221,28 @@ class CardInfoCommand(Command):
             embed.add_field(name="Rarity", value=card['rarity'].title(), inline=True)
         
         # Add EDHREC data if available
-        # if 'edhrec_data' in card:
-        #     edhrec = card['edhrec_data']
-            
-        #     # Format card name for EDHREC URL
-        #     formatted_name = card['name'].lower().replace(' ', '-').replace(',', '').replace("'", '')
-        #     edhrec_url = f"https://edhrec.com/cards/{formatted_name}"
-            
-        #     # Add EDHREC link
-        #     embed.add_field(name="EDHREC", value=f"[View on EDHREC]({edhrec_url})", inline=True)
+        edhrec = self.card_data.get_edhrec_lists(card)
+        if edhrec:
+            if edhrec.potential_decks:
+                embed.add_field(name="EDHREC Decks", value=f"{edhrec.potential_decks:,}", inline=True)
             
-        #     # Add rank if available
-        #     if edhrec.get('rank'):
-        #         embed.add_field(name="EDHREC Rank", value=f"#{edhrec['rank']}", inline=True)
-            
-        #     # Add deck statistics if available
-        #     if edhrec.get('average_decks') or edhrec.get('potential_decks'):
-        #         deck_stats = []
-        #         if edhrec.get('average_decks'):
-        #             deck_stats.append(f"Average Decks: {edhrec['average_decks']}")
-        #         if edhrec.get('potential_decks'):
-        #             deck_stats.append(f"Potential Decks: {edhrec['potential_decks']}")
-        #         if deck_stats:
-        #             embed.add_field(name="Deck Statistics", value="\n".join(deck_stats), inline=True)
-            
-        #     # Add top synergies if available
-        #     if edhrec.get('top_cards'):
-        #         top_cards = []
-        #         for card_data in edhrec['top_cards'][:5]:  # Show top 5 synergies
-        #             synergy = card_data.get('synergy', 0)
-        #             inclusion = card_data.get('inclusion_rate', 0)
-        #             top_cards.append(f"• {card_data['name']} (Synergy: {synergy:.2f}, Inclusion: {inclusion:.1%})")
-        #         if top_cards:
-        #             embed.add_field(name="Top Synergies", value="\n".join(top_cards), inline=False)
+            # Show the top synergies from the stored cardlists
+            tag = edhrec.find("highsynergycards", "topcards") or next(iter(edhrec.tags), None)
+            if tag:
+                top_cards = [
+                    f"• {entry.name} (Synergy: {entry.synergy:+.0%}, Inclusion: {entry.inclusion:.0%})"
+                    for entry in edhrec.section(tag)[:self.MAX_EDHREC_CARDS]
+                ]
+                if top_cards:
+                    embed.add_field(name=edhrec.header(tag), value="\n".join(top_cards), inline=False)
+        
+        # Add the precomputed keyword rule links
+        if with_rules and card.get('rule_refs'):
+            embed.add_field(name="Rules", value=self._format_rule_refs(card), inline=False)
         
         # Add rulings if available
-        rulings = await self._get_rulings(card)
+        with STAGE_SECONDS.labels("card", "rulings_fetch").time() as rulings_timer:
+            rulings = await self._get_rulings(card)
         if rulings:
             rulings_text = "\n\n".join(self._format_ruling(ruling) for ruling in rulings)
             if len(rulings_text) > 1024:
@@ -215,4 +257,6 @@ class CardInfoCommand(Command):
         if 'image_uris' in card and 'normal' in card['image_uris']:
             embed.set_image(url=card['image_uris']['normal'])
         
+        # Formatting time, not counting the wait for rulings
+        STAGE_SECONDS.labels("card", "embed_format").observe(time.perf_counter() - start - rulings_timer.elapsed)
         return embed 
\ No newline at end of file
@@ -0,0 +1,101 @@
+import asyncio
+import re
+import time
+from typing import Dict, Iterable, List, Optional
+import discord
+from src.commands.card_info import CardInfoCommand
+from src.data.name_detector import NameDetector
+
+MENTION_PATTERN = re.compile(r'\[\[([^\[\]]{1,150})\]\]')
+
+
+def extract_mentions(content: str) -> List[str]:
+    """Get the distinct [[Card Name]] references in a message, in order."""
+    mentions = {}
+    for match in MENTION_PATTERN.finditer(content):
+        name = ' '.join(match.group(1).split())
+        if name:
+            mentions.setdefault(name.lower(), name)
+    return list(mentions.values())
+
+
+class CardMentionHandler:
+    """Answers [[Card Name]] references in chat messages.
+
+    All references in a message are resolved in one batch and answered with a
+    single message. A card shown in a channel is not shown there again until
+    the dedupe window has passed. Channels that opt in also get card names
+    mentioned without brackets.
+    """
+
+    MAX_EMBEDS = 10  # Discord's limit of embeds per message
+    DEDUPE_SECONDS = 60.0  # How long a card shown in a channel is not repeated
+
+    def __init__(self, card_info: CardInfoCommand, detect_channels: Iterable[int] = ()):
+        self.card_info = card_info
+        self.card_data = card_info.card_data
+        self.detect_channels = set(detect_channels)
+        # Channel id -> card key -> when it was last shown there
+        self._recent: Dict[int, Dict[str, float]] = {}
+
+    def _seen_recently(self, channel_id: int, key: str, now: float) -> bool:
+        """Check if a card was shown in a channel within the dedupe window."""
+        shown_at = self._recent.get(channel_id, {}).get(key)
+        return shown_at is not None and now - shown_at < self.DEDUPE_SECONDS
+
+    def _prune(self, now: float):
+        """Forget cards whose dedupe window has passed."""
+        for channel_id in list(self._recent):
+            recent = {key: shown_at for key, shown_at in self._recent[channel_id].items()
+                      if now - shown_at < self.DEDUPE_SECONDS}
+            if recent:
+                self._recent[channel_id] = recent
+            else:
+                del self._recent[channel_id]
+
+    async def handle(self, channel_id: int, content: str, now: Optional[float] = None) -> List[discord.Embed]:
+        """Get the embeds answering the card references in a message, if any."""
+        detect = channel_id in self.detect_channels
+        if '[[' not in content and not detect:
+            return []
+        now = time.monotonic() if now is None else now
+        self._prune(now)
+
+        names = extract_mentions(content)
+        if detect:
+            detector = NameDetector.for_card_data(self.card_data)
+            names += [self.card_data.get_card_by_id(card_id)['name'] for card_id in detector.detect(content)]
+
+        # Names already answered in this channel are skipped before any lookup
+        names = [name for name in dict.fromkeys(names)
+                 if not self._seen_recently(channel_id, name.lower(), now)]
+        if not names:
+            return []
+
+        cards: Dict[str, dict] = {}
+        queries: Dict[str, List[str]] = {}  # Card key -> the names that resolved to it
+        missing = []
+        for name, card in zip(names, self.card_data.resolve_names(names)):
+            if card is None:
+                missing.append(name)
+                continue
+            key = card['name'].lower()
+            queries.setdefault(key, []).append(name.lower())
+            if not self._seen_recently(channel_id, key, now):
+                cards.setdefault(key, card)
+
+        # Leave room for the not-found notice
+        limit = self.MAX_EMBEDS - 1 if missing else self.MAX_EMBEDS
+        shown = list(cards.values())[:limit]
+        recent = self._recent.setdefault(channel_id, {})
+        for card in shown:
+            key = card['name'].lower()
+            for name in [key] + queries[key]:
+                recent[name] = now
+        for name in missing:
+            recent[name.lower()] = now
+
+        embeds = list(await asyncio.gather(*(self.card_info._format_card_info(card) for card in shown)))
+        if missing:
+            embeds.append(discord.Embed(description="Card not found: " + ", ".join(missing)))
+        return embeds
@@ -0,0 +1,88 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+import discord
+from src.commands.base import Command
+from src.monitoring.profiler import MAX_SECONDS, SamplingProfiler
+
+
+class DebugCommand(Command):
+    """Owner-only diagnostics, currently an on-demand sampling profiler."""
+
+    TOP_FUNCTIONS = 10  # Functions listed in the profile summary
+    FRAME_LENGTH = 90  # Characters of a function's name shown in the summary
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = output_dir
+        self.profiler = SamplingProfiler()
+        # Set on the event loop before the worker thread starts, so overlapping requests can't both start one
+        self._profiling = False
+
+    @property
+    def name(self) -> str:
+        return "debug"
+
+    @property
+    def description(self) -> str:
+        return "Owner-only diagnostics"
+
+    @property
+    def usage(self) -> str:
+        return f"!debug profile <seconds>, at most {MAX_SECONDS:g} seconds"
+
+    def _format_top(self, entries: List[Tuple[str, int]], samples: int) -> str:
+        lines = []
+        for frame, count in entries:
+            if len(frame) > self.FRAME_LENGTH:
+                frame = '…' + frame[-(self.FRAME_LENGTH - 1):]
+            lines.append(f"`{count / samples:6.1%}` {frame}")
+        return "\n".join(lines) or "No samples"
+
+    async def profile(self, seconds: float) -> Tuple[discord.Embed, Optional[Path]]:
+        """Profile the bot for a while, returning a summary embed and the collapsed-stack file."""
+        if self._profiling or self.profiler.running:
+            return discord.Embed(description="A profile is already running."), None
+
+        # Sampling happens on a worker thread so the event loop keeps running normally
+        self._profiling = True
+        try:
+            result = await asyncio.to_thread(self.profiler.profile, seconds)
+        finally:
+            self._profiling = False
+        path = result.write_collapsed(
+            self.output_dir / f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.folded"
+        )
+
+        samples = max(result.samples, 1)
+        embed = discord.Embed(
+            title=f"Profile: {result.duration:.1f}s",
+            description=f"{result.samples} samples every {result.interval * 1000:g}ms, "
+                        f"{result.overhead:.2%} sampling overhead",
+        )
+        embed.add_field(
+            name="Top functions (self)",
+            value=self._format_top(result.top(self.TOP_FUNCTIONS), samples)[:1024],
+            inline=False,
+        )
+        embed.add_field(
+            name="Top functions (total)",
+            value=self._format_top(result.top(self.TOP_FUNCTIONS, inclusive=True), samples)[:1024],
+            inline=False,
+        )
+        if result.over_budget:
+            embed.description += "\nStopped early: sampling kept costing more than the overhead budget"
+        embed.set_footer(text=f"Collapsed stacks: {path.name}")
+        return embed, path
+
+    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the debug command."""
+        action, _, value = args.strip().partition(' ')
+        if action != "profile":
+            return [discord.Embed(description=self.usage)], None
+        try:
+            seconds = float(value)
+        except ValueError:
+            return [discord.Embed(description=self.usage)], None
+        embed, _ = await self.profile(seconds)
+        return [embed], None
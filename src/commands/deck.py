@@ -0,0 +1,267 @@
+import asyncio
+from collections import OrderedDict
+from typing import List, Optional
+import discord
+from src.commands.base import Command
+from src.commands.response import send_embeds
+from src.data.card_data import CardData
+from src.data.combos import ComboIndex
+from src.data.deck_check import check_deck
+from src.data.deck_stats import CURVE_TOP, deck_stats
+from src.data.decklist import ResolvedDeck
+from src.data.power import FEATURE_LABELS, BracketEstimator
+
+
+class DeckCommand(Command):
+    """Imports decklists and keeps each user's most recent deck for analysis."""
+
+    MAX_DECKS = 1000  # Users whose decks are kept, least recently used dropped first
+    MAX_LISTED = 15  # Corrections or missing cards listed in the import summary
+    MAX_DECKLIST_BYTES = 64 * 1024  # Largest decklist attachment read
+    CURVE_WIDTH = 20  # Characters in the longest mana curve bar
+    BRACKET_NAMES = {1: "Exhibition", 2: "Core", 3: "Upgraded", 4: "Optimized", 5: "cEDH"}
+
+    def __init__(self, card_data: CardData):
+        self.card_data = card_data
+        self.decks: "OrderedDict[int, ResolvedDeck]" = OrderedDict()
+        # Set once the combo database is loaded
+        self.combos: Optional[ComboIndex] = None
+        self._estimator: Optional[BracketEstimator] = None
+        self._estimator_combos: Optional[ComboIndex] = None
+
+    @property
+    def name(self) -> str:
+        return "deck"
+
+    @property
+    def description(self) -> str:
+        return "Import a decklist and analyze it"
+
+    @property
+    def usage(self) -> str:
+        return "!deck import <decklist>, one \"<quantity> <card name>\" per line, then !deck stats, !deck check, !deck combos or !deck bracket"
+
+    def get_deck(self, user_id: int) -> Optional[ResolvedDeck]:
+        """Get a user's imported deck, re-resolved if the card data changed since."""
+        deck = self.decks.get(user_id)
+        if deck is None:
+            return None
+        if deck.version != self.card_data.version:
+            card_ids, matches = self.card_data.resolve_name_ids([entry.name for entry in deck.entries])
+            deck = ResolvedDeck(self.card_data.version, deck.entries, card_ids, matches)
+            self.decks[user_id] = deck
+        self.decks.move_to_end(user_id)
+        return deck
+
+    def _store(self, user_id: int, deck: ResolvedDeck):
+        self.decks[user_id] = deck
+        self.decks.move_to_end(user_id)
+        while len(self.decks) > self.MAX_DECKS:
+            self.decks.popitem(last=False)
+
+    def _format_list(self, lines: List[str]) -> str:
+        shown = lines[:self.MAX_LISTED]
+        if len(lines) > len(shown):
+            shown.append(f"…and {len(lines) - len(shown)} more")
+        return "\n".join(shown)[:1024]
+
+    def format_summary(self, deck: ResolvedDeck) -> discord.Embed:
+        """Summarize an imported deck: its commanders, card counts, corrections and misses."""
+        main_ids, main_quantities = deck.section('commander', 'main')
+        commanders = [self.card_data.get_card_by_id(card_id)['name'] for card_id in deck.commander_ids]
+        embed = discord.Embed(
+            title=f"Deck imported: {int(main_quantities.sum())} cards",
+            description=f"{len(main_ids)} of {len(deck.entries)} lines matched a card",
+        )
+        embed.add_field(
+            name="Commander" if len(commanders) == 1 else "Commanders",
+            value=", ".join(commanders) or "None found, put it under a \"Commander\" line or mark it *CMDR*",
+            inline=False,
+        )
+        for section in ('sideboard', 'maybeboard'):
+            _, quantities = deck.section(section)
+            if len(quantities):
+                embed.add_field(name=section.capitalize(), value=f"{int(quantities.sum())} cards")
+
+        corrections = [
+            f"{entry.name} → {self.card_data.get_card_by_id(int(card_id))['name']}"
+            for entry, card_id, match in zip(deck.entries, deck.card_ids, deck.matches)
+            if match == 'fuzzy'
+        ]
+        if corrections:
+            embed.add_field(name="Corrected", value=self._format_list(corrections), inline=False)
+        if deck.unresolved:
+            missing = [f"{entry.quantity} {entry.name}" for entry in deck.unresolved]
+            embed.add_field(name="Not found", value=self._format_list(missing), inline=False)
+        return embed
+
+    def import_deck(self, user_id: int, text: str) -> List[discord.Embed]:
+        """Resolve a decklist, keep it as the user's deck and summarize it."""
+        return self._keep(user_id, self.card_data.resolve_decklist(text))
+
+    async def import_text(self, user_id: int, text: str) -> List[discord.Embed]:
+        """Import a decklist, resolving it off the event loop.
+
+        Fuzzy matching a long list with many typos takes a while, so only the
+        resolution runs on a worker thread; the deck is kept back on the loop.
+        """
+        deck = await asyncio.to_thread(self.card_data.resolve_decklist, text)
+        return self._keep(user_id, deck)
+
+    def _keep(self, user_id: int, deck: ResolvedDeck) -> List[discord.Embed]:
+        if not deck.entries:
+            return [discord.Embed(description="No cards found in the decklist. " + self.usage)]
+        self._store(user_id, deck)
+        return [self.format_summary(deck)]
+
+    async def import_attachment(self, user_id: int, attachment: discord.Attachment) -> List[discord.Embed]:
+        """Import a decklist sent as a text file."""
+        if attachment.size > self.MAX_DECKLIST_BYTES:
+            return [discord.Embed(description=f"Decklists are limited to {self.MAX_DECKLIST_BYTES // 1024}KB.")]
+        text = (await attachment.read()).decode('utf-8', errors='replace')
+        return await self.import_text(user_id, text)
+
+    def _no_deck(self) -> List[discord.Embed]:
+        return [discord.Embed(description="No deck imported yet, use /deck import first.")]
+
+    def _format_curve(self, curve) -> str:
+        tallest = max(int(curve.max()), 1)
+        lines = []
+        for mana_value, count in enumerate(curve):
+            label = f"{mana_value}+" if mana_value == CURVE_TOP else f"{mana_value} "
+            bar = '█' * round(count / tallest * self.CURVE_WIDTH)
+            lines.append(f"`{label}` {bar} {int(count)}")
+        return "\n".join(lines)
+
+    def stats(self, user_id: int) -> List[discord.Embed]:
+        """Show the mana curve, color pips and type breakdown of a user's deck."""
+        deck = self.get_deck(user_id)
+        if deck is None:
+            return self._no_deck()
+        card_ids, quantities = deck.section('commander', 'main')
+        stats = deck_stats(self.card_data.table, card_ids, quantities)
+
+        embed = discord.Embed(
+            title=f"Deck stats: {stats.cards} cards",
+            description=f"Average mana value {stats.average_mana_value:.2f} (nonland), "
+                        f"{stats.lands} lands ({stats.land_ratio:.0%})",
+        )
+        embed.add_field(name="Mana curve", value=self._format_curve(stats.curve), inline=False)
+        total_pips = sum(stats.pips.values())
+        pips = [
+            f"{color} {count} ({count / total_pips:.0%}, up to {stats.heaviest[color]} in one cost)"
+            for color, count in stats.pips.items()
+        ]
+        embed.add_field(name="Color pips", value="\n".join(pips) or "None", inline=False)
+        types = [f"{card_type} {count}" for card_type, count in stats.types.items()]
+        embed.add_field(name="Types", value=" • ".join(types) or "None", inline=False)
+        return [embed]
+
+    def check(self, user_id: int) -> List[discord.Embed]:
+        """Check a user's deck against the Commander deck construction rules."""
+        deck = self.get_deck(user_id)
+        if deck is None:
+            return self._no_deck()
+        violations = check_deck(self.card_data, deck)
+        if not violations:
+            return [discord.Embed(title="Deck check: legal", description="The deck follows every Commander deck rule.")]
+
+        embed = discord.Embed(title=f"Deck check: {len(violations)} {'problem' if len(violations) == 1 else 'problems'}")
+        for violation in violations:
+            names = [self.card_data.get_card_by_id(card_id)['name'] for card_id in violation.card_ids]
+            embed.add_field(name=violation.message, value=self._format_list(names) if names else "\u200b", inline=False)
+        if deck.unresolved:
+            embed.set_footer(text=f"{len(deck.unresolved)} unresolved lines were not checked")
+        return [embed]
+
+    def _format_combo(self, index: int) -> str:
+        combo = self.combos.combos[index]
+        results = ", ".join(combo.results[:3]) or "No listed results"
+        return f"{' + '.join(combo.cards)}: {results}"
+
+    def find_combos(self, user_id: int) -> List[discord.Embed]:
+        """List the known combos in a user's deck, and those it is one card away from."""
+        if self.combos is None:
+            return [discord.Embed(description="The combo database isn't loaded.")]
+        deck = self.get_deck(user_id)
+        if deck is None:
+            return self._no_deck()
+        card_ids, _ = deck.section('commander', 'main')
+        matches = self.combos.match(card_ids)
+
+        embed = discord.Embed(
+            title=f"Deck combos: {len(matches.complete)}",
+            description=f"Checked against {len(self.combos):,} known combos",
+        )
+        complete = [self._format_combo(index) for index in matches.complete]
+        embed.add_field(name="In the deck", value=self._format_list(complete) or "None", inline=False)
+        near = [
+            f"Add {self.card_data.get_card_by_id(int(card_id))['name']}: {self._format_combo(index)}"
+            for index, card_id in zip(matches.near, matches.missing)
+        ]
+        if near:
+            embed.add_field(name="One card away", value=self._format_list(near), inline=False)
+        return [embed]
+
+    def _get_estimator(self) -> BracketEstimator:
+        """Get the bracket estimator, rebuilt if the combo database changed."""
+        if self._estimator is None or self._estimator_combos is not self.combos:
+            pieces = self.combos.two_card_pieces() if self.combos else None
+            self._estimator = BracketEstimator(self.card_data.table, pieces)
+            self._estimator_combos = self.combos
+        return self._estimator
+
+    def bracket(self, user_id: int) -> List[discord.Embed]:
+        """Estimate the power bracket of a user's deck."""
+        deck = self.get_deck(user_id)
+        if deck is None:
+            return self._no_deck()
+        card_ids, quantities = deck.section('commander', 'main')
+        estimate = self._get_estimator().estimate(card_ids, quantities)
+
+        embed = discord.Embed(
+            title=f"Deck bracket: {estimate.bracket} ({self.BRACKET_NAMES[estimate.bracket]})",
+            description=f"Power score {estimate.score:.1f}. This is an estimate from the cards alone, "
+                        "so talk it over with your playgroup.",
+        )
+        counts = [f"{FEATURE_LABELS[feature].capitalize()}: {count}" for feature, count in estimate.counts.items()]
+        embed.add_field(name="Power cards", value="\n".join(counts), inline=False)
+        if estimate.reasons:
+            embed.add_field(name="At least bracket 4 because of", value="\n".join(estimate.reasons), inline=False)
+        return [embed]
+
+    async def execute(self, args: str, user_id: int = 0) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the deck command."""
+        if args.strip() == "stats":
+            return self.stats(user_id), None
+        if args.strip() == "check":
+            return self.check(user_id), None
+        if args.strip() == "combos":
+            return self.find_combos(user_id), None
+        if args.strip() == "bracket":
+            return self.bracket(user_id), None
+        # The decklist may start on the next line
+        parts = args.split(maxsplit=1)
+        if len(parts) != 2 or parts[0] != "import":
+            return [discord.Embed(description=self.usage)], None
+        return await self.import_text(user_id, parts[1]), None
+
+
+class DeckImportModal(discord.ui.Modal, title="Import a decklist"):
+    """A form to paste a decklist into, for when there is no file to attach."""
+
+    decklist = discord.ui.TextInput(
+        label="Decklist",
+        style=discord.TextStyle.paragraph,
+        placeholder="1 Atraxa, Praetors' Voice\n1 Sol Ring\n...",
+        max_length=4000,
+    )
+
+    def __init__(self, deck: DeckCommand):
+        super().__init__()
+        self.deck = deck
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer()
+        embeds = await self.deck.import_text(interaction.user.id, self.decklist.value)
+        await send_embeds(interaction, embeds, command="deck")
@@ -0,0 +1,45 @@
+from typing import Callable
+import discord
+from discord.ui import Button, View
+
+
+class PaginatedView(View):
+    """View with previous/next buttons that renders each page on demand."""
+
+    def __init__(self, page_count: int, render_page: Callable[[int], discord.Embed], timeout: float = 180):
+        super().__init__(timeout=timeout)
+        self.page_count = page_count
+        self.render_page = render_page
+        self.page = 0
+
+        self.previous_button = Button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+        self.previous_button.callback = self.previous_callback
+        self.add_item(self.previous_button)
+
+        self.next_button = Button(label="Next ▶", style=discord.ButtonStyle.secondary)
+        self.next_button.callback = self.next_callback
+        self.add_item(self.next_button)
+
+        self._update_buttons()
+
+    def _update_buttons(self):
+        """Disable the buttons that would move past either end."""
+        self.previous_button.disabled = self.page <= 0
+        self.next_button.disabled = self.page >= self.page_count - 1
+
+    async def _show_page(self, interaction: discord.Interaction, page: int):
+        """Render the requested page and edit the message in place.
+
+        The page is the message's last embed; embeds sent before it in the
+        same message are kept.
+        """
+        self.page = max(0, min(page, self.page_count - 1))
+        self._update_buttons()
+        embeds = interaction.message.embeds[:-1] if interaction.message else []
+        await interaction.response.edit_message(embeds=embeds + [self.render_page(self.page)], view=self)
+
+    async def previous_callback(self, interaction: discord.Interaction):
+        await self._show_page(interaction, self.page - 1)
+
+    async def next_callback(self, interaction: discord.Interaction):
+        await self._show_page(interaction, self.page + 1)
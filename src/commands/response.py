@@ -0,0 +1,56 @@
+from typing import List, Optional
+import discord
+from src.monitoring.metrics import REST_CALLS, STAGE_SECONDS
+
+MAX_EMBEDS_PER_MESSAGE = 10  # Discord's limit of embeds per message
+MAX_EMBED_CHARS = 6000  # Discord's limit on the combined size of a message's embeds
+EMPTY_RESPONSE = "Nothing to show."  # Sent when a command produced no embeds
+
+
+def pack_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """Split embeds, in order, into as few messages as Discord's limits allow."""
+    messages: List[List[discord.Embed]] = []
+    size = 0
+    for embed in embeds:
+        length = len(embed)
+        if (not messages or len(messages[-1]) >= MAX_EMBEDS_PER_MESSAGE
+                or size + length > MAX_EMBED_CHARS):
+            messages.append([])
+            size = 0
+        messages[-1].append(embed)
+        size += length
+    return messages
+
+
+async def send_embeds(interaction: discord.Interaction, embeds: List[discord.Embed],
+                      view: Optional[discord.ui.View] = None, command: str = "") -> int:
+    """Answer an interaction with embeds packed into as few messages as possible.
+
+    The view is attached once, to the last message. Works whether or not the
+    interaction was deferred, and returns the REST calls made for it, counting
+    the defer. Sending is timed as the command's "followup_send" stage. With
+    no embeds a short fallback is sent, so a deferred interaction is never
+    left "thinking" until it times out.
+    """
+    calls = 1 if interaction.response.is_done() else 0
+    messages = pack_embeds(embeds or [discord.Embed(description=EMPTY_RESPONSE)])
+    with STAGE_SECONDS.labels(command or "unknown", "followup_send").time():
+        for index, batch in enumerate(messages):
+            kwargs = {'embeds': batch}
+            if view is not None and index == len(messages) - 1:
+                kwargs['view'] = view
+            if interaction.response.is_done():
+                await interaction.followup.send(**kwargs)
+            else:
+                await interaction.response.send_message(**kwargs)
+            calls += 1
+    REST_CALLS.observe(calls)
+    return calls
+
+
+async def send_channel_embeds(channel: discord.abc.Messageable, embeds: List[discord.Embed]) -> int:
+    """Send embeds to a channel packed into as few messages as possible, returning the REST calls made."""
+    messages = pack_embeds(embeds)
+    for batch in messages:
+        await channel.send(embeds=batch)
+    return len(messages)
@@ -0,0 +1,121 @@
+from typing import List, Optional
+import discord
+from src.commands.base import Command
+from src.commands.pagination import PaginatedView
+from src.commands.response import MAX_EMBED_CHARS
+from src.data.rules_index import RulesIndex
+
+
+class RuleCommand(Command):
+    """Command to look up comprehensive rules by number or keyword."""
+
+    PAGE_SIZE = 8  # Search results per page
+    SNIPPET_LENGTH = 200  # Characters of rule text shown per search result
+    MAX_DESCRIPTION = 4096  # Discord's embed description limit
+    MAX_FIELD = 1024  # Discord's embed field value limit
+    TITLE_LENGTH = 60  # Characters of a referenced rule's text shown next to its number
+
+    def __init__(self, rules: Optional[RulesIndex] = None):
+        self.rules = rules
+
+    @property
+    def name(self) -> str:
+        return "rule"
+
+    @property
+    def description(self) -> str:
+        return "Look up a comprehensive rule by number or search the rules"
+
+    @property
+    def usage(self) -> str:
+        return "!rule <rule number | keywords>, e.g. 702.9 or \"commander damage\""
+
+    @staticmethod
+    def _truncate(text: str, length: int) -> str:
+        return text if len(text) <= length else text[:length - 1] + '…'
+
+    def _format_references(self, numbers: List[str]) -> str:
+        """Format referenced rules as one line each, cut to fit an embed field."""
+        lines = []
+        length = 0
+        for number in numbers:
+            line = f"**{number}** {self._truncate(self.rules.get_rule(number), self.TITLE_LENGTH)}"
+            if length + len(line) + 1 > self.MAX_FIELD:
+                break
+            lines.append(line)
+            length += len(line) + 1
+        return "\n".join(lines)
+
+    def _format_rule(self, number: str) -> discord.Embed:
+        """Format a rule, its subrules, its parents and the rules they cite into an embed."""
+        context = self.rules.lookup(number)
+        lines = [context.text]
+        shown = {context.number}
+        cites = list(context.cites)
+        cited_by = list(context.cited_by)
+        for child_number, text in self.rules.subrules(number):
+            lines.append(f"**{child_number}** {text}")
+            shown.add(child_number)
+            child = self.rules.lookup(child_number)
+            cites.extend(child.cites)
+            cited_by.extend(child.cited_by)
+
+        embed = discord.Embed(title=f"Rule {number}")
+        if context.parents:
+            embed.add_field(name="Part of", value=self._format_references(context.parents), inline=False)
+        # References between the rules shown here add nothing
+        cites = [cited for cited in dict.fromkeys(cites) if cited not in shown]
+        if cites:
+            embed.add_field(name="Cites", value=self._format_references(cites), inline=False)
+        cited_by = [source for source in dict.fromkeys(cited_by) if source not in shown]
+        if cited_by:
+            embed.add_field(name="Cited by", value=self._format_references(cited_by), inline=False)
+        if self.rules.effective:
+            embed.set_footer(text=f"Comprehensive Rules effective {self.rules.effective}")
+        # The description gets whatever the title, fields and footer leave of the embed limit
+        room = min(self.MAX_DESCRIPTION, MAX_EMBED_CHARS - len(embed))
+        embed.description = self._truncate("\n\n".join(lines), room)
+        return embed
+
+    def _render_results(self, query: str, numbers: List[str], page: int, page_count: int) -> discord.Embed:
+        """Render one page of rule search results."""
+        lines = [
+            f"**{number}** {self._truncate(self.rules.get_rule(number), self.SNIPPET_LENGTH)}"
+            for number in numbers[page * self.PAGE_SIZE:(page + 1) * self.PAGE_SIZE]
+        ]
+        embed = discord.Embed(title=f"Rules: {query}", description="\n\n".join(lines))
+        embed.set_footer(text=f"Page {page + 1}/{page_count} • {len(numbers)} rules")
+        return embed
+
+    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the rule command."""
+        if not args:
+            return [discord.Embed(description=self.usage)], None
+        if not self.rules:
+            return [discord.Embed(description="The comprehensive rules are not available right now.")], None
+
+        args = args.strip()
+        if RulesIndex.is_rule_number(args):
+            number = args.rstrip('.')
+            if self.rules.get_rule(number) is None:
+                return [discord.Embed(description=f"Rule not found: {number}")], None
+            return [self._format_rule(number)], None
+
+        embeds = []
+        definition = self.rules.glossary.get(args.title())
+        if definition:
+            embeds.append(discord.Embed(
+                title=f"Glossary: {args.title()}",
+                description=self._truncate(definition, self.MAX_DESCRIPTION),
+            ))
+
+        numbers = self.rules.search(args)
+        if not numbers:
+            return embeds or [discord.Embed(description=f"No rules found for: {args}")], None
+
+        page_count = -(-len(numbers) // self.PAGE_SIZE)
+        render = lambda page: self._render_results(args, numbers, page, page_count)
+        embeds.append(render(0))
+        if page_count == 1:
+            return embeds, None
+        return embeds, PaginatedView(page_count, render)
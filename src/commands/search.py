@@ -0,0 +1,63 @@
+import time
+from typing import List
+import discord
+from src.commands.base import Command
+from src.commands.pagination import PaginatedView
+from src.data.query import QueryError
+
+
+class SearchCommand(Command):
+    """Command to search the local card snapshot with Scryfall-style syntax."""
+
+    PAGE_SIZE = 20  # Results per page
+
+    def __init__(self, card_data):
+        self.card_data = card_data
+
+    @property
+    def name(self) -> str:
+        return "search"
+
+    @property
+    def description(self) -> str:
+        return "Search cards with Scryfall syntax (o:, t:, id:, mv:, f:, r:, s:)"
+
+    @property
+    def usage(self) -> str:
+        return '!search <query>, e.g. t:legendary t:creature id<=wu f:commander o:"draw a card"'
+
+    def _render_page(self, query: str, card_ids, page: int, page_count: int, elapsed_ms: float) -> discord.Embed:
+        """Render one page of search results."""
+        lines = []
+        for card_id in card_ids[page * self.PAGE_SIZE:(page + 1) * self.PAGE_SIZE]:
+            card = self.card_data.get_card_by_id(int(card_id))
+            mana_cost = f" {card['mana_cost']}" if card.get('mana_cost') else ""
+            lines.append(f"**{card['name']}**{mana_cost} — {card.get('type_line', '')}")
+
+        embed = discord.Embed(title=f"Search: {query}", description="\n".join(lines))
+        embed.set_footer(
+            text=f"Page {page + 1}/{page_count} • {len(card_ids)} cards • {elapsed_ms:.1f} ms"
+        )
+        return embed
+
+    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the search command."""
+        if not args:
+            return [discord.Embed(description=self.usage)], None
+
+        start = time.perf_counter()
+        try:
+            card_ids = self.card_data.query_engine.search(args)
+        except QueryError as e:
+            return [discord.Embed(title="Invalid Search", description=str(e))], None
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not len(card_ids):
+            return [discord.Embed(description=f"No cards found for: {args}")], None
+
+        page_count = -(-len(card_ids) // self.PAGE_SIZE)
+        render = lambda page: self._render_page(args, card_ids, page, page_count, elapsed_ms)
+
+        if page_count == 1:
+            return [render(0)], None
+        return [render(0)], PaginatedView(page_count, render)
@@ -0,0 +1,62 @@
+import time
+from typing import List
+import discord
+from src.commands.base import Command
+from src.commands.pagination import PaginatedView
+
+
+class TextSearchCommand(Command):
+    """Command to search card rules text with the full-text index."""
+
+    PAGE_SIZE = 10  # Results per page
+    SNIPPET_LENGTH = 120  # Characters of oracle text shown per result
+
+    def __init__(self, card_data):
+        self.card_data = card_data
+
+    @property
+    def name(self) -> str:
+        return "oracle"
+
+    @property
+    def description(self) -> str:
+        return "Search card rules text, use quotes for exact phrases"
+
+    @property
+    def usage(self) -> str:
+        return '!oracle <words>, e.g. "whenever you sacrifice" token'
+
+    def _render_page(self, query: str, card_ids, page: int, page_count: int, elapsed_ms: float) -> discord.Embed:
+        """Render one page of ranked results."""
+        lines = []
+        for card_id in card_ids[page * self.PAGE_SIZE:(page + 1) * self.PAGE_SIZE]:
+            card = self.card_data.get_card_by_id(int(card_id))
+            snippet = card.get('oracle_text', '').replace('\n', ' ')
+            if len(snippet) > self.SNIPPET_LENGTH:
+                snippet = snippet[:self.SNIPPET_LENGTH - 1] + '…'
+            lines.append(f"**{card['name']}** — {snippet}")
+
+        embed = discord.Embed(title=f"Oracle: {query}", description="\n".join(lines))
+        embed.set_footer(
+            text=f"Page {page + 1}/{page_count} • {len(card_ids)} cards • {elapsed_ms:.1f} ms"
+        )
+        return embed
+
+    async def execute(self, args: str) -> tuple[List[discord.Embed], discord.ui.View | None]:
+        """Execute the oracle text search command."""
+        if not args:
+            return [discord.Embed(description=self.usage)], None
+
+        start = time.perf_counter()
+        card_ids, _ = self.card_data.text_index.search(args)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        if not len(card_ids):
+            return [discord.Embed(description=f"No cards found for: {args}")], None
+
+        page_count = -(-len(card_ids) // self.PAGE_SIZE)
+        render = lambda page: self._render_page(args, card_ids, page, page_count, elapsed_ms)
+
+        if page_count == 1:
+            return [render(0)], None
+        return [render(0)], PaginatedView(page_count, render)
@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Dict, Generic, Hashable, Iterator, List, Sequence, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char in "'’"
+
+
+class AhoCorasick(Generic[T]):
+    """Multi-pattern string matcher that scans a text once for every pattern.
+
+    Patterns are matched case-sensitively, so callers normalize both the
+    patterns and the text (e.g. lowercase) the same way. Patterns and text can
+    also be sequences of tokens, such as tuples of words, instead of strings.
+    """
+
+    def __init__(self, patterns: Dict[Sequence[Hashable], T]):
+        """Build the automaton from a mapping of pattern to value."""
+        self._goto: List[Dict[Hashable, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Patterns ending at a node, as (length, value) pairs
+        self._outputs: List[List[Tuple[int, T]]] = [[]]
+
+        for pattern, value in patterns.items():
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                next_node = self._goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self._goto)
+                    self._goto[node][char] = next_node
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._outputs.append([])
+                node = next_node
+            self._outputs[node].append((len(pattern), value))
+
+        # Breadth-first pass to set failure links and merge outputs
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def __len__(self) -> int:
+        """Get the number of states in the automaton."""
+        return len(self._goto)
+
+    def iter(self, text: Sequence[Hashable], whole_words: bool = True) -> Iterator[Tuple[int, int, T]]:
+        """Yield (start, end, value) for every pattern occurrence in text.
+
+        With whole_words, a match must not be preceded or followed by a
+        letter, digit or apostrophe. Token sequences need whole_words=False.
+        """
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+            end = index + 1
+            for pattern_length, value in outputs[node]:
+                start = end - pattern_length
+                if whole_words and (
+                    (start > 0 and _is_word_char(text[start - 1]))
+                    or (end < length and _is_word_char(text[end]))
+                ):
+                    continue
+                yield start, end, value
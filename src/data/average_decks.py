@@ -0,0 +1,90 @@
+import hashlib
+import json
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+def card_key(name: str) -> str:
+    """Get the snapshot key for a card name (front face, lowercase)."""
+    return name.split(" // ")[0].strip().lower()
+
+
+def snapshot_version(names: List[str]) -> str:
+    """Get a version that changes whenever the card ids do, from the sorted snapshot keys."""
+    return hashlib.sha1('\n'.join(names).encode('utf-8')).hexdigest()[:8]
+
+
+def parse_deck_line(line: str) -> Optional[Tuple[int, str]]:
+    """Parse a "<quantity> <card name>" line from an EDHREC average deck."""
+    line = line.strip()
+    if not line:
+        return None
+    quantity, _, name = line.partition(" ")
+    if quantity.isdigit() and name:
+        return int(quantity), name
+    return 1, line
+
+
+def encode_deck(entries: List[Tuple[int, str]], card_ids: Dict[str, int]) -> List[int]:
+    """Encode (quantity, name) entries as a flat [id, qty, id, qty, ...] list.
+
+    Cards that are not in the snapshot are dropped.
+    """
+    encoded = []
+    for quantity, name in entries:
+        card_id = card_ids.get(card_key(name))
+        if card_id is not None:
+            encoded.extend((card_id, quantity))
+    return encoded
+
+
+class AverageDeckStore:
+    """Per-commander average decklists stored as compact id/quantity arrays.
+
+    Card ids are only meaningful for the snapshot they were encoded against,
+    so the file records that snapshot's version and is ignored once the
+    snapshot changes.
+    """
+
+    def __init__(self, data_file: Path, version: str):
+        """Load the average decks file if it exists and matches the snapshot version."""
+        self.data_file = data_file
+        self.version = version
+        self.decks: Dict[str, array] = {}
+        self._load()
+
+    def _load(self):
+        """Load average decks from the JSON file."""
+        if not self.data_file.exists():
+            return
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.version:
+                print(f"Ignoring {self.data_file.name}: encoded against another card snapshot, "
+                      f"download again with FETCH_AVERAGE_DECKS=1")
+                return
+            self.decks = {name: array('I', values) for name, values in data['decks'].items()}
+            print(f"Loaded {len(self.decks)} average decks from {self.data_file}")
+        except Exception as e:
+            print(f"Failed to load average decks: {e}")
+
+    def __contains__(self, commander: str) -> bool:
+        return commander.lower() in self.decks
+
+    def __len__(self) -> int:
+        return len(self.decks)
+
+    def count(self, commander: str) -> int:
+        """Get the number of distinct cards in a commander's average deck."""
+        return len(self.decks.get(commander.lower(), ())) // 2
+
+    def entries(self, commander: str, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+        """Iterate (card id, quantity) pairs for a slice of a commander's deck."""
+        deck = self.decks.get(commander.lower())
+        if deck is None:
+            return
+        stop = len(deck) // 2 if stop is None else min(stop, len(deck) // 2)
+        for index in range(start, stop):
+            yield deck[2 * index], deck[2 * index + 1]
@@ -1,18 +1,59 @@
 import json
+import re
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from rapidfuzz import fuzz, process, utils
+from src.data.edhrec_lists import EdhrecLists
+from src.data.average_decks import AverageDeckStore, snapshot_version
+from src.data.card_table import CardTable
+from src.data.color_index import ColorIndex
+from src.data.decklist import NO_CARD, ResolvedDeck, parse_decklist
+from src.data.query import QueryEngine
+from src.data.fulltext import FullTextIndex
+from src.monitoring.metrics import CACHE_REQUESTS
+
+def normalize_name(name: str) -> str:
+    """Normalize a card name for matching: no accents, case or punctuation."""
+    name = unicodedata.normalize('NFKD', name.replace('Æ', 'Ae').replace('æ', 'ae'))
+    name = name.encode('ascii', 'ignore').decode('ascii').lower()
+    return ' '.join(re.sub(r"[^a-z0-9 ]+", ' ', name.replace("'", '')).split())
+
 
 class CardData:
     """Handles loading and querying MTG card data from local JSON file."""
     
-    def __init__(self):
-        """Initialize the card data handler."""
+    FUZZY_MATCH_SCORE = 90  # Minimum score for resolve_names to accept a fuzzy match
+
+    def __init__(self, data_file: Optional[Path] = None):
+        """Initialize the card data handler.
+
+        Args:
+            data_file: Optional path to a snapshot, defaults to reference/oracle_cards.json.
+        """
         # Get the absolute path to the reference directory
         self.base_path = Path(__file__).parent.parent.parent
         self.data_dir = self.base_path / 'reference'
-        self.data_file = self.data_dir / 'oracle_cards.json'
+        self.data_file = Path(data_file) if data_file else self.data_dir / 'oracle_cards.json'
         self.cards: Dict[str, dict] = {}
+        # Card ids are positions in the sorted list of snapshot keys
+        self.names: List[str] = []
+        self.card_ids: Dict[str, int] = {}
+        # Changes whenever the card ids change, i.e. when the set of names does
+        self.version = ''
+        self._edhrec_lists: Dict[str, EdhrecLists] = {}
+        self._normalized_ids: Dict[str, int] = {}
+        self._fuzzy_choices: List[str] = []
         self._load_cards()
+        self.table = CardTable(self.names, self.cards)
+        self.color_index = ColorIndex(self)
+        self.query_engine = QueryEngine(self)
+        self.text_index = FullTextIndex(
+            (self.cards[name].get('oracle_text', ''), self.cards[name].get('type_line', ''))
+            for name in self.names
+        )
+        self.average_decks = AverageDeckStore(self.data_file.parent / 'average_decks.json', self.version)
     
     def _load_cards(self):
         """Load card data from JSON file."""
@@ -28,6 +69,9 @@ class CardData:
                     self.cards = {card['name'].lower(): card for card in data}
                 else:
                     raise ValueError(f"Unexpected data format in {self.data_file}")
+            self.names = sorted(self.cards)
+            self.card_ids = {name: card_id for card_id, name in enumerate(self.names)}
+            self.version = snapshot_version(self.names)
             print(f"Loaded {len(self.cards)} cards from {self.data_file}")
         except FileNotFoundError:
             print(f"Failed to load cards: Card data file not found at {self.data_file}")
@@ -43,6 +87,95 @@ class CardData:
         """Get a card by its exact name."""
         return self.cards.get(name.lower())
     
+    def get_card_by_id(self, card_id: int) -> Optional[dict]:
+        """Get a card by its id in the loaded snapshot."""
+        if 0 <= card_id < len(self.names):
+            return self.cards[self.names[card_id]]
+        return None
+    
+    def _get_normalized_ids(self) -> Dict[str, int]:
+        """Get card ids by normalized name, including the front face of multi-face cards."""
+        if not self._normalized_ids:
+            for card_id, name in enumerate(self.names):
+                self._normalized_ids.setdefault(normalize_name(name), card_id)
+                if ' // ' in name:
+                    self._normalized_ids.setdefault(normalize_name(name.split(' // ')[0]), card_id)
+        return self._normalized_ids
+
+    def _get_fuzzy_choices(self) -> List[str]:
+        """Get every card name preprocessed for fuzzy matching, in card id order."""
+        if not self._fuzzy_choices:
+            self._fuzzy_choices = [utils.default_process(name) for name in self.names]
+        return self._fuzzy_choices
+
+    def fuzzy_matches(self, query: str, limit: int) -> List[Tuple[str, int]]:
+        """Get the card names closest to a query with their scores out of 100, best first.
+
+        Scored like resolve_name_ids, so a typo resolves the same way in
+        /card as in a decklist.
+        """
+        matches = process.extract(
+            utils.default_process(query), self._get_fuzzy_choices(), scorer=fuzz.WRatio, limit=limit,
+        )
+        return [(self.names[index], round(score)) for _, score, index in matches]
+
+    def resolve_name_ids(self, names: List[str]) -> Tuple[np.ndarray, List[str]]:
+        """Resolve a batch of card names to card ids, NO_CARD for names that match nothing.
+
+        Returns the ids and how each name matched: "exact", "normalized",
+        "fuzzy" or "". Exact and normalized matches are tried for every name
+        first; the names left over are scored against every card name in one
+        vectorized pass rather than one scan per name.
+        """
+        normalized_ids = self._get_normalized_ids()
+        card_ids = np.full(len(names), NO_CARD, dtype=np.int32)
+        matches = [''] * len(names)
+        unresolved = []
+        for index, name in enumerate(names):
+            card_id = self.card_ids.get(name.lower())
+            match = 'exact'
+            if card_id is None:
+                card_id = normalized_ids.get(normalize_name(name))
+                match = 'normalized'
+            if card_id is None:
+                unresolved.append(index)
+            else:
+                card_ids[index], matches[index] = card_id, match
+
+        if unresolved and self.names:
+            scores = process.cdist(
+                [utils.default_process(names[index]) for index in unresolved], self._get_fuzzy_choices(),
+                scorer=fuzz.WRatio, score_cutoff=self.FUZZY_MATCH_SCORE, dtype=np.uint8, workers=-1,
+            )
+            best = scores.argmax(axis=1)
+            for row, index in enumerate(unresolved):
+                if scores[row, best[row]]:
+                    card_ids[index], matches[index] = best[row], 'fuzzy'
+        return card_ids, matches
+
+    def resolve_names(self, names: List[str]) -> List[Optional[dict]]:
+        """Resolve a batch of card names, in order, with None for names that match nothing."""
+        card_ids, _ = self.resolve_name_ids(names)
+        return [None if card_id == NO_CARD else self.get_card_by_id(int(card_id)) for card_id in card_ids]
+
+    def resolve_decklist(self, text: str) -> ResolvedDeck:
+        """Parse a decklist and resolve all of its card names in one batch."""
+        entries = parse_decklist(text)
+        card_ids, matches = self.resolve_name_ids([entry.name for entry in entries])
+        return ResolvedDeck(self.version, entries, card_ids, matches)
+
+    def get_edhrec_lists(self, card: dict) -> Optional[EdhrecLists]:
+        """Get the lazily decoded EDHREC cardlists for a commander."""
+        if 'edhrec_data' not in card:
+            return None
+        key = card['name'].lower()
+        if key not in self._edhrec_lists:
+            CACHE_REQUESTS.labels("edhrec_lists", "miss").inc()
+            self._edhrec_lists[key] = EdhrecLists(card['edhrec_data'])
+        else:
+            CACHE_REQUESTS.labels("edhrec_lists", "hit").inc()
+        return self._edhrec_lists[key]
+    
     def search_cards(self, query: str, limit: int = 5) -> List[dict]:
         """Search for cards matching the query string."""
         query = query.lower()
@@ -54,4 +187,12 @@ class CardData:
                 if len(matches) >= limit:
                     break
         
-        return matches 
\ No newline at end of file
+        return matches 
+    
+    def search_text(self, query: str, limit: int = 5) -> List[dict]:
+        """Search oracle text and type lines, best BM25 matches first.
+
+        Bare words must all appear; quoted text must appear as a phrase.
+        """
+        card_ids, _ = self.text_index.search(query)
+        return [self.get_card_by_id(int(card_id)) for card_id in card_ids[:limit]]
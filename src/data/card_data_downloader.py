@@ -1,10 +1,18 @@
 import json
+import os
 import asyncio
 import aiohttp
 import unicodedata
 from pathlib import Path
-from typing import Optional, TypedDict, Any
+from typing import Awaitable, Callable, Optional, TypedDict, TypeVar, Any
 from datetime import datetime
+from src.data.edhrec_lists import encode_cardlists
+from src.data.average_decks import encode_deck, parse_deck_line, snapshot_version
+from src.data.rules_index import RulesIndex
+from src.data.rule_links import RuleLinker
+from src.data.power import tag_power_features
+
+T = TypeVar('T')
 
 
 class CardRequiredFields(TypedDict):
@@ -24,15 +32,20 @@ class Card(CardRequiredFields, total=False):
     all_parts: list[dict[str, Any]]
     # Populated by your enrichment step:
     edhrec_data: dict[str, Any]
+    # Keyword rules referenced by the oracle text, e.g. ["702.9"]
+    rule_refs: list[str]
 
 
 class CardDataDownloader:
     """Downloads and processes MTG card data from Scryfall."""
 
-    SCRYFALL_BULK_API = "https://api.scryfall.com/bulk-data"
+    SCRYFALL_API = "https://api.scryfall.com"
     ORACLE_CARDS = "oracle_cards"
-    EDHREC_BASE_URL = "https://json.edhrec.com/pages/commanders"
-    AVERAGE_DECK_BASE_URL = "https://json.edhrec.com/pages/average-decks"
+    EDHREC_API = "https://json.edhrec.com/pages"
+    MAX_CONCURRENT_REQUESTS = 8  # EDHREC requests in flight at once
+    MAX_ATTEMPTS = 4  # Tries per request when rate limited or the server fails
+    RETRY_DELAY = 0.5  # Seconds before the first retry, doubled after each one
+    DOWNLOAD_CHUNK_SIZE = 1 << 20
     BACKGROUND_COMMANDERS = []
     BACKGROUNDS = []
     PARTNERS = []
@@ -40,14 +53,40 @@ class CardDataDownloader:
     DOCTORS_COMMANDERS = []
     FRIENDS_FOREVER = []
 
-    def __init__(self):
-        """Initialize the downloader."""
+    def __init__(
+        self,
+        fetch_average_decks: bool = False,
+        data_dir: Optional[Path] = None,
+        scryfall_api: Optional[str] = None,
+        edhrec_api: Optional[str] = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+    ):
+        """Initialize the downloader.
+
+        Args:
+            fetch_average_decks: Also fetch each commander's EDHREC average deck.
+            data_dir: Where to save the data, defaults to the reference directory.
+            scryfall_api: Scryfall API base URL, defaults to $SCRYFALL_API_URL or the real API.
+            edhrec_api: EDHREC JSON pages base URL, defaults to $EDHREC_API_URL or the real site.
+            max_concurrent_requests: EDHREC requests in flight at once.
+        """
         # Get the absolute path to the reference directory
         self.base_path = Path(__file__).parent.parent.parent
-        self.data_dir = self.base_path / 'reference'
+        self.data_dir = Path(data_dir) if data_dir else self.base_path / 'reference'
         self.data_dir.mkdir(exist_ok=True)
+        self.scryfall_api = (scryfall_api or os.getenv("SCRYFALL_API_URL") or self.SCRYFALL_API).rstrip('/')
+        self.edhrec_api = (edhrec_api or os.getenv("EDHREC_API_URL") or self.EDHREC_API).rstrip('/')
+        self.max_concurrent_requests = max_concurrent_requests
         self.data_file = self.data_dir / 'oracle_cards.json'
         self.last_download_file = self.data_dir / 'last_download.json'
+        self.average_decks_file = self.data_dir / 'average_decks.json'
+        self.fetch_average_decks = fetch_average_decks
+        self.average_decks: dict[str, list[int]] = {}
+        # Size of the EDHREC cardlists as fetched vs. as stored in the snapshot
+        self.edhrec_raw_bytes = 0
+        self.edhrec_stored_bytes = 0
+        # Requests retried after a 429, a server error or a connection failure
+        self.retries = 0
 
     def _update_last_download(self):
         """Update the last download timestamp."""
@@ -59,29 +98,79 @@ class CardDataDownloader:
         except Exception as e:
             print(f"Error updating last download timestamp: {e}")
 
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        read: Callable[[aiohttp.ClientResponse], Awaitable[T]],
+    ) -> Optional[T]:
+        """GET a URL and read a successful response, retrying when it is worth it.
+
+        429s (after their Retry-After), server errors and connection failures
+        are retried with exponential backoff. Returns None for other statuses,
+        or once every attempt has failed.
+        """
+        delay = self.RETRY_DELAY
+        problem = ''
+        for attempt in range(self.MAX_ATTEMPTS):
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return await read(response)
+                    if response.status != 429 and response.status < 500:
+                        return None
+                    problem = f"HTTP {response.status}"
+                    retry_after = response.headers.get('Retry-After', '')
+                    wait = float(retry_after) if retry_after.replace('.', '', 1).isdigit() else delay
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                problem = str(e) or type(e).__name__
+                wait = delay
+            if attempt + 1 < self.MAX_ATTEMPTS:
+                self.retries += 1
+                await asyncio.sleep(wait)
+                delay *= 2
+        print(f"Giving up on {url} after {self.MAX_ATTEMPTS} attempts: {problem}")
+        return None
+
+    async def _get_json(self, session: aiohttp.ClientSession, url: str) -> Optional[Any]:
+        """GET a JSON document, with retries."""
+        return await self._fetch(session, url, lambda response: response.json())
+
     async def _get_bulk_data_url(self) -> Optional[str]:
         """Get the download URL for oracle cards bulk data."""
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(self.SCRYFALL_BULK_API) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        for item in data['data']:
-                            if item['type'] == self.ORACLE_CARDS:
-                                return item['download_uri']
+                data = await self._get_json(session, f"{self.scryfall_api}/bulk-data")
+                for item in data['data'] if data else []:
+                    if item['type'] == self.ORACLE_CARDS:
+                        return item['download_uri']
             except Exception as e:
                 print(f"Error getting bulk data URL: {e}")
         return None
 
     async def _download_cards(self, url: str) -> list[Card]:
-        """Download and process card data from Scryfall."""
+        """Download card data from Scryfall.
+
+        The bulk file is streamed to disk before parsing, so the raw response
+        is never held in memory next to the parsed cards.
+        """
+        download_file = self.data_dir / 'oracle_cards.download'
+
+        async def save(response: aiohttp.ClientResponse) -> Path:
+            with open(download_file, 'wb') as f:
+                async for chunk in response.content.iter_chunked(self.DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+            return download_file
+
         async with aiohttp.ClientSession() as session:
             try:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.json()
+                if await self._fetch(session, url, save):
+                    with open(download_file, 'r', encoding='utf-8') as f:
+                        return json.load(f)
             except Exception as e:
                 print(f"Error downloading card data: {e}")
+            finally:
+                download_file.unlink(missing_ok=True)
         return []
 
     def _format_name_for_edhrec(self, name: str) -> str:
@@ -107,24 +196,51 @@ class CardDataDownloader:
         """Get EDHREC data for a card."""
         try:
             formatted_name = self._format_name_for_edhrec(card_name)
-            url = f"{self.EDHREC_BASE_URL}/{formatted_name}.json"
-
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    data_dictionary = data["container"]["json_dict"]
-                    if data_dictionary["cardlists"]:
-                        return {
-                            "synergies": data_dictionary["cardlists"][1],
-                            "potential_decks": data_dictionary["card"].get(
-                                "potential_decks", 0
-                            ),
-                        }
+            data = await self._get_json(session, f"{self.edhrec_api}/commanders/{formatted_name}.json")
+            if data:
+                data_dictionary = data["container"]["json_dict"]
+                cardlists = data_dictionary["cardlists"]
+                if cardlists:
+                    encoded = encode_cardlists(cardlists)
+                    self.edhrec_raw_bytes += len(json.dumps(cardlists))
+                    self.edhrec_stored_bytes += len(json.dumps(encoded))
+                    return {
+                        "cardlists": encoded,
+                        "potential_decks": data_dictionary["card"].get(
+                            "potential_decks", 0
+                        ),
+                    }
             return None
         except Exception as e:
             print(f"Error fetching EDHREC data for {card_name}: {e}")
             return None
 
+    async def _get_average_deck(
+        self, session: aiohttp.ClientSession, commander_name: str
+    ) -> Optional[list[tuple[int, str]]]:
+        """Get the EDHREC average decklist for a commander as (quantity, name) entries."""
+        try:
+            formatted_name = self._format_name_for_edhrec(commander_name)
+            data = await self._get_json(session, f"{self.edhrec_api}/average-decks/{formatted_name}.json")
+            if not data:
+                return None
+
+            if data.get("deck"):
+                entries = [parse_deck_line(line) for line in data["deck"]]
+                return [entry for entry in entries if entry]
+
+            # Fall back to the cardlists when the plain decklist is missing
+            cardlists = data.get("container", {}).get("json_dict", {}).get("cardlists", [])
+            return [
+                (view.get("quantity", 1), view["name"])
+                for cardlist in cardlists
+                for view in cardlist.get("cardviews", [])
+                if view.get("name")
+            ] or None
+        except Exception as e:
+            print(f"Error fetching average deck for {commander_name}: {e}")
+            return None
+
     def _process_cards(self, cards: list[Card]) -> dict[str, Card]:
         """Process downloaded cards into a name-indexed dictionary."""
         processed = {}
@@ -133,16 +249,20 @@ class CardDataDownloader:
             if card.get('layout') == 'art_series':
                 continue
 
-            # Use the first face for double-faced cards
+            # Use the first face for double-faced cards, keeping card-level
+            # fields such as color_identity and legalities
             if 'card_faces' in card:
-                card = card['card_faces'][0]
+                face = card['card_faces'][0]
+                card = {key: value for key, value in card.items() if key != 'card_faces'}
+                card.update(face)
 
             # Store the card with its name as the key
             processed[card['name'].lower()] = card
 
         return processed
 
-    def _is_commander(self, card: Card) -> bool:
+    @staticmethod
+    def _is_commander(card: Card) -> bool:
         """Check if a card can be a commander."""
         # Check if card is legal in commander
         if card.get('legalities', {}).get('commander') != 'legal':
@@ -248,33 +368,57 @@ class CardDataDownloader:
 
     async def _enrich_with_edhrec_data(self, cards: dict[str, Card]) -> dict[str, Card]:
         """Enrich card data with EDHREC information."""
-        # Count total commanders first
-        total_commanders = sum(bool(self._is_commander(card))
-                           for card in cards.values())
+        # Find the commanders first
+        commanders = [(key, card) for key, card in cards.items() if self._is_commander(card)]
+        total_commanders = len(commanders)
         processed = 0
 
         print(f"\nEnriching {total_commanders} commanders with EDHREC data...")
 
+        # Average decks reference cards by their id in the saved snapshot
+        card_ids = {name: card_id for card_id, name in enumerate(sorted(cards))}
+        # Bounds the requests in flight, on top of retrying 429s
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def enrich(session: aiohttp.ClientSession, key: str, card: Card):
+            nonlocal processed
+            async with semaphore:
+                commander_name = self._get_commander_name(card)
+                edhrec_data = await self._get_edhrec_data(session, commander_name)
+                if edhrec_data:
+                    card['edhrec_data'] = edhrec_data
+                else:
+                    print(f"Failed to fetch EDHREC data for {commander_name}")
+
+                if self.fetch_average_decks:
+                    entries = await self._get_average_deck(session, commander_name)
+                    if entries:
+                        self.average_decks[key] = encode_deck(entries, card_ids)
+
+            processed += 1
+            percentage = (processed / total_commanders) * 100
+            print(f"\rProgress: {processed}/{total_commanders} commanders processed ({percentage:.1f}%)", end="")
+
         async with aiohttp.ClientSession() as session:
-            for card in cards.values():
-                if self._is_commander(card):
-                    commander_name = self._get_commander_name(card)
-                    edhrec_data = await self._get_edhrec_data(session, commander_name)
-                    if edhrec_data:
-                        card['edhrec_data'] = edhrec_data
-                    else:
-                        print(f"Failed to fetch EDHREC data for {commander_name}")
-
-                    processed += 1
-                    percentage = (processed / total_commanders) * 100
-                    print(f"\rProgress: {processed}/{total_commanders} commanders processed ({percentage:.1f}%)", end="")
-
-                    # Add delay to respect rate limits
-                    await asyncio.sleep(0.001)
+            await asyncio.gather(*(enrich(session, key, card) for key, card in commanders))
 
         print("\nEDHREC data enrichment complete!")
+        if self.edhrec_raw_bytes:
+            ratio = self.edhrec_stored_bytes / self.edhrec_raw_bytes
+            print(f"EDHREC cardlists: {self.edhrec_raw_bytes / 1e6:.1f} MB fetched, "
+                  f"{self.edhrec_stored_bytes / 1e6:.1f} MB stored ({ratio:.1%})")
         return cards
 
+    def _link_rules(self, cards: dict[str, Card]):
+        """Store the keyword rules each card's oracle text refers to."""
+        rules_pdfs = sorted(self.data_dir.glob('MagicCompRules_*.pdf'))
+        rules = RulesIndex.load_or_build(rules_pdfs[-1]) if rules_pdfs else None
+        if not rules:
+            print("No comprehensive rules available, skipping rule links")
+            return
+        linked = RuleLinker(rules).link_cards(cards.values())
+        print(f"Linked {linked} of {len(cards)} cards to keyword rules")
+
     def _save_cards(self, cards: dict[str, Card]):
         """Save processed cards to JSON file."""
         try:
@@ -284,6 +428,18 @@ class CardDataDownloader:
         except Exception as e:
             print(f"Error saving card data: {e}")
 
+    def _save_average_decks(self, cards: dict[str, Card]):
+        """Save the encoded average decks, with the version of the snapshot their ids refer to."""
+        try:
+            with open(self.average_decks_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': snapshot_version(sorted(cards)),
+                    'decks': self.average_decks,
+                }, f, separators=(',', ':'))
+            print(f"Saved {len(self.average_decks)} average decks to {self.average_decks_file}")
+        except Exception as e:
+            print(f"Error saving average decks: {e}")
+
     def _should_update_data(self) -> bool:
         """Check if the data needs to be updated (older than 1 month)."""
         if not self.last_download_file.exists():
@@ -322,8 +478,15 @@ class CardDataDownloader:
 
         processed: dict[str, Card] = await self._enrich_with_edhrec_data(processed)
 
+        print("Linking keyword rules...")
+        self._link_rules(processed)
+        tagged = tag_power_features(processed.values())
+        print(f"Tagged {tagged} cards with power features")
+
         print("Saving cards...")
         self._save_cards(processed)
+        if self.fetch_average_decks:
+            self._save_average_decks(processed)
 
         print("Updating last download timestamp...")
         self._update_last_download()
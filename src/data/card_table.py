@@ -0,0 +1,215 @@
+import re
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from src.data.card_data_downloader import CardDataDownloader
+from src.data.power import power_mask
+
+# Bit assigned to each color in a color identity mask
+COLOR_BITS = {'W': 1, 'U': 2, 'B': 4, 'R': 8, 'G': 16}
+ALL_COLORS = 0b11111
+
+# Mana symbols counted as colored pips, and the column of each in CardTable.pips
+PIP_COLORS = 'WUBRGC'
+MANA_SYMBOL_PATTERN = re.compile(r'\{([^}]+)\}')
+
+# Bit assigned to each card type in CardTable.types
+CARD_TYPES = ['Creature', 'Instant', 'Sorcery', 'Artifact', 'Enchantment', 'Planeswalker', 'Battle', 'Land']
+TYPE_BITS = {card_type: 1 << bit for bit, card_type in enumerate(CARD_TYPES)}
+
+# "A deck can have any number of cards named ..." or "... up to seven cards named ..."
+COPY_LIMIT_PATTERN = re.compile(r"a deck can have (?:any number of|up to (\w+)) cards named")
+NUMBER_WORDS = {'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+ANY_NUMBER = 0  # CardTable.copy_limit of cards a deck can have any number of
+
+# Rarities in Scryfall's order, so comparisons like r>=rare work on the codes
+RARITIES = ['common', 'uncommon', 'rare', 'mythic', 'special', 'bonus']
+
+
+def color_mask(colors: Iterable[str]) -> int:
+    """Convert a color identity (e.g. ['W', 'U'] or "wu") into a 5-bit mask."""
+    mask = 0
+    for color in colors:
+        mask |= COLOR_BITS.get(color.upper(), 0)
+    return mask
+
+
+def mask_to_colors(mask: int) -> str:
+    """Convert a 5-bit color mask back into WUBRG order, e.g. 0b00011 -> "WU"."""
+    return ''.join(color for color, bit in COLOR_BITS.items() if mask & bit)
+
+
+def front_face(card: dict) -> dict:
+    """Get the face a multi-face card is cast or played as, or the card itself."""
+    faces = card.get('card_faces')
+    if faces and not card.get('mana_cost') and 'mana_cost' in faces[0]:
+        return faces[0]
+    return card
+
+
+def count_pips(mana_cost: str) -> List[int]:
+    """Count the pips of each color in a mana cost, in PIP_COLORS order.
+
+    Hybrid and Phyrexian symbols count toward every color they name, so
+    {W/U} is one white and one blue pip.
+    """
+    counts = [0] * len(PIP_COLORS)
+    for symbol in MANA_SYMBOL_PATTERN.findall(mana_cost):
+        for part in symbol.upper().split('/'):
+            index = PIP_COLORS.find(part) if len(part) == 1 else -1
+            if index != -1:
+                counts[index] += 1
+    return counts
+
+
+def type_mask(type_line: str) -> int:
+    """Convert the front face of a type line into a mask of TYPE_BITS."""
+    types = type_line.split(' // ')[0].split(' — ')[0].split()
+    mask = 0
+    for card_type in types:
+        mask |= TYPE_BITS.get(card_type, 0)
+    return mask
+
+
+def copy_limit(card: dict) -> int:
+    """Get how many copies of a card a singleton deck can have, ANY_NUMBER for basic lands and the like."""
+    if 'Basic' in card.get('type_line', '').split(' — ')[0].split():
+        return ANY_NUMBER
+    match = COPY_LIMIT_PATTERN.search(card.get('oracle_text', '').lower())
+    if match is None:
+        return 1
+    return NUMBER_WORDS.get(match.group(1), ANY_NUMBER) if match.group(1) else ANY_NUMBER
+
+
+class TextColumn:
+    """Lowercased text for every card, joined into one string for fast scans.
+
+    A full scan uses ``str.find`` over the joined text and jumps to the next
+    card after each hit, so its Python-level work grows with the number of
+    matches rather than the number of cards.
+    """
+
+    SEPARATOR = '\x00'
+
+    def __init__(self, values: Iterable[str]):
+        """Join the values, remembering where each card's text starts."""
+        starts = []
+        parts = []
+        position = 0
+        for value in values:
+            value = value.lower()
+            starts.append(position)
+            parts.append(value)
+            position += len(value) + 1
+        starts.append(position)
+        self.text = self.SEPARATOR.join(parts) + self.SEPARATOR
+        self.starts = starts
+        self.size = len(parts)
+
+    def value(self, card_id: int) -> str:
+        """Get the lowercased text of one card."""
+        return self.text[self.starts[card_id]:self.starts[card_id + 1] - 1]
+
+    def contains(self, needle: str, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Get a boolean array of the cards whose text contains needle.
+
+        When candidates (a boolean array) is given, only those cards are checked.
+        """
+        needle = needle.lower()
+        if not needle:
+            # Every text contains the empty string
+            return np.ones(self.size, dtype=bool) if candidates is None else candidates.copy()
+        result = np.zeros(self.size, dtype=bool)
+        if candidates is not None:
+            text, starts = self.text, self.starts
+            for card_id in np.flatnonzero(candidates):
+                if text.find(needle, starts[card_id], starts[card_id + 1] - 1) != -1:
+                    result[card_id] = True
+            return result
+
+        text, starts = self.text, self.starts
+        position = text.find(needle)
+        while position != -1:
+            card_id = bisect_right(starts, position) - 1
+            if card_id >= self.size:
+                break
+            result[card_id] = True
+            position = text.find(needle, starts[card_id + 1])
+        return result
+
+
+class CardTable:
+    """Columnar per-card data aligned with card ids, built once at snapshot load."""
+
+    def __init__(self, names: List[str], cards: Dict[str, dict]):
+        """Build the columns for the cards in card id order."""
+        self.size = len(names)
+        rows = [cards[name] for name in names]
+
+        self.color_identity = np.fromiter(
+            (color_mask(card.get('color_identity', ())) for card in rows),
+            dtype=np.uint8,
+            count=self.size,
+        )
+        self.is_commander = np.fromiter(
+            (CardDataDownloader._is_commander(card) for card in rows),
+            dtype=bool,
+            count=self.size,
+        )
+        self.copy_limit = np.fromiter((copy_limit(card) for card in rows), dtype=np.uint8, count=self.size)
+        self.cmc = np.array([card.get('cmc') or 0 for card in rows], dtype=np.float32)
+        # Colored pips per card, one column per PIP_COLORS entry
+        self.pips = np.array(
+            [count_pips(front_face(card).get('mana_cost', '')) for card in rows], dtype=np.uint8
+        ).reshape(self.size, len(PIP_COLORS))
+        self.types = np.fromiter(
+            (type_mask(card.get('type_line', '')) for card in rows), dtype=np.uint16, count=self.size
+        )
+        # Power features tagged when the snapshot was built (see power.FEATURE_BITS)
+        self.power = np.fromiter((power_mask(card) for card in rows), dtype=np.uint8, count=self.size)
+        # 0 for cards EDHREC doesn't rank
+        self.edhrec_rank = np.array([card.get('edhrec_rank') or 0 for card in rows], dtype=np.int32)
+
+        rarity_codes = {rarity: code for code, rarity in enumerate(RARITIES)}
+        self.rarity = np.array(
+            [rarity_codes.get(card.get('rarity'), -1) for card in rows], dtype=np.int8
+        )
+
+        # Set codes are stored as ids into self.sets
+        set_ids: Dict[str, int] = {}
+        self.set_id = np.array(
+            [set_ids.setdefault(card.get('set', ''), len(set_ids)) for card in rows], dtype=np.int32
+        )
+        self.sets = set_ids
+
+        # One bit per format in which the card is legal (or restricted)
+        formats: Dict[str, int] = {}
+        legal = np.zeros(self.size, dtype=np.uint64)
+        for card_id, card in enumerate(rows):
+            bits = 0
+            for format_name, status in card.get('legalities', {}).items():
+                bit = formats.setdefault(format_name, len(formats))
+                if status in ('legal', 'restricted'):
+                    bits |= 1 << bit
+            legal[card_id] = bits
+        self.legal = legal
+        self.formats = formats
+
+        self.name_text = TextColumn(card['name'] for card in rows)
+        self.oracle_text = TextColumn(card.get('oracle_text', '') for card in rows)
+        self.type_text = TextColumn(card.get('type_line', '') for card in rows)
+
+    def within_identity(self, mask: int) -> np.ndarray:
+        """Get a boolean array of the cards whose color identity fits within mask."""
+        return (self.color_identity & np.uint8(~mask & ALL_COLORS)) == 0
+
+    def has_type(self, card_type: str) -> np.ndarray:
+        """Get a boolean array of the cards whose front face has a card type, e.g. "Creature"."""
+        return (self.types & np.uint16(TYPE_BITS[card_type])) != 0
+
+    def legal_in(self, format_name: str) -> Optional[np.ndarray]:
+        """Get a boolean array of the cards legal in a format, or None if unknown."""
+        bit = self.formats.get(format_name.lower())
+        if bit is None:
+            return None
+        return (self.legal & np.uint64(1 << bit)) != 0
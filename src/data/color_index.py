@@ -0,0 +1,139 @@
+from typing import Iterable, List, Optional, Tuple
+import numpy as np
+from src.data.card_table import ALL_COLORS, color_mask
+
+NO_PARTNER = -1
+
+
+def _partner_kind(card: dict) -> Optional[str]:
+    """Get the kind of commander pairing a card allows, if any."""
+    oracle = card.get('oracle_text', '').lower()
+    type_line = card.get('type_line', '').lower()
+
+    if 'background' in type_line:
+        return 'background'
+    if 'time lord doctor' in type_line:
+        return 'doctor'
+    if "doctor's companion" in oracle:
+        return 'companion'
+    if 'choose a background' in oracle:
+        return 'choose_background'
+    if 'friends forever' in oracle:
+        return 'friends_forever'
+    if 'partner with' in oracle:
+        return 'partner_with'
+    if any(line.startswith('partner') for line in oracle.split('\n')):
+        return 'partner'
+    return None
+
+
+class ColorIndex:
+    """Color identity masks for every commander pairing, indexed by covered colors.
+
+    A pairing is a single commander or a legal pair (partner, partner with,
+    background, friends forever, doctor's companion). ``covering[mask]`` holds
+    the indices of every pairing whose combined identity contains ``mask``.
+    """
+
+    def __init__(self, card_data):
+        """Build the pairings and the 32-entry covering index from loaded cards."""
+        self.card_data = card_data
+        self.table = card_data.table
+        identities = self.table.color_identity
+
+        commanders: List[int] = []
+        groups = {kind: [] for kind in (
+            'partner', 'friends_forever', 'choose_background', 'background', 'doctor', 'companion',
+        )}
+        partner_with: List[int] = []
+        for card_id, name in enumerate(card_data.names):
+            card = card_data.cards[name]
+            kind = _partner_kind(card)
+            if self.table.is_commander[card_id]:
+                commanders.append(card_id)
+            elif kind != 'background':
+                continue
+            if kind == 'partner_with':
+                partner_with.append(card_id)
+            elif kind:
+                groups[kind].append(card_id)
+
+        first = [np.array(commanders, dtype=np.int32)]
+        second = [np.full(len(commanders), NO_PARTNER, dtype=np.int32)]
+
+        # Partner and friends forever pair with any other card of the same group
+        for kind in ('partner', 'friends_forever'):
+            members = np.array(groups[kind], dtype=np.int32)
+            left, right = np.triu_indices(len(members), k=1)
+            first.append(members[left])
+            second.append(members[right])
+
+        # Background and doctor's companion pair across two groups
+        for leads, follows in (('choose_background', 'background'), ('doctor', 'companion')):
+            leads_ids = np.array(groups[leads], dtype=np.int32)
+            follows_ids = np.array(groups[follows], dtype=np.int32)
+            first.append(np.repeat(leads_ids, len(follows_ids)))
+            second.append(np.tile(follows_ids, len(leads_ids)))
+
+        # "Partner with" pairs only with the named card, counted once per pair
+        pairs = []
+        for card_id in partner_with:
+            oracle = card_data.cards[card_data.names[card_id]].get('oracle_text', '').lower()
+            partner_name = oracle.split('partner with')[1].split('(')[0].split('\n')[0].strip(' .')
+            partner_id = card_data.card_ids.get(partner_name)
+            if partner_id is not None and card_id < partner_id:
+                pairs.append((card_id, partner_id))
+        first.append(np.array([a for a, _ in pairs], dtype=np.int32))
+        second.append(np.array([b for _, b in pairs], dtype=np.int32))
+
+        self.first = np.concatenate(first)
+        self.second = np.concatenate(second)
+        solo = self.second == NO_PARTNER
+        self.masks = identities[self.first] | np.where(solo, 0, identities[self.second]).astype(np.uint8)
+        self.covering = [
+            np.flatnonzero((self.masks & mask) == mask) for mask in range(ALL_COLORS + 1)
+        ]
+        print(f"Indexed {len(self.masks)} commander pairings by color identity")
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def pairing_name(self, index: int) -> str:
+        """Get the display name of a pairing, e.g. "Tymna the Weaver + Thrasios"."""
+        names = [self.card_data.cards[self.card_data.names[self.first[index]]]['name']]
+        if self.second[index] != NO_PARTNER:
+            names.append(self.card_data.cards[self.card_data.names[self.second[index]]]['name'])
+        return ' + '.join(names)
+
+    def pairing_cards(self, index: int) -> Tuple[int, ...]:
+        """Get the card ids that make up a pairing."""
+        if self.second[index] == NO_PARTNER:
+            return (int(self.first[index]),)
+        return int(self.first[index]), int(self.second[index])
+
+    def find_pairing(self, card_ids: Iterable[int]) -> Optional[int]:
+        """Get the index of the pairing made of exactly these commanders, in either order, if it is legal."""
+        ids = list(card_ids)
+        if len(ids) == 1:
+            matches = (self.first == ids[0]) & (self.second == NO_PARTNER)
+        elif len(ids) == 2:
+            a, b = ids
+            matches = ((self.first == a) & (self.second == b)) | ((self.first == b) & (self.second == a))
+        else:
+            return None
+        found = np.flatnonzero(matches)
+        return int(found[0]) if len(found) else None
+
+    def legal_commanders(self, colors: Iterable[str] | int) -> np.ndarray:
+        """Get the indices of the pairings whose identity covers the given colors."""
+        mask = colors if isinstance(colors, int) else color_mask(colors)
+        return self.covering[mask & ALL_COLORS]
+
+    def identity_mask(self, card_ids: Iterable[int]) -> int:
+        """Get the combined color identity mask of a group of cards."""
+        ids = np.fromiter(card_ids, dtype=np.int32)
+        return int(np.bitwise_or.reduce(self.table.color_identity[ids])) if len(ids) else 0
+
+    def is_legal_under(self, card_id: int, commander_mask: int) -> bool:
+        """Check if a card's color identity fits within a commander's."""
+        return not (int(self.table.color_identity[card_id]) & ~commander_mask & ALL_COLORS)
@@ -0,0 +1,206 @@
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from src.data.average_decks import card_key
+from src.data.rules_index import file_sha256
+
+# Commander Spellbook's bulk export of combo variants
+DEFAULT_DUMP = Path(__file__).parent.parent.parent / 'reference' / 'variants.json'
+
+# Bump when the serialized layout changes so stale indexes are rebuilt
+INDEX_VERSION = 1
+
+
+class Combo(NamedTuple):
+    """A combo: the cards it needs and what it produces."""
+    combo_id: str
+    cards: List[str]
+    results: List[str]
+
+
+def combos_path(data_dir: Path, dump_hash: str) -> Path:
+    """Get where the combos ingested from a dump with the given hash are stored."""
+    return data_dir / f"combos_index_{dump_hash[:12]}.json"
+
+
+def parse_spellbook_dump(data) -> Tuple[List[Combo], int]:
+    """Get the combos in a Commander Spellbook variants export.
+
+    Variants that also need a card matching a template ("any sacrifice
+    outlet") can't be matched by card and are skipped, as are variants not
+    marked OK. Returns the combos and the number skipped.
+    """
+    variants = data['variants'] if isinstance(data, dict) else data
+    combos = []
+    skipped = 0
+    for variant in variants:
+        if variant.get('requires') or variant.get('status', 'OK') != 'OK':
+            skipped += 1
+            continue
+        cards = list(dict.fromkeys(use['card']['name'] for use in variant.get('uses', [])))
+        if len(cards) < 2:
+            skipped += 1
+            continue
+        results = [produced['feature']['name'] for produced in variant.get('produces', [])]
+        combos.append(Combo(str(variant.get('id', len(combos))), cards, results))
+    return combos, skipped
+
+
+def ingest_combos(dump_path: Path) -> List[Combo]:
+    """Parse a combo dump."""
+    with open(dump_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    combos, skipped = parse_spellbook_dump(data)
+    print(f"Ingested {len(combos)} combos from {dump_path.name}, skipped {skipped}")
+    return combos
+
+
+def save_combos(combos: List[Combo], path: Path, dump_hash: str):
+    """Save ingested combos as compact JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': INDEX_VERSION,
+            'dump_sha256': dump_hash,
+            'combos': [[combo.combo_id, combo.cards, combo.results] for combo in combos],
+        }, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Saved {len(combos)} combos to {path}")
+
+
+def load_combos(path: Path, dump_hash: str) -> Optional[List[Combo]]:
+    """Load ingested combos, or None if they are missing or outdated."""
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != INDEX_VERSION or data.get('dump_sha256') != dump_hash:
+            return None
+        return [Combo(*combo) for combo in data['combos']]
+    except Exception as e:
+        print(f"Failed to load combos from {path}: {e}")
+        return None
+
+
+def load_or_ingest(dump_path: Path = DEFAULT_DUMP) -> Optional[List[Combo]]:
+    """Load the combos for a dump, ingesting the dump only if needed; None if it can't be read."""
+    if not dump_path.exists():
+        print(f"Combo dump not found at {dump_path}")
+        return None
+    dump_hash = file_sha256(dump_path)
+    path = combos_path(dump_path.parent, dump_hash)
+    combos = load_combos(path, dump_hash)
+    if combos is not None:
+        print(f"Loaded {len(combos)} combos from {path}")
+        return combos
+    try:
+        combos = ingest_combos(dump_path)
+        save_combos(combos, path, dump_hash)
+    except Exception as e:
+        # The dump is optional, so a truncated or reshaped one only disables /deck combos
+        print(f"Failed to ingest combos from {dump_path.name}: {e}")
+        return None
+    return combos
+
+
+def _gather(values: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the slices values[start:end] without a Python loop."""
+    lengths = ends - starts
+    total = int(lengths.sum())
+    positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(total)
+    return values[positions]
+
+
+class ComboMatches(NamedTuple):
+    """The combos found in a deck."""
+    complete: np.ndarray  # Indices of the combos whose cards are all in the deck
+    near: np.ndarray  # Indices of the combos missing exactly one card
+    missing: np.ndarray  # The card id each near combo is missing
+
+
+class ComboIndex:
+    """Combos as sets of card ids, with an inverted index from card to combos.
+
+    Each combo's cards are stored contiguously in one flat array. Matching a
+    deck marks its cards in a bitset over all card ids, counts how many cards
+    of each combo the deck has through the postings of its cards only, and
+    compares the counts with the combo sizes; no combo without a card in the
+    deck is ever looked at.
+    """
+
+    def __init__(self, combos: List[Combo], card_ids: Dict[str, int], card_count: int, version: str = ''):
+        """Resolve the combos' cards to ids, dropping combos with a card not in the snapshot."""
+        self.version = version
+        self.card_count = card_count
+        self.combos: List[Combo] = []
+        flat: List[int] = []
+        offsets = [0]
+        for combo in combos:
+            ids = [card_ids.get(card_key(name)) for name in combo.cards]
+            if None in ids:
+                continue
+            self.combos.append(combo)
+            flat.extend(ids)
+            offsets.append(len(flat))
+        self.cards = np.array(flat, dtype=np.int32)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.sizes = np.diff(self.offsets).astype(np.int32)
+
+        # Postings: the combos using each card, in card id order
+        owners = np.repeat(np.arange(len(self.combos), dtype=np.int32), self.sizes)
+        order = np.argsort(self.cards, kind='stable')
+        self.posting_combos = owners[order]
+        self.posting_offsets = np.searchsorted(self.cards[order], np.arange(card_count + 1)).astype(np.int64)
+
+    @classmethod
+    def for_card_data(cls, combos: List[Combo], card_data) -> 'ComboIndex':
+        """Build the index against a snapshot's card ids, front faces included."""
+        card_ids = dict(card_data.card_ids)
+        for name, card_id in card_data.card_ids.items():
+            card_ids.setdefault(card_key(name), card_id)
+        index = cls(combos, card_ids, len(card_data.names), card_data.version)
+        print(f"Indexed {len(index)} of {len(combos)} combos")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.combos)
+
+    def two_card_pieces(self) -> np.ndarray:
+        """Get a boolean array of the cards that are half of a two-card combo."""
+        pieces = np.zeros(self.card_count, dtype=bool)
+        two_card = np.flatnonzero(self.sizes == 2)
+        pieces[_gather(self.cards, self.offsets[two_card], self.offsets[two_card + 1])] = True
+        return pieces
+
+    def combo_cards(self, index: int) -> np.ndarray:
+        """Get the card ids of a combo."""
+        return self.cards[self.offsets[index]:self.offsets[index + 1]]
+
+    def match(self, card_ids: np.ndarray) -> ComboMatches:
+        """Find the combos a deck has, and those it is one card away from."""
+        in_deck = np.zeros(self.card_count, dtype=bool)
+        in_deck[card_ids] = True
+        deck_ids = np.flatnonzero(in_deck)
+
+        postings = _gather(self.posting_combos, self.posting_offsets[deck_ids], self.posting_offsets[deck_ids + 1])
+        hit_combos, hits = np.unique(postings, return_counts=True)
+
+        sizes = self.sizes[hit_combos]
+        complete = hit_combos[hits == sizes]
+        near = hit_combos[hits == sizes - 1]
+        # The one card of each near combo not in the deck's bitset
+        near_cards = _gather(self.cards, self.offsets[near], self.offsets[near + 1])
+        missing = near_cards[~in_deck[near_cards]]
+        return ComboMatches(complete, near, missing)
+
+
+def main():
+    """Ingest a combo dump and save the compact combos next to it."""
+    dump_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DUMP
+    dump_hash = file_sha256(dump_path)
+    save_combos(ingest_combos(dump_path), combos_path(dump_path.parent, dump_hash), dump_hash)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+from typing import List, NamedTuple
+import numpy as np
+from src.data.card_table import ALL_COLORS, ANY_NUMBER
+from src.data.decklist import ResolvedDeck
+
+DECK_SIZE = 100  # Cards in a Commander deck, commanders included
+
+
+class Violation(NamedTuple):
+    """A Commander deck construction rule a deck breaks."""
+    rule: str  # "size", "commander", "singleton", "color_identity" or "legality"
+    message: str
+    card_ids: List[int]  # The offending cards, if the rule is about particular cards
+
+
+def check_deck(card_data, deck: ResolvedDeck) -> List[Violation]:
+    """Check a deck against the Commander deck construction rules.
+
+    Every per-card rule is a mask over the deck's rows of the precomputed
+    copy limit, color identity and legality columns.
+    """
+    table = card_data.table
+    card_ids, quantities = deck.section('commander', 'main')
+    commander_ids = deck.commander_ids
+    violations = []
+
+    total = int(quantities.sum())
+    if total != DECK_SIZE:
+        violations.append(Violation('size', f"The deck has {total} cards, it needs exactly {DECK_SIZE}", []))
+
+    if not commander_ids:
+        violations.append(Violation('commander', "No commander found", []))
+    elif card_data.color_index.find_pairing(commander_ids) is None:
+        # Backgrounds can't lead a deck but are legal in a pair, so only blame single cards once pairing fails
+        not_commanders = [card_id for card_id in commander_ids if not table.is_commander[card_id]]
+        if not_commanders:
+            violations.append(Violation('commander', "Can't be a commander", not_commanders))
+        else:
+            message = "Too many commanders" if len(commander_ids) > 2 else "These commanders can't be paired"
+            violations.append(Violation('commander', message, commander_ids))
+
+    # Copies are counted per card, however many lines name it
+    unique_ids, inverse = np.unique(card_ids, return_inverse=True)
+    copies = np.bincount(inverse, weights=quantities, minlength=len(unique_ids)).astype(np.int64)
+    limits = table.copy_limit[unique_ids].astype(np.int64)
+    over_limit = (limits != ANY_NUMBER) & (copies > limits)
+    if over_limit.any():
+        violations.append(Violation('singleton', "More copies than allowed", unique_ids[over_limit].tolist()))
+
+    if commander_ids:
+        identity = int(np.bitwise_or.reduce(table.color_identity[commander_ids]))
+        outside = (table.color_identity[unique_ids] & np.uint8(~identity & ALL_COLORS)) != 0
+        if outside.any():
+            violations.append(Violation(
+                'color_identity', "Outside the commander's color identity", unique_ids[outside].tolist()
+            ))
+
+    legal = table.legal_in('commander')
+    if legal is not None and not legal[unique_ids].all():
+        violations.append(Violation('legality', "Not legal in Commander", unique_ids[~legal[unique_ids]].tolist()))
+    return violations
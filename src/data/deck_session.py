@@ -0,0 +1,182 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from src.data.card_table import COLOR_BITS
+from src.data.synergy import SynergyIndex
+
+# Bump when the saved layout changes so old sessions are dropped
+SESSIONS_VERSION = 1
+
+COLOR_SHIFTS = np.arange(len(COLOR_BITS), dtype=np.uint8)
+
+
+class DeckSession:
+    """A deck built up over several interactions, with every commander's score kept current.
+
+    Adding a card scatters its synergy postings into the score vector and
+    removing its last copy subtracts them again, so a change costs as much
+    as the changed card's postings, not a rescore of the whole deck.
+    """
+
+    def __init__(self, index: SynergyIndex, identities: np.ndarray, touched: Optional[float] = None):
+        self.index = index
+        self.identities = identities  # Color identity mask of every card
+        self.cards: Dict[int, int] = {}  # Card id -> copies
+        self.scores = np.zeros(len(index), dtype=np.int32)
+        self.color_counts = np.zeros(len(COLOR_BITS), dtype=np.int32)  # Cards with each color
+        self.touched = time.time() if touched is None else touched
+
+    def _colors(self, card_id: int) -> np.ndarray:
+        return (self.identities[card_id] >> COLOR_SHIFTS) & 1
+
+    def add(self, card_id: int, copies: int = 1):
+        """Add copies of a card; only its first copy changes the scores."""
+        if card_id not in self.cards:
+            positions, weights = self.index.postings(card_id)
+            self.scores[positions] += weights
+            self.color_counts += self._colors(card_id)
+        self.cards[card_id] = self.cards.get(card_id, 0) + copies
+        self.touched = time.time()
+
+    def remove(self, card_id: int, copies: Optional[int] = None) -> int:
+        """Remove copies of a card, all of them by default, returning how many were removed."""
+        held = self.cards.get(card_id, 0)
+        removed = held if copies is None else min(copies, held)
+        if not removed:
+            return 0
+        if removed == held:
+            del self.cards[card_id]
+            positions, weights = self.index.postings(card_id)
+            self.scores[positions] -= weights
+            self.color_counts -= self._colors(card_id)
+        else:
+            self.cards[card_id] = held - removed
+        self.touched = time.time()
+        return removed
+
+    @property
+    def identity(self) -> int:
+        """Get the combined color identity mask of the cards."""
+        return int(((self.color_counts > 0).astype(np.int32) << COLOR_SHIFTS).sum())
+
+    def recommend(self, limit: int) -> List[Tuple[int, float]]:
+        """Get the best scoring commanders that cover the cards' colors, as (card id, fit) pairs.
+
+        Fit is SnakeBird's normalized score: the commander's score per card,
+        scaled so a deck of only high synergy, high inclusion cards fits 10.
+        """
+        if not self.cards:
+            return []
+        identity = np.uint8(self.identity)
+        scores = np.where((self.index.identities & identity) == identity, self.scores, 0)
+        top = np.argsort(-scores, kind='stable')[:limit]
+        return [
+            (int(self.index.commander_ids[position]), float(scores[position]) / len(self.cards) * 2.5)
+            for position in top if scores[position] > 0
+        ]
+
+
+class SessionStore:
+    """Deckbuilding sessions by user, least recently used dropped first, saved as card names.
+
+    Scores aren't saved; they are rebuilt from each session's cards when
+    the store is loaded, so a changed snapshot can't leave them stale.
+    """
+
+    MAX_SESSIONS = 1000  # Sessions kept, least recently used dropped first
+    IDLE_SECONDS = 14 * 24 * 3600  # Sessions unused for this long expire
+
+    def __init__(self, path: Path, card_data, index: SynergyIndex):
+        self.path = path
+        self.card_data = card_data
+        self.index = index
+        self.sessions: "OrderedDict[int, DeckSession]" = OrderedDict()
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def _new_session(self, touched: Optional[float] = None) -> DeckSession:
+        return DeckSession(self.index, self.card_data.table.color_identity, touched)
+
+    def _expire(self, now: float):
+        """Drop idle sessions, then the least recently used ones over the limit."""
+        for user_id in [user_id for user_id, session in self.sessions.items()
+                        if now - session.touched > self.IDLE_SECONDS]:
+            del self.sessions[user_id]
+            self.dirty = True
+        while len(self.sessions) > self.MAX_SESSIONS:
+            self.sessions.popitem(last=False)
+            self.dirty = True
+
+    def get(self, user_id: int, create: bool = False) -> Optional[DeckSession]:
+        """Get a user's session, starting one if asked to; an expired session counts as missing."""
+        self._expire(time.time())
+        session = self.sessions.get(user_id)
+        if session is None and create:
+            session = self.sessions[user_id] = self._new_session()
+            self.dirty = True
+        if session is not None:
+            self.sessions.move_to_end(user_id)
+            # Trim to MAX_SESSIONS; this session is now the most recent, so it stays
+            self._expire(time.time())
+        return session
+
+    def changed(self):
+        """Note that a session changed, so the next save writes it."""
+        self.dirty = True
+
+    def discard(self, user_id: int) -> bool:
+        """End a user's session."""
+        self.dirty = True
+        return self.sessions.pop(user_id, None) is not None
+
+    def to_dict(self) -> dict:
+        """Get the serializable form of the sessions."""
+        names = self.card_data.names
+        return {
+            'version': SESSIONS_VERSION,
+            'sessions': [
+                [user_id, session.touched, [[self.card_data.cards[names[card_id]]['name'], copies]
+                                            for card_id, copies in session.cards.items()]]
+                for user_id, session in self.sessions.items()
+            ],
+        }
+
+    def save(self):
+        """Save the sessions as JSON, replacing the file only once fully written."""
+        temporary = self.path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(temporary, self.path)
+        self.dirty = False
+
+    def save_if_dirty(self):
+        if self.dirty:
+            self.save()
+
+    def load(self):
+        """Load saved sessions, rebuilding their scores; cards no longer in the snapshot are dropped."""
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SESSIONS_VERSION:
+                return
+            for user_id, touched, cards in data['sessions']:
+                session = self._new_session(touched)
+                for name, copies in cards:
+                    card_id = self.card_data.card_ids.get(name.lower())
+                    if card_id is not None:
+                        session.add(card_id, copies)
+                session.touched = touched
+                self.sessions[user_id] = session
+            self._expire(time.time())
+            print(f"Loaded {len(self.sessions)} deckbuilding sessions from {self.path}")
+        except Exception as e:
+            print(f"Failed to load deckbuilding sessions: {e}")
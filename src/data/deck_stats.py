@@ -0,0 +1,59 @@
+from typing import Dict, NamedTuple
+import numpy as np
+from src.data.card_table import CARD_TYPES, PIP_COLORS, TYPE_BITS, CardTable
+
+CURVE_TOP = 7  # Mana values from here up share the last curve bucket
+
+
+class DeckStats(NamedTuple):
+    """Aggregate statistics of a deck, counting every copy of a card."""
+    cards: int
+    lands: int
+    curve: np.ndarray  # Nonland cards per mana value 0..CURVE_TOP, the last bucket CURVE_TOP+
+    average_mana_value: float  # Over nonland cards
+    pips: Dict[str, int]  # Colored pips by PIP_COLORS letter, only colors with any
+    heaviest: Dict[str, int]  # Most pips of a color in a single card's cost
+    types: Dict[str, int]  # Cards by type; a card counts once for each of its types
+
+    @property
+    def land_ratio(self) -> float:
+        return self.lands / self.cards if self.cards else 0.0
+
+
+def deck_stats(table: CardTable, card_ids: np.ndarray, quantities: np.ndarray) -> DeckStats:
+    """Compute a deck's statistics from the precomputed card columns.
+
+    Every statistic is a handful of array operations over the deck's rows,
+    with no parsing of card text.
+    """
+    card_ids = np.asarray(card_ids, dtype=np.intp)
+    quantities = np.asarray(quantities, dtype=np.int64)
+    types = table.types[card_ids]
+    land = (types & np.uint16(TYPE_BITS['Land'])) != 0
+    nonland_quantities = quantities[~land]
+    cmc = table.cmc[card_ids][~land]
+
+    buckets = np.minimum(cmc, CURVE_TOP).astype(np.intp)
+    curve = np.bincount(buckets, weights=nonland_quantities, minlength=CURVE_TOP + 1).astype(np.int64)
+    nonland = int(nonland_quantities.sum())
+    average = float(cmc @ nonland_quantities) / nonland if nonland else 0.0
+
+    pips = table.pips[card_ids].astype(np.int64)
+    pip_totals = quantities @ pips
+    heaviest = pips.max(axis=0) if len(card_ids) else np.zeros(len(PIP_COLORS), dtype=np.int64)
+
+    type_counts = {}
+    for card_type in CARD_TYPES:
+        count = int(quantities[(types & np.uint16(TYPE_BITS[card_type])) != 0].sum())
+        if count:
+            type_counts[card_type] = count
+
+    return DeckStats(
+        cards=int(quantities.sum()),
+        lands=int(quantities[land].sum()),
+        curve=curve,
+        average_mana_value=average,
+        pips={color: int(total) for color, total in zip(PIP_COLORS, pip_totals) if total},
+        heaviest={color: int(most) for color, most in zip(PIP_COLORS, heaviest) if most},
+        types=type_counts,
+    )
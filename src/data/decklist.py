@@ -0,0 +1,144 @@
+import re
+from typing import List, NamedTuple, Optional, Tuple
+import numpy as np
+
+NO_CARD = -1  # Card id of a decklist entry that matched nothing
+
+SECTIONS = ('commander', 'main', 'sideboard', 'maybeboard')
+SECTION_HEADERS = {
+    'commander': 'commander', 'commanders': 'commander', 'command zone': 'commander',
+    'deck': 'main', 'main': 'main', 'maindeck': 'main', 'main deck': 'main', 'mainboard': 'main',
+    'sideboard': 'sideboard', 'side': 'sideboard', 'companion': 'sideboard',
+    'maybeboard': 'maybeboard', 'maybe': 'maybeboard', 'considering': 'maybeboard',
+    'about': 'about',  # Arena export metadata ("Name My Deck"), not cards
+}
+
+# "SB: 1x Sol Ring (C21) 263 *F* [Ramp]", every part but the name optional
+LINE_PATTERN = re.compile(
+    r"^(?P<sideboard>SB:\s*)?"
+    r"(?:(?P<quantity>\d+)x?\s+)?"
+    r"(?P<name>.+?)"
+    r"(?:\s+[(\[](?P<set>[A-Za-z0-9]{2,6})[)\]](?:\s+(?P<number>[A-Za-z0-9★-]+))?)?"
+    r"(?P<tags>(?:\s+(?:\*[^*]+\*|\^[^^]*\^|\[[^\]]*\]|#\S+))*)\s*$",
+    re.IGNORECASE,
+)
+# A group heading from a deckbuilding site, e.g. "Creatures (30)" or "// Lands"
+HEADING_PATTERN = re.compile(r"^(?://\s*)?(?P<title>[A-Za-z][A-Za-z ]*?)\s*(?:\(\d+\))?:?$")
+
+
+class DeckEntry(NamedTuple):
+    """One line of a decklist."""
+    quantity: int
+    name: str
+    section: str  # One of SECTIONS
+    set_code: str = ''
+    collector_number: str = ''
+
+
+def _tag_section(tags: str) -> Optional[str]:
+    """Get the section named by a line's tags, e.g. *CMDR* or [Commander{top}]."""
+    tags = tags.lower()
+    if 'cmdr' in tags or 'commander' in tags:
+        return 'commander'
+    if 'sideboard' in tags:
+        return 'sideboard'
+    if 'maybeboard' in tags:
+        return 'maybeboard'
+    return None
+
+
+def parse_decklist(text: str) -> List[DeckEntry]:
+    """Parse a decklist as exported by Arena, MTGO, Moxfield, Archidekt and most other sites.
+
+    Lines are "<quantity> <name>", optionally with "x" after the quantity, a
+    set code and collector number, and site tags. Section headers
+    ("Commander", "Sideboard", ...), "SB:" prefixes and *CMDR* or
+    [Commander] tags place cards outside the main deck; other group headings
+    such as "Creatures (30)" end a commander section.
+
+    MTGO exports have no markers at all: the sideboard follows a blank
+    line, and in Commander it holds the commander. So in a list without
+    any section markers and exactly one blank-line break, the cards after
+    it are the commanders if they are one or two single copies, and the
+    sideboard otherwise.
+    """
+    entries = []
+    blocks = []  # Blank-line separated block of each entry
+    block = 0
+    marked = False  # Whether any heading, SB: prefix or section tag was seen
+    section = 'main'
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            if blocks and blocks[-1] == block:
+                block += 1
+            continue
+        if line.startswith('#') or (line.startswith('//') and not HEADING_PATTERN.match(line)):
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            title = heading.group('title').strip().lower()
+            if title in SECTION_HEADERS:
+                section = SECTION_HEADERS[title]
+                marked = True
+                continue
+            if line.startswith('//') or line.endswith(')') or line.endswith(':'):
+                # A group of cards by type, which is always part of the deck
+                section = 'main' if section in ('commander', 'about') else section
+                marked = True
+                continue
+        if section == 'about':
+            continue
+
+        match = LINE_PATTERN.match(line)
+        if not match:
+            continue
+        tag_section = _tag_section(match.group('tags'))
+        marked = marked or bool(match.group('sideboard') or tag_section)
+        entry_section = 'sideboard' if match.group('sideboard') else tag_section or section
+        blocks.append(block)
+        entries.append(DeckEntry(
+            quantity=int(match.group('quantity') or 1),
+            name=match.group('name').strip(),
+            section=entry_section,
+            set_code=(match.group('set') or '').lower(),
+            collector_number=match.group('number') or '',
+        ))
+
+    if not marked and blocks and blocks[-1] == 1:
+        after_break = [index for index, entry_block in enumerate(blocks) if entry_block == 1]
+        commanders = len(after_break) <= 2 and all(entries[index].quantity == 1 for index in after_break)
+        for index in after_break:
+            entries[index] = entries[index]._replace(section='commander' if commanders else 'sideboard')
+    return entries
+
+
+class ResolvedDeck(NamedTuple):
+    """A decklist resolved against one card snapshot.
+
+    card_ids line up with entries; they are only meaningful for the
+    CardData version the deck was resolved with.
+    """
+    version: str
+    entries: List[DeckEntry]
+    card_ids: np.ndarray  # int32 card id per entry, NO_CARD where nothing matched
+    matches: List[str]  # How each entry matched: "exact", "normalized", "fuzzy" or ""
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return np.array([entry.quantity for entry in self.entries], dtype=np.int32)
+
+    def section(self, *sections: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the resolved card ids and quantities in the given sections."""
+        mask = np.array([entry.section in sections for entry in self.entries], dtype=bool)
+        mask &= self.card_ids != NO_CARD
+        return self.card_ids[mask], self.quantities[mask]
+
+    @property
+    def commander_ids(self) -> List[int]:
+        return [int(card_id) for card_id in self.section('commander')[0]]
+
+    @property
+    def unresolved(self) -> List[DeckEntry]:
+        return [entry for entry, card_id in zip(self.entries, self.card_ids) if card_id == NO_CARD]
@@ -0,0 +1,103 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+class EdhrecCard(NamedTuple):
+    """A single card entry from an EDHREC commander cardlist."""
+
+    name: str
+    synergy: float
+    num_decks: int
+    potential_decks: int
+
+    @property
+    def inclusion(self) -> float:
+        """Fraction of potential decks that run this card."""
+        if not self.potential_decks:
+            return 0.0
+        return self.num_decks / self.potential_decks
+
+
+# Cap per section so the snapshot grows by a bounded amount per commander.
+MAX_CARDS_PER_SECTION = 50
+
+FIELD_SEPARATOR = "\t"
+ROW_SEPARATOR = "\n"
+
+
+def encode_cardlists(cardlists: List[dict], limit: int = MAX_CARDS_PER_SECTION) -> Dict[str, dict]:
+    """Encode EDHREC cardlists into a compact tagged representation.
+
+    Each section is keyed by its EDHREC tag and stores its rows as a single
+    tab-separated string (synergy is stored as an integer percentage), so the
+    snapshot avoids repeating field names for every card.
+    """
+    encoded = {}
+    for index, cardlist in enumerate(cardlists):
+        tag = cardlist.get("tag") or f"section{index}"
+        rows = []
+        for view in cardlist.get("cardviews", [])[:limit]:
+            name = view.get("name")
+            if not name:
+                continue
+            rows.append(FIELD_SEPARATOR.join((
+                name,
+                str(round((view.get("synergy") or 0) * 100)),
+                str(view.get("num_decks") or view.get("inclusion") or 0),
+                str(view.get("potential_decks") or 0),
+            )))
+        encoded[tag] = {
+            "header": cardlist.get("header", tag),
+            "rows": ROW_SEPARATOR.join(rows),
+        }
+    return encoded
+
+
+def _decode_rows(rows: str) -> List[EdhrecCard]:
+    """Decode a packed section back into EdhrecCard entries."""
+    cards = []
+    for row in rows.split(ROW_SEPARATOR):
+        if not row:
+            continue
+        name, synergy, num_decks, potential_decks = row.split(FIELD_SEPARATOR)
+        cards.append(EdhrecCard(name, int(synergy) / 100, int(num_decks), int(potential_decks)))
+    return cards
+
+
+class EdhrecLists:
+    """Lazy view over the compact EDHREC cardlists stored on a commander."""
+
+    def __init__(self, edhrec_data: dict[str, Any]):
+        """Wrap a card's ``edhrec_data`` without decoding any section yet."""
+        self.potential_decks = edhrec_data.get("potential_decks", 0)
+        self._sections: Dict[str, dict] = edhrec_data.get("cardlists", {})
+        self._decoded: Dict[str, List[EdhrecCard]] = {}
+
+        # Snapshots written before all sections were stored only kept the raw
+        # synergy list, so expose it as a single section.
+        if not self._sections and edhrec_data.get("synergies"):
+            legacy = edhrec_data["synergies"]
+            self._sections = encode_cardlists([legacy] if isinstance(legacy, dict) else [])
+
+    @property
+    def tags(self) -> List[str]:
+        """Get the tags of all stored sections, in EDHREC order."""
+        return list(self._sections)
+
+    def header(self, tag: str) -> str:
+        """Get the display header for a section."""
+        return self._sections[tag]["header"]
+
+    def section(self, tag: str) -> List[EdhrecCard]:
+        """Get the decoded cards for a section, decoding it on first access."""
+        if tag not in self._decoded:
+            if tag not in self._sections:
+                return []
+            self._decoded[tag] = _decode_rows(self._sections[tag]["rows"])
+        return self._decoded[tag]
+
+    def find(self, *tags: str) -> Optional[str]:
+        """Get the first of the given tags that is present."""
+        for tag in tags:
+            if tag in self._sections:
+                return tag
+        return None
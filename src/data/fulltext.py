@@ -0,0 +1,144 @@
+import math
+import re
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+PHRASE_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+
+# Gap between the oracle text and type line so phrases never span both fields
+FIELD_GAP = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return TOKEN_PATTERN.findall(text.lower().replace('’', "'"))
+
+
+class _Postings:
+    """Posting list for one term: sorted doc ids, term frequencies and positions."""
+
+    __slots__ = ('docs', 'freqs', 'positions', 'offsets')
+
+    def __init__(self, docs: List[int], positions: List[int], offsets: List[int]):
+        self.docs = np.array(docs, dtype=np.int32)
+        self.offsets = np.array(offsets, dtype=np.int32)
+        self.freqs = np.diff(self.offsets).astype(np.float32)
+        self.positions = np.array(positions, dtype=np.int32)
+
+
+class FullTextIndex:
+    """Token and phrase inverted index over card oracle text and type lines.
+
+    Queries match every bare word and every quoted phrase, and results are
+    ranked with BM25. Work is proportional to the posting lists of the query
+    terms, not to the number of cards.
+    """
+
+    K1 = 1.2
+    B = 0.75
+    # Multiplier that packs (doc, position) pairs into a single integer
+    STRIDE = 4 * FIELD_GAP
+
+    def __init__(self, documents: Iterable[Tuple[str, str]]):
+        """Build the index from (oracle_text, type_line) pairs in card id order."""
+        docs: Dict[str, List[int]] = {}
+        positions: Dict[str, List[int]] = {}
+        offsets: Dict[str, List[int]] = {}
+        lengths = []
+
+        for doc_id, fields in enumerate(documents):
+            term_positions: Dict[str, List[int]] = {}
+            length = 0
+            for field_number, text in enumerate(fields):
+                tokens = tokenize(text)
+                base = field_number * FIELD_GAP
+                for position, token in enumerate(tokens):
+                    term_positions.setdefault(token, []).append(base + position)
+                length += len(tokens)
+            lengths.append(length)
+
+            for token, token_positions in term_positions.items():
+                if token not in docs:
+                    docs[token] = []
+                    positions[token] = []
+                    offsets[token] = [0]
+                docs[token].append(doc_id)
+                positions[token].extend(token_positions)
+                offsets[token].append(len(positions[token]))
+
+        self.postings: Dict[str, _Postings] = {
+            token: _Postings(docs[token], positions[token], offsets[token]) for token in docs
+        }
+        self.doc_lengths = np.array(lengths, dtype=np.float32)
+        self.size = len(lengths)
+        self.average_length = float(self.doc_lengths.mean()) if self.size else 0.0
+
+    @staticmethod
+    def parse(query: str) -> Tuple[List[str], List[List[str]]]:
+        """Split a query into bare terms and quoted phrases."""
+        terms, phrases = [], []
+        for phrase, word in PHRASE_PATTERN.findall(query):
+            tokens = tokenize(phrase if phrase else word)
+            if phrase and len(tokens) > 1:
+                phrases.append(tokens)
+            else:
+                terms.extend(tokens)
+        return terms, phrases
+
+    def _idf(self, postings: _Postings) -> float:
+        """Get the BM25 inverse document frequency of a term."""
+        df = len(postings.docs)
+        return math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+    def _phrase_keys(self, token: str, doc_ids: np.ndarray, offset: int) -> np.ndarray:
+        """Encode the positions of a token in the given docs as doc * STRIDE + position - offset."""
+        postings = self.postings[token]
+        index = np.searchsorted(postings.docs, doc_ids)
+        starts = postings.offsets[index]
+        counts = postings.offsets[index + 1] - starts
+        # Gather every position of the token in the selected docs without a Python loop
+        shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        gathered = postings.positions[shifts + np.arange(counts.sum())]
+        docs = np.repeat(doc_ids.astype(np.int64), counts)
+        return docs * self.STRIDE + gathered - offset
+
+    def _filter_phrase(self, doc_ids: np.ndarray, phrase: List[str]) -> np.ndarray:
+        """Keep only the docs that contain the phrase tokens consecutively."""
+        keys = self._phrase_keys(phrase[0], doc_ids, 0)
+        for offset, token in enumerate(phrase[1:], start=1):
+            keys = np.intersect1d(keys, self._phrase_keys(token, doc_ids, offset))
+            if not len(keys):
+                break
+        return np.unique(keys // self.STRIDE).astype(np.int32)
+
+    def search(self, query: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the matching card ids and their BM25 scores, best first."""
+        terms, phrases = self.parse(query)
+        unique_terms = list(dict.fromkeys(terms + [token for phrase in phrases for token in phrase]))
+        empty = np.array([], dtype=np.int32), np.array([], dtype=np.float32)
+        if not unique_terms or any(term not in self.postings for term in unique_terms):
+            return empty
+
+        # Intersect posting lists, rarest term first
+        ordered = sorted(unique_terms, key=lambda term: len(self.postings[term].docs))
+        matches = self.postings[ordered[0]].docs
+        for term in ordered[1:]:
+            matches = np.intersect1d(matches, self.postings[term].docs, assume_unique=True)
+            if not len(matches):
+                return empty
+
+        for phrase in phrases:
+            matches = self._filter_phrase(matches, phrase)
+            if not len(matches):
+                return empty
+
+        scores = np.zeros(len(matches), dtype=np.float32)
+        norm = self.K1 * (1 - self.B + self.B * self.doc_lengths[matches] / self.average_length)
+        for term in unique_terms:
+            postings = self.postings[term]
+            tf = postings.freqs[np.searchsorted(postings.docs, matches)]
+            scores += self._idf(postings) * tf * (self.K1 + 1) / (tf + norm)
+
+        order = np.argsort(-scores, kind='stable')
+        return matches[order], scores[order]
@@ -0,0 +1,81 @@
+from typing import Dict, List, Tuple
+from src.data.aho_corasick import AhoCorasick
+from src.data.card_data import CardData, normalize_name
+
+MIN_NAME_LENGTH = 5  # Shorter names ("Opt", "Fog") match ordinary words too often
+MAX_DETECTIONS = 10  # Most cards reported for a single message
+
+# Names made only of these words read as ordinary chat ("Shock", "Island", "Time Walk" stays)
+COMMON_WORDS = frozenset("""
+a about after again all an and any are as at away back be been before best big black blue
+both but by can card cards come could day deal deck did do does done down draw each end even
+every fall fast fire first for forest from game gift go good great green hand have he her here
+high his home how i if in into is island it its just keep kill last life light like little long
+look lost make man many me might mind more most mountain much must my need never new night no
+not now of off old on once one only or other our out over own plains play plan power pray
+pressure rain reach red rest return right run same say see shock should show so some stand
+start still stop storm such swamp take than that the their them then there these they thing
+think this those through time to too top turn two up us use very wait want war was watch water
+way we well were what when where which while white who why will win wind with without word
+world would yes yet you young your
+""".split())
+
+
+class NameDetector:
+    """Spots card names mentioned in plain prose, without [[brackets]].
+
+    Normalized card names are loaded into one word-level Aho-Corasick
+    automaton, so a message is scanned once, in time linear in its length,
+    however many names there are.
+    """
+
+    _cache: Dict[str, 'NameDetector'] = {}
+
+    def __init__(self, card_data: CardData, min_length: int = MIN_NAME_LENGTH):
+        """Build the automaton over every detectable card name."""
+        self.card_data = card_data
+        self.version = card_data.version
+        patterns: Dict[Tuple[str, ...], int] = {}
+        for card_id, name in enumerate(card_data.names):
+            # Multi-face cards are mentioned by a face name
+            for face in name.split(' // '):
+                words = tuple(normalize_name(face).split())
+                if self._is_detectable(words, min_length):
+                    patterns.setdefault(words, card_id)
+        self.pattern_count = len(patterns)
+        self.automaton = AhoCorasick(patterns)
+
+    @classmethod
+    def for_card_data(cls, card_data: CardData) -> 'NameDetector':
+        """Get the detector for a dataset version, building it only once."""
+        detector = cls._cache.get(card_data.version)
+        if detector is None:
+            detector = cls._cache[card_data.version] = cls(card_data)
+        return detector
+
+    @staticmethod
+    def _is_detectable(words: Tuple[str, ...], min_length: int) -> bool:
+        """Check if a normalized name is long and distinctive enough to detect."""
+        if not words or len(' '.join(words)) < min_length:
+            return False
+        return not all(word in COMMON_WORDS for word in words)
+
+    def detect(self, text: str, limit: int = MAX_DETECTIONS) -> List[int]:
+        """Get the ids of the cards named in a text, in order of appearance.
+
+        Overlapping matches keep the longest, so "Lightning Greaves" does not
+        also report a card named "Lightning".
+        """
+        words = normalize_name(text).split()
+        matches = sorted(self.automaton.iter(words, whole_words=False), key=lambda match: (match[0], -match[1]))
+        card_ids = []
+        covered = 0
+        for start, end, card_id in matches:
+            if start < covered:
+                continue
+            covered = end
+            if card_id not in card_ids:
+                card_ids.append(card_id)
+                if len(card_ids) >= limit:
+                    break
+        return card_ids
@@ -0,0 +1,139 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import numpy as np
+
+# Bit assigned to each power feature in CardTable.power
+POWER_FEATURES = ['fast_mana', 'tutor', 'extra_turn', 'mass_land_denial']
+FEATURE_BITS = {feature: 1 << bit for bit, feature in enumerate(POWER_FEATURES)}
+FEATURE_LABELS = {
+    'fast_mana': "fast mana",
+    'tutor': "tutors",
+    'extra_turn': "extra turn cards",
+    'mass_land_denial': "mass land denial",
+    'combo_piece': "two-card combo pieces",
+    'staple': "top EDHREC staples",
+}
+
+ADD_MANA_PATTERN = re.compile(r'\badd ((?:\{[^}]+\})+|(?:one|two|three) mana)')
+MANA_WORDS = {'one': 1, 'two': 2, 'three': 3}
+TUTOR_PATTERN = re.compile(r'search your library for ([^.]*)')
+LAND_TARGET_PATTERN = re.compile(r'\b(?:lands?|plains|islands?|swamps?|mountains?|forests?)\b')
+EXTRA_TURN_PATTERN = re.compile(r'takes? an extra turn|extra turn after this one')
+MASS_LAND_DENIAL_PATTERN = re.compile(
+    r"destroy all (?:\w+ )?lands|(?:each|all) players? sacrifices? (?:all|\w+) lands"
+    r"|exile all lands|lands don't untap|can't untap more than"
+)
+
+
+def _mana_added(oracle: str) -> int:
+    """Get the most mana a single "Add ..." ability of a card produces."""
+    most = 0
+    for produced in ADD_MANA_PATTERN.findall(oracle):
+        if produced.endswith('mana'):
+            most = max(most, MANA_WORDS[produced.split()[0]])
+        else:
+            most = max(most, produced.count('{'))
+    return most
+
+
+def power_features(card: dict) -> List[str]:
+    """Get the power features of a card from its oracle text.
+
+    Fast mana is a nonland card costing at most two that makes more mana
+    than it costs (Sol Ring, Dark Ritual, the moxen). A tutor searches the
+    library for something other than lands, counting basic land types
+(fetch lands, Nature's Lore) as lands.
+    """
+    oracle = card.get('oracle_text', '').lower()
+    type_line = card.get('type_line', '').split(' // ')[0]
+    features = []
+    cmc = card.get('cmc') or 0
+    if 'Land' not in type_line and cmc <= 2:
+        added = _mana_added(oracle)
+        if added and (added > cmc or cmc == 0):
+            features.append('fast_mana')
+    if any(not LAND_TARGET_PATTERN.search(target) for target in TUTOR_PATTERN.findall(oracle)):
+        features.append('tutor')
+    if EXTRA_TURN_PATTERN.search(oracle):
+        features.append('extra_turn')
+    if MASS_LAND_DENIAL_PATTERN.search(oracle):
+        features.append('mass_land_denial')
+    return features
+
+
+def power_mask(card: dict) -> int:
+    """Get a card's power features as FEATURE_BITS, as stored in the snapshot when it has them."""
+    features = card['power_features'] if 'power_features' in card else power_features(card)
+    mask = 0
+    for feature in features:
+        mask |= FEATURE_BITS.get(feature, 0)
+    return mask
+
+
+def tag_power_features(cards: Iterable[dict]) -> int:
+    """Store each card's power features under 'power_features', returning how many cards have any."""
+    tagged = 0
+    for card in cards:
+        card['power_features'] = power_features(card)
+        tagged += bool(card['power_features'])
+    return tagged
+
+
+class BracketEstimate(NamedTuple):
+    """A deck's estimated Commander bracket and what it is based on."""
+    bracket: int
+    score: float
+    counts: Dict[str, int]  # Cards with each feature, by FEATURE_LABELS key
+    reasons: List[str]  # Features that set a minimum bracket on their own
+
+
+class BracketEstimator:
+    """Estimates a deck's bracket (1 Exhibition to 5 cEDH) from per-card power columns.
+
+    A deck's score is the weighted sum of how many of its cards have each
+    feature. Mass land denial and several extra turn cards put a deck in
+    bracket 4 whatever its score, as the bracket guidelines do.
+    """
+
+    WEIGHTS = {
+        'fast_mana': 3.0,
+        'tutor': 2.0,
+        'extra_turn': 2.0,
+        'mass_land_denial': 4.0,
+        'combo_piece': 1.5,
+        'staple': 0.25,
+    }
+    # Lowest score of brackets 2 to 5
+    THRESHOLDS = [2.0, 8.0, 20.0, 40.0]
+    STAPLE_RANK = 500  # EDHREC ranks counted as staples
+    EXTRA_TURNS_LIMIT = 2  # Extra turn cards a bracket 3 deck can have
+
+    def __init__(self, table, combo_pieces: Optional[np.ndarray] = None):
+        """Create an estimator over a CardTable, and which cards are in two-card combos if known."""
+        self.table = table
+        self.combo_pieces = combo_pieces
+
+    def estimate(self, card_ids: np.ndarray, quantities: np.ndarray) -> BracketEstimate:
+        """Estimate the bracket of a deck."""
+        card_ids = np.asarray(card_ids, dtype=np.intp)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        power = self.table.power[card_ids]
+        counts = {
+            feature: int(quantities[(power & np.uint8(bit)) != 0].sum())
+            for feature, bit in FEATURE_BITS.items()
+        }
+        if self.combo_pieces is not None:
+            counts['combo_piece'] = int(quantities[self.combo_pieces[card_ids]].sum())
+        ranks = self.table.edhrec_rank[card_ids]
+        counts['staple'] = int(quantities[(ranks > 0) & (ranks <= self.STAPLE_RANK)].sum())
+
+        score = sum(self.WEIGHTS[feature] * count for feature, count in counts.items())
+        bracket = 1 + int(np.searchsorted(self.THRESHOLDS, score, side='right'))
+        reasons = []
+        if counts['mass_land_denial']:
+            reasons.append("mass land denial")
+        if counts['extra_turn'] > self.EXTRA_TURNS_LIMIT:
+            reasons.append(f"more than {self.EXTRA_TURNS_LIMIT} extra turn cards")
+        if reasons:
+            bracket = max(bracket, 4)
+        return BracketEstimate(bracket, score, counts, reasons)
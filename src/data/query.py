@@ -0,0 +1,323 @@
+import operator
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+from src.data.card_table import ALL_COLORS, COLOR_BITS, RARITIES
+
+
+class QueryError(ValueError):
+    """Raised when a search query cannot be parsed or planned."""
+
+
+@dataclass
+class Term:
+    """A single search term such as ``t:creature`` or ``mv>=3``."""
+
+    field: str
+    op: str
+    value: str
+
+
+@dataclass
+class And:
+    """All children must match."""
+
+    children: List['Node']
+
+
+@dataclass
+class Or:
+    """At least one child must match."""
+
+    children: List['Node']
+
+
+@dataclass
+class Not:
+    """The child must not match."""
+
+    child: 'Node'
+
+
+Node = Union[Term, And, Or, Not]
+
+# Scryfall keywords (and their aliases) supported by the local engine
+FIELDS = {
+    'name': 'name', 'n': 'name',
+    'o': 'oracle', 'oracle': 'oracle',
+    't': 'type', 'type': 'type',
+    'id': 'identity', 'identity': 'identity', 'ci': 'identity', 'commander': 'identity',
+    'mv': 'mv', 'cmc': 'mv', 'manavalue': 'mv',
+    'f': 'format', 'format': 'format', 'legal': 'format',
+    'r': 'rarity', 'rarity': 'rarity',
+    's': 'set', 'set': 'set', 'e': 'set', 'edition': 'set',
+    'is': 'is',
+}
+
+# Text fields are scanned; everything else is answered from numeric columns
+TEXT_FIELDS = {'name', 'oracle', 'type'}
+
+COMPARISONS: Dict[str, Callable] = {
+    ':': operator.eq, '=': operator.eq, '!=': operator.ne,
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+
+COLOR_NAMES = {
+    'white': 'w', 'blue': 'u', 'black': 'b', 'red': 'r', 'green': 'g', 'colorless': '',
+    'azorius': 'wu', 'dimir': 'ub', 'rakdos': 'br', 'gruul': 'rg', 'selesnya': 'gw',
+    'orzhov': 'wb', 'izzet': 'ur', 'golgari': 'bg', 'boros': 'rw', 'simic': 'gu',
+    'esper': 'wub', 'grixis': 'ubr', 'jund': 'brg', 'naya': 'rgw', 'bant': 'gwu',
+    'abzan': 'wbg', 'jeskai': 'urw', 'sultai': 'bgu', 'mardu': 'rwb', 'temur': 'gur',
+}
+
+# Number of colors in each 5-bit mask
+POPCOUNT = np.array([bin(mask).count('1') for mask in range(ALL_COLORS + 1)], dtype=np.uint8)
+
+TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<lparen>\() |
+        (?P<rparen>\)) |
+        (?P<neg>-)(?=[^\s)]) |
+        (?P<key>[a-zA-Z]+)(?P<op>>=|<=|!=|:|=|<|>)(?P<value>"[^"]*"|[^\s()]+) |
+        (?P<word>"[^"]*"|[^\s()]+)
+    )''', re.VERBOSE)
+
+
+def _unquote(value: str) -> str:
+    """Strip surrounding double quotes from a value."""
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def _tokenize(query: str) -> List[tuple]:
+    """Split a query into (kind, payload) tokens."""
+    tokens = []
+    position = 0
+    query = query.strip()
+    while position < len(query):
+        match = TOKEN_PATTERN.match(query, position)
+        if not match or match.end() == position:
+            raise QueryError(f"Could not parse query near: {query[position:]!r}")
+        position = match.end()
+        if match.group('lparen'):
+            tokens.append(('(', None))
+        elif match.group('rparen'):
+            tokens.append((')', None))
+        elif match.group('neg'):
+            tokens.append(('-', None))
+        elif match.group('key'):
+            key = match.group('key').lower()
+            if key not in FIELDS:
+                raise QueryError(f"Unknown search keyword: {key}")
+            value = _unquote(match.group('value'))
+            if not value:
+                raise QueryError(f"Missing search value for {key}")
+            tokens.append(('term', Term(FIELDS[key], match.group('op'), value)))
+        elif match.group('word'):
+            word = match.group('word')
+            if word.lower() in ('or', 'and') and not word.startswith('"'):
+                tokens.append((word.lower(), None))
+            elif word == '""':
+                raise QueryError("Empty quoted search")
+            else:
+                tokens.append(('term', Term('name', ':', _unquote(word))))
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser: or_expr := and_expr ('or' and_expr)*."""
+
+    def __init__(self, tokens: List[tuple]):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position][0]
+        return None
+
+    def parse(self) -> Node:
+        node = self._or()
+        if self._peek() is not None:
+            raise QueryError("Unbalanced parentheses in query")
+        return node
+
+    def _or(self) -> Node:
+        children = [self._and()]
+        while self._peek() == 'or':
+            self.position += 1
+            children.append(self._and())
+        return children[0] if len(children) == 1 else Or(children)
+
+    def _and(self) -> Node:
+        children = []
+        while self._peek() not in (None, ')', 'or'):
+            if self._peek() == 'and':
+                self.position += 1
+                continue
+            children.append(self._unary())
+        if not children:
+            raise QueryError("Empty search expression")
+        return children[0] if len(children) == 1 else And(children)
+
+    def _unary(self) -> Node:
+        kind, payload = self.tokens[self.position]
+        self.position += 1
+        if kind == '-':
+            return Not(self._unary())
+        if kind == '(':
+            node = self._or()
+            if self._peek() != ')':
+                raise QueryError("Missing closing parenthesis")
+            self.position += 1
+            return node
+        if kind == 'term':
+            return payload
+        raise QueryError(f"Unexpected {kind!r} in query")
+
+
+def parse_query(query: str) -> Node:
+    """Parse a subset of Scryfall search syntax into a query tree."""
+    tokens = _tokenize(query)
+    if not tokens:
+        raise QueryError("Empty search query")
+    return _Parser(tokens).parse()
+
+
+def _parse_colors(value: str) -> int:
+    """Parse a color value such as "wu", "esper" or "c" into a mask."""
+    value = value.lower()
+    value = COLOR_NAMES.get(value, value)
+    if value == 'c':
+        return 0
+    mask = 0
+    for letter in value:
+        bit = COLOR_BITS.get(letter.upper())
+        if bit is None:
+            raise QueryError(f"Unknown color: {value}")
+        mask |= bit
+    return mask
+
+
+class QueryEngine:
+    """Evaluates parsed queries against the columns of a CardTable.
+
+    Column terms (identity, mana value, format, rarity, set) are evaluated as
+    whole-column NumPy operations. Text terms are more expensive, so within an
+    AND they run last and only scan the cards that survived the cheaper terms.
+    """
+
+    # Scan candidates one by one when fewer than this fraction of cards remain
+    CANDIDATE_SCAN_RATIO = 0.25
+
+    def __init__(self, card_data):
+        self.card_data = card_data
+        self.table = card_data.table
+
+    def search(self, query: str) -> np.ndarray:
+        """Get the ids of the cards matching a query, in name order."""
+        node = parse_query(query)
+        return np.flatnonzero(self._evaluate(node, None))
+
+    def _cost(self, node: Node) -> int:
+        """Estimate the relative cost of evaluating a node."""
+        if isinstance(node, Term):
+            return 10 if node.field in TEXT_FIELDS else 1
+        if isinstance(node, Not):
+            return self._cost(node.child)
+        return sum(self._cost(child) for child in node.children)
+
+    def _evaluate(self, node: Node, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """Evaluate a node, only needing to be correct for the candidate cards."""
+        if isinstance(node, Term):
+            return self._evaluate_term(node, candidates)
+
+        if isinstance(node, Not):
+            result = ~self._evaluate(node.child, candidates)
+            return result if candidates is None else result & candidates
+
+        if isinstance(node, And):
+            result = candidates
+            for child in sorted(node.children, key=self._cost):
+                matched = self._evaluate(child, result)
+                result = matched if result is None else result & matched
+                if not result.any():
+                    break
+            return result
+
+        result = np.zeros(self.table.size, dtype=bool)
+        for child in node.children:
+            result |= self._evaluate(child, candidates)
+        return result
+
+    def _evaluate_term(self, term: Term, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """Evaluate a single term against the columns."""
+        table = self.table
+        value = term.value.lower()
+
+        if term.field in TEXT_FIELDS:
+            if term.op not in (':', '='):
+                raise QueryError(f"Unsupported operator for {term.field}: {term.op}")
+            column = {
+                'name': table.name_text, 'oracle': table.oracle_text, 'type': table.type_text,
+            }[term.field]
+            if candidates is not None and candidates.sum() < table.size * self.CANDIDATE_SCAN_RATIO:
+                return column.contains(value, candidates)
+            return column.contains(value)
+
+        if term.field == 'identity':
+            identity = table.color_identity
+            if value.isdigit():
+                compare = COMPARISONS[term.op]
+                return compare(POPCOUNT[identity], int(value))
+            mask = np.uint8(_parse_colors(value))
+            outside = (identity & ~mask & ALL_COLORS) != 0
+            missing = (identity & mask) != mask
+            if term.op in (':', '<='):
+                return ~outside
+            if term.op == '>=':
+                return ~missing
+            if term.op == '=':
+                return ~outside & ~missing
+            if term.op == '!=':
+                return outside | missing
+            if term.op == '<':
+                return ~outside & (identity != mask)
+            return ~missing & (identity != mask)
+
+        if term.field == 'mv':
+            try:
+                number = float(value)
+            except ValueError:
+                raise QueryError(f"Mana value must be a number: {term.value}")
+            return COMPARISONS[term.op](table.cmc, number)
+
+        if term.field == 'format':
+            legal = table.legal_in(value)
+            if legal is None:
+                raise QueryError(f"Unknown format: {term.value}")
+            return legal
+
+        if term.field == 'rarity':
+            aliases = {'c': 'common', 'u': 'uncommon', 'r': 'rare', 'm': 'mythic'}
+            rarity = aliases.get(value, value)
+            if rarity not in RARITIES:
+                raise QueryError(f"Unknown rarity: {term.value}")
+            code = RARITIES.index(rarity)
+            result = COMPARISONS[term.op](table.rarity, code)
+            return result & (table.rarity >= 0)
+
+        if term.field == 'set':
+            set_id = table.sets.get(value)
+            if set_id is None:
+                return np.zeros(table.size, dtype=bool)
+            return table.set_id == set_id
+
+        if term.field == 'is':
+            if value == 'commander':
+                return table.is_commander.copy()
+            raise QueryError(f"Unsupported is: value: {term.value}")
+
+        raise QueryError(f"Unsupported search keyword: {term.field}")
@@ -0,0 +1,98 @@
+import re
+from typing import Dict, Iterable, List
+from src.data.aho_corasick import AhoCorasick
+from src.data.rules_index import RulesIndex
+
+KEYWORD_ACTIONS = '701'
+KEYWORD_ABILITIES = '702'
+
+GLOSSARY_RULE_PATTERN = re.compile(r'See rule (70[12]\.\s?\d+)')
+MAX_TITLE_LENGTH = 30
+
+
+def _inflections(verb: str) -> List[str]:
+    """Get the forms a keyword action appears in, e.g. sacrifice -> sacrifices, sacrificed."""
+    if verb.endswith('e'):
+        return [verb, verb + 's', verb + 'd', verb[:-1] + 'ing']
+    if re.search(r'[^aeiou]y$', verb):
+        return [verb, verb[:-1] + 'ies', verb[:-1] + 'ied', verb + 'ing']
+    if re.search(r'(?:^|[^aeiou])[aeiou][pt]$', verb):
+        # tap -> tapped, tapping
+        return [verb, verb + 's', verb + verb[-1] + 'ed', verb + verb[-1] + 'ing']
+    plural = verb + 'es' if verb.endswith(('ch', 'sh', 's', 'x')) else verb + 's'
+    return [verb, plural, verb + 'ed', verb + 'ing']
+
+
+def _squash(text: str) -> str:
+    """Lowercase and drop spaces, undoing words split by PDF extraction ("Lifelin k")."""
+    return text.lower().replace(' ', '')
+
+
+def keyword_patterns(rules: RulesIndex) -> Dict[str, str]:
+    """Map every keyword ability and action (and its inflections) to its rule number.
+
+    Keywords come from glossary entries that point at a 701 or 702 rule, plus
+    the titles of the 701/702 rules themselves.
+    """
+    keywords: Dict[str, str] = {}
+
+    for term, definition in rules.glossary.items():
+        lowered = definition.lower()
+        if 'keyword abilit' not in lowered and 'keyword action' not in lowered:
+            continue
+        name = term.split(',')[0].split('“')[0].strip().lower()
+        for number in GLOSSARY_RULE_PATTERN.findall(definition):
+            number = number.replace(' ', '')
+            # Entries merged by extraction cite a rule about a different keyword
+            if _squash(name) in _squash(rules.get_rule(number) or ''):
+                keywords.setdefault(name, number)
+                break
+
+    known = {_squash(name) for name in keywords}
+    for number in rules.numbers:
+        section, _, rule = number.partition('.')
+        if section not in (KEYWORD_ACTIONS, KEYWORD_ABILITIES) or not rule.isdigit():
+            continue
+        title = rules.get_rule(number)
+        # Skip the introductory rules and titles mangled by PDF extraction
+        if len(title) > MAX_TITLE_LENGTH or _squash(title) in known:
+            continue
+        if any(len(word) == 1 for word in title.split()):
+            continue
+        for name in title.lower().split(' and '):
+            keywords.setdefault(name.strip(), number)
+
+    patterns: Dict[str, str] = {}
+    for name, number in keywords.items():
+        if number.startswith(KEYWORD_ACTIONS + '.') and ' ' not in name:
+            for form in _inflections(name):
+                patterns.setdefault(form, number)
+        else:
+            patterns.setdefault(name, number)
+    return patterns
+
+
+class RuleLinker:
+    """Finds the keyword rules a card's oracle text refers to in a single pass."""
+
+    def __init__(self, rules: RulesIndex):
+        """Build the keyword automaton from the rules index."""
+        self.rules = rules
+        self.automaton = AhoCorasick(keyword_patterns(rules))
+
+    def link(self, oracle_text: str) -> List[str]:
+        """Get the rule numbers referenced by an oracle text, in rules order."""
+        numbers = {number for _, _, number in self.automaton.iter(oracle_text.lower())}
+        return sorted(numbers, key=lambda number: self.rules.positions.get(number, 0))
+
+    def link_cards(self, cards: Iterable[dict]) -> int:
+        """Store each card's rule numbers under 'rule_refs', returning how many cards were linked."""
+        linked = 0
+        for card in cards:
+            numbers = self.link(card.get('oracle_text', ''))
+            if numbers:
+                card['rule_refs'] = numbers
+                linked += 1
+            else:
+                card.pop('rule_refs', None)
+        return linked
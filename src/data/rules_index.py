@@ -0,0 +1,251 @@
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from src.data.fulltext import FullTextIndex, tokenize
+
+RULE_NUMBER_PATTERN = re.compile(r'^\d{3}(?:\.\d+[a-z]?)?$')
+REFERENCE = r'\d{3}(?:\.\d+[a-z]?)?'
+# "rule 702.19", "rules 702.19b and 702.19c", "rules 601.2, 601.3, or 602.2"
+CITATION_PATTERN = re.compile(rf'\b[Rr]ules? ({REFERENCE}(?:(?:,|,? and|,? or) {REFERENCE})*)')
+REFERENCE_PATTERN = re.compile(REFERENCE)
+
+# Bump when the serialized layout changes so stale indexes are rebuilt
+INDEX_VERSION = 2
+
+NO_PARENT = -1
+
+
+class RuleContext(NamedTuple):
+    """A rule with its place in the rules hierarchy and its cross-references."""
+    number: str
+    text: str
+    parents: List[str]  # Outermost first, e.g. ["702", "702.9"] for 702.9a
+    cites: List[str]  # Rules this rule refers to
+    cited_by: List[str]  # Rules referring to this rule
+
+
+def _parent_number(number: str, positions: Dict[str, int]) -> Optional[str]:
+    """Get the rule a rule is nested under: 702.9a -> 702.9 -> 702."""
+    if '.' not in number:
+        return None
+    section, _, rule = number.partition('.')
+    if rule[-1].isalpha() and number[:-1] in positions:
+        return number[:-1]
+    return section if section in positions else None
+
+
+def file_sha256(path: Path) -> str:
+    """Get the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_path(data_dir: Path, pdf_hash: str) -> Path:
+    """Get where the index for a rules PDF with the given hash is stored."""
+    return data_dir / f"rules_index_{pdf_hash[:12]}.json"
+
+
+class RulesIndex:
+    """Comprehensive rules keyed by rule number, with an inverted keyword index.
+
+    The index is produced offline from the rules PDF (see rules_ingest) and
+    stored as JSON next to it, so the bot never parses the PDF at startup.
+    """
+
+    def __init__(self, data: dict):
+        """Wrap a deserialized index."""
+        self.pdf_sha256: str = data['pdf_sha256']
+        self.effective: str = data.get('effective', '')
+        self.numbers: List[str] = data['numbers']
+        self.texts: List[str] = data['texts']
+        self.glossary: Dict[str, str] = data.get('glossary', {})
+        self.terms: Dict[str, List[int]] = data['terms']
+        # Cross-reference graph as rule indices, parsed once at ingestion
+        self.parents: List[int] = data['parents']
+        self.cites: List[List[int]] = data['cites']
+        self.cited_by: List[List[int]] = data['cited_by']
+        self.positions: Dict[str, int] = {number: index for index, number in enumerate(self.numbers)}
+
+        # Parents precede their children, so every chain extends an earlier one
+        self.ancestors: List[Tuple[int, ...]] = []
+        for parent in self.parents:
+            self.ancestors.append(() if parent == NO_PARENT else self.ancestors[parent] + (parent,))
+
+    @classmethod
+    def from_rules(cls, pdf_sha256: str, rules: Dict[str, str], glossary: Dict[str, str],
+                   effective: str = '') -> 'RulesIndex':
+        """Build an index from parsed rules, in document order."""
+        numbers = list(rules)
+        texts = [rules[number] for number in numbers]
+        terms: Dict[str, List[int]] = {}
+        for index, text in enumerate(texts):
+            for token in dict.fromkeys(tokenize(text)):
+                terms.setdefault(token, []).append(index)
+
+        positions = {number: index for index, number in enumerate(numbers)}
+        parents = []
+        for number in numbers:
+            parent = _parent_number(number, positions)
+            parents.append(NO_PARENT if parent is None else positions[parent])
+
+        cites: List[List[int]] = []
+        cited_by: List[List[int]] = [[] for _ in numbers]
+        for index, text in enumerate(texts):
+            targets = []
+            for citation in CITATION_PATTERN.finditer(text):
+                for reference in REFERENCE_PATTERN.findall(citation.group(1)):
+                    target = positions.get(reference)
+                    if target is not None and target != index and target not in targets:
+                        targets.append(target)
+            cites.append(targets)
+            for target in targets:
+                cited_by[target].append(index)
+
+        return cls({
+            'pdf_sha256': pdf_sha256,
+            'effective': effective,
+            'numbers': numbers,
+            'texts': texts,
+            'glossary': glossary,
+            'terms': terms,
+            'parents': parents,
+            'cites': cites,
+            'cited_by': cited_by,
+        })
+
+    def to_dict(self) -> dict:
+        """Get the serializable form of the index."""
+        return {
+            'version': INDEX_VERSION,
+            'pdf_sha256': self.pdf_sha256,
+            'effective': self.effective,
+            'numbers': self.numbers,
+            'texts': self.texts,
+            'glossary': self.glossary,
+            'terms': self.terms,
+            'parents': self.parents,
+            'cites': self.cites,
+            'cited_by': self.cited_by,
+        }
+
+    def save(self, path: Path):
+        """Save the index as JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+        print(f"Saved {len(self.numbers)} rules to {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> Optional['RulesIndex']:
+        """Load an index from JSON, or None if it is missing or outdated."""
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                return None
+            return cls(data)
+        except Exception as e:
+            print(f"Failed to load rules index from {path}: {e}")
+            return None
+
+    @classmethod
+    def load_or_build(cls, pdf_path: Path) -> Optional['RulesIndex']:
+        """Load the index for a rules PDF, ingesting the PDF only if needed."""
+        if not pdf_path.exists():
+            print(f"Rules PDF not found at {pdf_path}")
+            return None
+        pdf_hash = file_sha256(pdf_path)
+        path = index_path(pdf_path.parent, pdf_hash)
+        index = cls.load(path)
+        if index and index.pdf_sha256 == pdf_hash:
+            print(f"Loaded {len(index.numbers)} rules from {path}")
+            return index
+
+        print(f"No rules index for {pdf_path.name}, ingesting the PDF...")
+        try:
+            # PyPDF2 is only needed when the index has to be (re)built
+            from src.data.rules_ingest import ingest_rules
+        except ImportError as e:
+            print(f"Cannot build rules index: {e}")
+            return None
+        try:
+            index = ingest_rules(pdf_path, pdf_hash)
+            index.save(path)
+        except Exception as e:
+            # A PDF laid out differently than expected disables /rule rather than stopping the bot
+            print(f"Failed to build rules index from {pdf_path.name}: {e}")
+            return None
+        return index
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    @staticmethod
+    def is_rule_number(text: str) -> bool:
+        """Check if text looks like a rule number, e.g. "702.9" or "702.9b"."""
+        return bool(RULE_NUMBER_PATTERN.match(text.strip().rstrip('.')))
+
+    def get_rule(self, number: str) -> Optional[str]:
+        """Get the text of a rule by its number."""
+        index = self.positions.get(number.strip().rstrip('.'))
+        return None if index is None else self.texts[index]
+
+    def lookup(self, number: str) -> Optional[RuleContext]:
+        """Get a rule together with its parents and cross-references."""
+        index = self.positions.get(number.strip().rstrip('.'))
+        if index is None:
+            return None
+        return RuleContext(
+            number=self.numbers[index],
+            text=self.texts[index],
+            parents=[self.numbers[parent] for parent in self.ancestors[index]],
+            cites=[self.numbers[target] for target in self.cites[index]],
+            cited_by=[self.numbers[source] for source in self.cited_by[index]],
+        )
+
+    def subrules(self, number: str) -> List[Tuple[str, str]]:
+        """Get the (number, text) pairs of the rules directly following and nested under a rule."""
+        number = number.strip().rstrip('.')
+        index = self.positions.get(number)
+        if index is None:
+            return []
+        result = []
+        for child in range(index + 1, len(self.numbers)):
+            child_number = self.numbers[child]
+            if '.' in number:
+                # 702.9 owns 702.9a, 702.9b, ... but not 702.90
+                nested = child_number.startswith(number) and child_number[len(number):].isalpha()
+            else:
+                nested = child_number.startswith(number + '.')
+            if not nested:
+                break
+            result.append((child_number, self.texts[child]))
+        return result
+
+    def search(self, query: str) -> List[str]:
+        """Get the numbers of the rules matching a query, in rule order.
+
+        Every word must appear in the rule; quoted text must appear as a phrase.
+        """
+        terms, phrases = FullTextIndex.parse(query)
+        tokens = set(terms) | {token for phrase in phrases for token in phrase}
+        if not tokens:
+            return []
+        postings = sorted((self.terms.get(token, []) for token in tokens), key=len)
+        matches = set(postings[0])
+        for posting in postings[1:]:
+            matches.intersection_update(posting)
+            if not matches:
+                return []
+
+        # Posting lists only narrow the candidates for phrases
+        for phrase in phrases:
+            joined = ' ' + ' '.join(phrase) + ' '
+            matches = {index for index in matches if joined in ' ' + ' '.join(tokenize(self.texts[index])) + ' '}
+        return [self.numbers[index] for index in sorted(matches)]
@@ -0,0 +1,138 @@
+"""Offline ingestion of the Comprehensive Rules PDF into a RulesIndex.
+
+Usage: python -m src.data.rules_ingest [path/to/rules.pdf]
+"""
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+import PyPDF2
+from src.data.rules_index import RulesIndex, file_sha256, index_path
+
+SECTION_PATTERN = re.compile(r'^(\d{3})\.\s+(\S.*)$')
+RULE_PATTERN = re.compile(r'^(\d{3})\.(\d+)([a-z]?)\.?\s+(\S.*)$')
+BODY_START_PATTERN = re.compile(r'^\d{3}\.\d+\.\s')
+EFFECTIVE_PATTERN = re.compile(r'effective as of ([A-Z][a-z]+ \d+\s*, \d{4})')
+
+DEFAULT_PDF = Path(__file__).parent.parent.parent / 'reference' / 'MagicCompRules_21031101.pdf'
+
+
+def extract_text(pdf_path: Path) -> str:
+    """Extract the text of every page of the rules PDF."""
+    with open(pdf_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return "\n".join(page.extract_text() for page in reader.pages)
+
+
+def _clean(text: str) -> str:
+    """Collapse whitespace and repair hyphens split by PDF extraction."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    return re.sub(r'(\w) -(\w)', r'\1-\2', text)
+
+
+def _follows(previous: Tuple[int, int, str], section: int, rule: int, letter: str) -> bool:
+    """Check if a rule number can come right after the previous one.
+
+    Rules are numbered consecutively (702.2, 702.2a, 702.2b, 702.3, ... 703.1),
+    which tells real rule lines apart from wrapped lines that happen to start
+    with a cross-referenced rule number. A rule header lost in extraction
+    still lets its subrules (702.71a after 702.70a) through.
+    """
+    if previous is None:
+        return True
+    previous_section, previous_rule, previous_letter = previous
+    if section == previous_section:
+        if rule == previous_rule:
+            return letter > previous_letter
+        return rule == previous_rule + 1
+    return section > previous_section and rule == 1
+
+def parse_rules(text: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+    """Parse extracted rules text into numbered rules and glossary entries.
+
+    Returns:
+        A tuple of (rules, glossary). Rules map numbers such as "100", "100.1"
+        and "100.1a" to their text in document order; section numbers map to
+        their titles.
+    """
+    lines = text.splitlines()
+    glossary_start = max(i for i, line in enumerate(lines) if line.strip() == 'Glossary')
+    credits = [i for i, line in enumerate(lines) if line.strip() == 'Credits' and i > glossary_start]
+    glossary_end = credits[-1] if credits else len(lines)
+
+    # Section titles are cleanest in the table of contents
+    titles: Dict[str, str] = {}
+    for line in lines[:glossary_start]:
+        match = SECTION_PATTERN.match(line.strip())
+        if match and match.group(1) not in titles:
+            titles[match.group(1)] = _clean(match.group(2))
+
+    # The numbered rules start at the first "NNN.N." line; earlier lines are the
+    # introduction, which mentions subrule numbers in passing
+    body_start = next(i for i, line in enumerate(lines) if BODY_START_PATTERN.match(line.strip()))
+
+    rules: Dict[str, list] = {}
+    current = None
+    previous = None
+    for line in lines[body_start:glossary_start]:
+        stripped = line.strip()
+        match = RULE_PATTERN.match(stripped)
+        if match and _follows(previous, int(match.group(1)), int(match.group(2)), match.group(3)):
+            section, rule, letter, body = match.groups()
+            if section not in rules and section in titles:
+                rules[section] = [titles[section]]
+            current = f"{section}.{rule}{letter}"
+            rules[current] = [body]
+            previous = (int(section), int(rule), letter)
+        elif stripped and not SECTION_PATTERN.match(stripped):
+            rules[current].append(stripped)
+
+    glossary: Dict[str, list] = {}
+    term = None
+    previous_blank = True
+    for line in lines[glossary_start + 1:glossary_end]:
+        stripped = line.strip()
+        if not stripped:
+            previous_blank = True
+            continue
+        # Extraction sometimes drops the blank line before a term and indents it instead
+        starts_term = previous_blank or (
+            line.startswith(' ') and len(stripped) < 40 and not stripped.endswith(('.', ','))
+        )
+        if starts_term and not re.match(r'^\d+\.', stripped):
+            term = _clean(stripped)
+            glossary[term] = []
+        elif term:
+            glossary[term].append(stripped)
+        previous_blank = False
+
+    return (
+        {number: _clean(' '.join(parts)) for number, parts in rules.items()},
+        {name: _clean(' '.join(parts)) for name, parts in glossary.items() if parts},
+    )
+
+
+def ingest_rules(pdf_path: Path, pdf_hash: str = None) -> RulesIndex:
+    """Parse the rules PDF into a RulesIndex."""
+    text = extract_text(pdf_path)
+    rules, glossary = parse_rules(text)
+    effective = EFFECTIVE_PATTERN.search(text)
+    return RulesIndex.from_rules(
+        pdf_hash or file_sha256(pdf_path),
+        rules,
+        glossary,
+        effective=re.sub(r'\s+,', ',', effective.group(1)) if effective else '',
+    )
+
+
+def main():
+    """Build and save the rules index for a PDF."""
+    pdf_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PDF
+    pdf_hash = file_sha256(pdf_path)
+    index = ingest_rules(pdf_path, pdf_hash)
+    index.save(index_path(pdf_path.parent, pdf_hash))
+    print(f"Indexed {len(index)} rules and {len(index.glossary)} glossary entries")
+
+
+if __name__ == "__main__":
+    main()
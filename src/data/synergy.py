@@ -0,0 +1,76 @@
+from typing import Dict, List, Tuple
+import numpy as np
+from src.data.edhrec_lists import EdhrecLists
+
+# SnakeBird's scoring: a card on a commander's EDHREC page is worth 2, plus 1
+# for high synergy and 1 for high inclusion; being the commander is worth 4
+MATCH_VALUE = 2
+HIGH_SYNERGY_VALUE = 1
+HIGH_INCLUSION_VALUE = 1
+IS_COMMANDER_VALUE = 4
+HIGH_SYNERGY = 0.3
+HIGH_INCLUSION = 0.4
+
+
+class SynergyIndex:
+    """How much each card adds to every commander's score, as postings per card.
+
+    Built once from the EDHREC cardlists stored on commanders. A card's
+    postings are the positions (into commander_ids) of the commanders whose
+    pages list it, with the score it adds to each, so a score vector over
+    all commanders can be updated for one card without touching the rest.
+    """
+
+    def __init__(self, card_data):
+        """Collect every commander's cardlists into postings by card."""
+        self.card_count = len(card_data.names)
+        commander_ids = []
+        cards: List[int] = []
+        positions: List[int] = []
+        weights: List[int] = []
+        for card_id, name in enumerate(card_data.names):
+            card = card_data.cards[name]
+            if 'edhrec_data' not in card:
+                continue
+            # Decoded here rather than through CardData's cache, which would keep every commander's lists
+            lists = EdhrecLists(card['edhrec_data'])
+            position = len(commander_ids)
+            commander_ids.append(card_id)
+            scores: Dict[int, int] = {card_id: IS_COMMANDER_VALUE}
+            for tag in lists.tags:
+                for entry in lists.section(tag):
+                    entry_id = card_data.card_ids.get(entry.name.lower())
+                    if entry_id is None or entry_id == card_id:
+                        continue
+                    weight = (MATCH_VALUE + HIGH_SYNERGY_VALUE * (entry.synergy >= HIGH_SYNERGY)
+                              + HIGH_INCLUSION_VALUE * (entry.inclusion >= HIGH_INCLUSION))
+                    scores[entry_id] = max(scores.get(entry_id, 0), weight)
+            cards.extend(scores)
+            positions.extend([position] * len(scores))
+            weights.extend(scores.values())
+
+        self.commander_ids = np.array(commander_ids, dtype=np.int32)
+        self.identities = card_data.table.color_identity[self.commander_ids]
+        card_array = np.array(cards, dtype=np.int32)
+        order = np.argsort(card_array, kind='stable')
+        sorted_cards = card_array[order]
+        self.positions = np.array(positions, dtype=np.int32)[order]
+        self.weights = np.array(weights, dtype=np.int32)[order]
+        self.offsets = np.searchsorted(sorted_cards, np.arange(self.card_count + 1)).astype(np.int64)
+        print(f"Indexed synergy postings for {len(commander_ids)} commanders")
+
+    def __len__(self) -> int:
+        return len(self.commander_ids)
+
+    def postings(self, card_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the commander positions a card scores for, and the score it adds to each."""
+        start, end = self.offsets[card_id], self.offsets[card_id + 1]
+        return self.positions[start:end], self.weights[start:end]
+
+    def score(self, card_ids) -> np.ndarray:
+        """Score every commander against a set of cards from scratch."""
+        scores = np.zeros(len(self), dtype=np.int32)
+        for card_id in set(int(card_id) for card_id in card_ids):
+            positions, weights = self.postings(card_id)
+            scores[positions] += weights
+        return scores
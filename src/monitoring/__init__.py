@@ -0,0 +1 @@
+"""Metrics and diagnostics for the running bot."""
\ No newline at end of file
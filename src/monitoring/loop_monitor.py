@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import Deque, NamedTuple, Optional
+from src.monitoring.metrics import registry
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG = registry.histogram(
+    'commander_bot_loop_lag_seconds', "How late event loop callbacks ran", buckets=LAG_BUCKETS)
+LOOP_LAG_MAX = registry.gauge(
+    'commander_bot_loop_lag_max_seconds', "Largest event loop lag seen since startup")
+SLOW_CALLBACKS = registry.counter(
+    'commander_bot_slow_callbacks_total', "Callbacks that blocked the event loop past the threshold", ('coroutine',))
+
+
+class Stall(NamedTuple):
+    """A stack sample taken while the event loop was blocked."""
+    started: float  # time.time() when the loop stopped responding
+    coroutine: str  # The task's coroutine, or "<callback>" outside any task
+    stack: str
+
+
+class LoopMonitor:
+    """Samples event loop lag and traces callbacks that block the loop.
+
+    A callback rescheduled every interval measures how late it runs. A
+    watchdog thread notices when it has not run for longer than the threshold
+    and samples the loop thread's stack while the offending code is still
+    running, so the culprit shows up in the log and the metrics.
+    """
+
+    MAX_STALLS = 20  # Recent stalls kept in memory
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.1, log_file: Optional[Path] = None):
+        """Create the monitor.
+
+        Args:
+            threshold: Seconds a callback may block the loop before its stack is sampled.
+            interval: Seconds between lag samples.
+            log_file: Rotating log file for slow callback stacks, if any.
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: Deque[Stall] = deque(maxlen=self.MAX_STALLS)
+        self.logger = logging.getLogger('commander_bot.loop_monitor')
+        self._handler = None
+        if log_file:
+            log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._handler = RotatingFileHandler(log_file, maxBytes=1_000_000, backupCount=3, encoding='utf-8')
+            self._handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(message)s'))
+            self.logger.addHandler(self._handler)
+            self.logger.setLevel(logging.INFO)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._expected = 0.0
+        self._last_beat = 0.0
+        self._sampled_beat = 0.0
+        self._max_lag = 0.0
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start monitoring the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._schedule()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name='loop-monitor', daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop monitoring and close the log file."""
+        self._stop.set()
+        if self._timer:
+            self._timer.cancel()
+        if self._watchdog:
+            self._watchdog.join()
+        if self._handler:
+            self.logger.removeHandler(self._handler)
+            self._handler.close()
+
+    def _schedule(self):
+        self._expected = self._loop.time() + self.interval
+        self._timer = self._loop.call_later(self.interval, self._beat)
+
+    def _beat(self):
+        """Record how late this callback ran and schedule the next one."""
+        lag = max(0.0, self._loop.time() - self._expected)
+        LOOP_LAG.observe(lag)
+        if lag > self._max_lag:
+            self._max_lag = lag
+            LOOP_LAG_MAX.set(lag)
+        if lag >= self.threshold:
+            self.logger.warning(f"Event loop blocked for {lag:.3f}s")
+        self._last_beat = time.monotonic()
+        self._schedule()
+
+    def _watch(self):
+        """Sample the loop thread's stack whenever the loop stops responding."""
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._last_beat
+            if beat != self._sampled_beat and time.monotonic() - beat > self.threshold + self.interval:
+                self._sampled_beat = beat
+                self._sample()
+
+    def _sample(self):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        task = asyncio.current_task(self._loop)
+        coroutine = task.get_coro().__qualname__ if task else '<callback>'
+        stack = ''.join(traceback.format_stack(frame))
+        stall = Stall(started=time.time() - self.threshold, coroutine=coroutine, stack=stack)
+        self.stalls.append(stall)
+        SLOW_CALLBACKS.labels(coroutine).inc()
+        self.logger.warning(f"Slow callback in {coroutine} (over {self.threshold:.3f}s):\n{stack}")
@@ -0,0 +1,234 @@
+import bisect
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+from aiohttp import web
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    """Format label pairs as {name="value",...}."""
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Timer:
+    """Context manager that observes the seconds spent inside it."""
+
+    def __init__(self, histogram: '_HistogramChild'):
+        self.histogram = histogram
+        self.start = 0.0
+        self.elapsed = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.elapsed = time.perf_counter() - self.start
+        self.histogram.observe(self.elapsed)
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        self.value += amount
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...], samples: Optional[List[float]] = None):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        # Raw observations, only kept while a benchmark captures them
+        self.samples = samples
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        if self.samples is not None:
+            self.samples.append(value)
+
+    def time(self) -> _Timer:
+        """Time a block of code, e.g. `with histogram.labels("card", "fuzzy").time():`."""
+        return _Timer(self)
+
+
+class _Metric(ABC):
+    """A metric family whose children are keyed by label values."""
+
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    @abstractmethod
+    def _new_child(self):
+        """Create the child holding one combination of label values."""
+
+    def labels(self, *values: str):
+        """Get the child for a combination of label values, creating it on first use."""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            child = self._children[key] = self._new_child()
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(self._render_child(values, child))
+        return lines
+
+    @abstractmethod
+    def _render_child(self, values: Tuple[str, ...], child) -> List[str]:
+        """Render one child as exposition format lines."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. lookups per fuzzy tier."""
+
+    kind = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        """Increment a counter without labels."""
+        self.labels().inc(amount)
+
+    def _render_child(self, values, child: _CounterChild) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, values)} {child.value:g}"]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, e.g. the current event loop lag."""
+
+    kind = 'gauge'
+
+    def set(self, value: float, *values: str):
+        self.labels(*values).value = value
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets, e.g. stage latencies."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._capturing = False
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets, [] if self._capturing else None)
+
+    def capture_samples(self, enabled: bool = True):
+        """Start (clearing earlier ones) or stop keeping raw observations, for exact percentiles."""
+        self._capturing = enabled
+        for child in self._children.values():
+            child.samples = [] if enabled else None
+
+    def samples(self) -> Dict[Tuple[str, ...], List[float]]:
+        """Get the captured observations by label values."""
+        return {values: list(child.samples) for values, child in self._children.items() if child.samples}
+
+    def observe(self, value: float):
+        """Observe a value on a histogram without labels."""
+        self.labels().observe(value)
+
+    def _render_child(self, values, child: _HistogramChild) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), child.counts):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else f'{bound:g}'
+            bucket_labels = _format_labels(self.labelnames, values, 'le="' + le + '"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        labels = _format_labels(self.labelnames, values)
+        lines.append(f"{self.name}_sum{labels} {child.sum:g}")
+        lines.append(f"{self.name}_count{labels} {child.count}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric; this only runs when the endpoint is scraped."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+# Time spent in each stage of a command, e.g. ("card", "fuzzy")
+STAGE_SECONDS = registry.histogram(
+    'commander_bot_stage_seconds', "Time spent in each stage of handling a command", ('command', 'stage'))
+# How card lookups were resolved: exact, fuzzy_confident, fuzzy_single, suggestions or not_found
+CARD_LOOKUPS = registry.counter(
+    'commander_bot_card_lookups_total', "Card lookups by how the card was resolved", ('tier',))
+CACHE_REQUESTS = registry.counter(
+    'commander_bot_cache_requests_total', "Cache lookups by cache and result", ('cache', 'result'))
+REST_CALLS = registry.histogram(
+    'commander_bot_interaction_rest_calls', "Discord REST calls made to answer an interaction",
+    buckets=(1, 2, 3, 4, 5, 10))
+
+
+async def start_metrics_server(host: str, port: int, metrics: Optional[Registry] = None) -> Optional[web.AppRunner]:
+    """Serve the metrics at http://host:port/metrics; clean up the returned runner to stop.
+
+    Returns None if the port can't be bound (e.g. another instance holds it),
+    so the bot runs on without metrics.
+    """
+    metrics = metrics or registry
+
+    async def handle_metrics(request: web.Request) -> web.Response:
+        return web.Response(text=metrics.render(), content_type='text/plain', charset='utf-8')
+
+    app = web.Application()
+    app.router.add_get('/metrics', handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except OSError as e:
+        await runner.cleanup()
+        print(f"Cannot serve metrics on {host}:{port}, continuing without them: {e}")
+        return None
+    print(f"Serving metrics on http://{host}:{port}/metrics")
+    return runner
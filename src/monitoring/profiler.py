@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple
+
+MAX_SECONDS = 60.0  # Longest profile allowed
+MAX_OVERHEAD = 0.02  # Largest share of wall time the sampler may spend sampling
+DEFAULT_INTERVAL = 0.005  # Seconds between samples, raised automatically to respect MAX_OVERHEAD
+MAX_INTERVAL = 0.1
+
+
+def _frame_name(code) -> str:
+    """Name a frame for a collapsed stack, e.g. "execute (card_info.py:98)"."""
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class ProfileResult(NamedTuple):
+    """The outcome of one profiling run."""
+    stacks: Dict[str, int]  # Collapsed stack ("thread;outer;...;inner") -> samples
+    samples: int
+    duration: float  # Wall seconds profiled
+    overhead: float  # Share of the duration spent taking samples
+    interval: float  # Final seconds between samples
+    over_budget: bool = False  # Stopped early because sampling cost more than MAX_OVERHEAD
+
+    def top(self, count: int = 10, inclusive: bool = False) -> List[Tuple[str, int]]:
+        """Get the functions seen in the most samples, as the innermost frame or anywhere in the stack."""
+        totals: Counter = Counter()
+        for stack, samples in self.stacks.items():
+            frames = stack.split(';')[1:]
+            for frame in (set(frames) if inclusive else frames[-1:]):
+                totals[frame] += samples
+        return totals.most_common(count)
+
+    def write_collapsed(self, path: Path) -> Path:
+        """Write the stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, samples in sorted(self.stacks.items()):
+                f.write(f"{stack} {samples}\n")
+        return path
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples every thread's stack from a background thread.
+
+    Nothing is traced between samples, so the profiled code runs at full speed.
+    If taking samples costs more than MAX_OVERHEAD of the wall time, the interval
+    is doubled, and once it reaches MAX_INTERVAL sampling stops; runs are cut
+    off after MAX_SECONDS.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float) -> ProfileResult:
+        """Sample for the given time (capped at MAX_SECONDS) and return the stacks.
+
+        Blocks the calling thread, so call it from a worker thread, not the event loop.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("A profile is already running")
+        try:
+            return self._run(min(max(seconds, 0.0), MAX_SECONDS))
+        finally:
+            self._lock.release()
+
+    def _run(self, seconds: float) -> ProfileResult:
+        own_thread = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        stacks: Counter = Counter()
+        interval = self.interval
+        samples = 0
+        sampling_time = 0.0
+        over_budget = False
+        start = time.perf_counter()
+        deadline = start + seconds
+
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                frames = []
+                while frame is not None:
+                    frames.append(_frame_name(frame.f_code))
+                    frame = frame.f_back
+                frames.append(names.get(thread_id, f"thread-{thread_id}"))
+                stacks[';'.join(reversed(frames))] += 1
+            samples += 1
+            sampling_time += time.perf_counter() - now
+
+            elapsed = time.perf_counter() - start
+            if sampling_time > MAX_OVERHEAD * elapsed:
+                if interval >= MAX_INTERVAL:
+                    over_budget = True
+                    break
+                interval = min(interval * 2, MAX_INTERVAL)
+            time.sleep(max(0.0, min(interval, deadline - time.perf_counter())))
+
+        duration = time.perf_counter() - start
+        return ProfileResult(
+            stacks=dict(stacks),
+            samples=samples,
+            duration=duration,
+            overhead=sampling_time / duration if duration else 0.0,
+            interval=interval,
+            over_budget=over_budget,
+        )
@@ -0,0 +1,55 @@
+import json
+import pytest
+from src.data.card_data import CardData
+
+
+def make_card(name: str, **fields) -> dict:
+    """Build a minimal Scryfall-shaped card for tests."""
+    card = {
+        "name": name,
+        "layout": "normal",
+        "type_line": "Instant",
+        "oracle_text": "",
+        "mana_cost": "",
+        "cmc": 0.0,
+        "color_identity": [],
+        "rarity": "common",
+        "set": "tst",
+        "legalities": {"commander": "legal", "modern": "legal"},
+    }
+    card.update(fields)
+    return card
+
+
+SAMPLE_CARDS = [
+    make_card("Sol Ring", type_line="Artifact", mana_cost="{1}", cmc=1.0, rarity="uncommon",
+              set="c21", oracle_text="{T}: Add {C}{C}.", legalities={"commander": "legal", "modern": "banned"}),
+    make_card("Counterspell", mana_cost="{U}{U}", cmc=2.0, color_identity=["U"],
+              oracle_text="Counter target spell."),
+    make_card("Lightning Bolt", mana_cost="{R}", cmc=1.0, color_identity=["R"],
+              oracle_text="Lightning Bolt deals 3 damage to any target."),
+    make_card("Atraxa, Praetors' Voice", type_line="Legendary Creature — Phyrexian Angel Horror",
+              mana_cost="{G}{W}{U}{B}", cmc=4.0, color_identity=["W", "U", "B", "G"], rarity="mythic",
+              oracle_text="Flying, vigilance, deathtouch, lifelink\nAt the beginning of your end step, proliferate."),
+    make_card("Thrasios, Triton Hero", type_line="Legendary Creature — Merfolk Wizard",
+              mana_cost="{G}{U}", cmc=2.0, color_identity=["G", "U"], rarity="rare",
+              oracle_text="{4}: Scry 1, then reveal the top card of your library.\n"
+                          "Partner (You can have two commanders if both have partner.)"),
+    make_card("Tymna the Weaver", type_line="Legendary Creature — Human Cleric",
+              mana_cost="{1}{W}{B}", cmc=3.0, color_identity=["W", "B"], rarity="mythic",
+              oracle_text="Lifelink\nAt the beginning of your postcombat main phase, you may pay X life, "
+                          "where X is the number of opponents that were dealt combat damage this turn. "
+                          "If you do, draw X cards.\nPartner (You can have two commanders if both have partner.)"),
+    make_card("Viscera Seer", type_line="Creature — Vampire Wizard", mana_cost="{B}", cmc=1.0,
+              color_identity=["B"], oracle_text="Sacrifice a creature: Scry 1."),
+    make_card("Forest", type_line="Basic Land — Forest", color_identity=["G"], oracle_text="({T}: Add {G}.)"),
+]
+
+
+@pytest.fixture
+def card_data(tmp_path) -> CardData:
+    """CardData loaded from a small snapshot written to a temporary directory."""
+    data_file = tmp_path / "oracle_cards.json"
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump({card["name"].lower(): card for card in SAMPLE_CARDS}, f)
+    return CardData(data_file)
@@ -0,0 +1,89 @@
+import json
+import pytest
+from src.data.average_decks import AverageDeckStore, encode_deck, parse_deck_line, snapshot_version
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("1 Sol Ring", (1, "Sol Ring")),
+        ("  30 Forest\n", (30, "Forest")),
+        ("Fire // Ice", (1, "Fire // Ice")),
+        ("1", (1, "1")),
+        ("   ", None),
+    ],
+    ids=["quantity", "whitespace", "no-quantity", "quantity-only", "blank"],
+)
+def test_parse_deck_line(line, expected):
+    # Act
+
+    parsed = parse_deck_line(line)
+
+    # Assert
+
+    assert parsed == expected
+
+
+def test_encode_deck_uses_front_face_keys_and_drops_unknown_cards():
+    # Arrange
+
+    card_ids = {"fire": 0, "forest": 1, "sol ring": 2}
+
+    # Act
+
+    encoded = encode_deck([(1, "Sol Ring"), (1, "Fire // Ice"), (1, "Not A Card"), (30, "Forest")], card_ids)
+
+    # Assert
+
+    assert encoded == [2, 1, 0, 1, 1, 30]
+
+
+@pytest.fixture
+def deck_file(tmp_path):
+    data_file = tmp_path / "average_decks.json"
+    data_file.write_text(json.dumps({
+        "version": snapshot_version(["forest", "sol ring"]),
+        "decks": {"atraxa, praetors' voice": [1, 1, 0, 30, 1, 2]},
+    }), encoding="utf-8")
+    return data_file
+
+
+@pytest.mark.parametrize(
+    "start,stop,expected",
+    [(0, None, [(1, 1), (0, 30), (1, 2)]), (1, 2, [(0, 30)]), (2, 10, [(1, 2)]), (3, None, [])],
+    ids=["all", "middle", "stop-past-end", "start-past-end"],
+)
+def test_entries(deck_file, start, stop, expected):
+    # Arrange
+
+    store = AverageDeckStore(deck_file, snapshot_version(["forest", "sol ring"]))
+
+    # Act
+
+    entries = list(store.entries("Atraxa, Praetors' Voice", start, stop))
+
+    # Assert
+
+    assert entries == expected
+    assert store.count("Atraxa, Praetors' Voice") == 3
+    assert list(store.entries("Unknown Commander")) == []
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [None, {"atraxa, praetors' voice": [0, 1]}],
+    ids=["other-snapshot", "unversioned"],
+)
+def test_decks_from_another_snapshot_are_ignored(deck_file, contents):
+    # Arrange
+
+    if contents is not None:
+        deck_file.write_text(json.dumps(contents), encoding="utf-8")
+
+    # Act
+
+    store = AverageDeckStore(deck_file, snapshot_version(["forest", "island", "sol ring"]))
+
+    # Assert
+
+    assert len(store) == 0 and "Atraxa, Praetors' Voice" not in store
@@ -0,0 +1,42 @@
+import asyncio
+from src.bot.discord_bot import CommanderBot
+
+
+def test_register_commands(card_data):
+    # Arrange
+
+    async def register() -> dict:
+        bot = CommanderBot(card_data)
+        bot._register_commands()
+        return {command.name: command for command in bot.tree.get_commands()}
+
+    # Act
+
+    commands = asyncio.run(register())
+
+    # Assert
+
+    assert {"card", "avgdeck", "search", "oracle", "rule", "deck", "build", "debug"} <= set(commands)
+    assert [command.name for command in commands["debug"].commands] == ["profile"]
+
+
+def test_close_survives_a_failed_session_save(card_data):
+    # Arrange
+
+    class FailingSessions:
+        def save_if_dirty(self):
+            raise OSError("No space left on device")
+
+    async def close() -> bool:
+        bot = CommanderBot(card_data)
+        bot.build.sessions = FailingSessions()
+        await bot.close()
+        return bot.is_closed()
+
+    # Act
+
+    closed = asyncio.run(close())
+
+    # Assert
+
+    assert closed
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+from src.commands.card_info import CardInfoCommand
+from src.commands.card_mentions import CardMentionHandler, extract_mentions
+
+
+@pytest.fixture
+def handler(card_data) -> CardMentionHandler:
+    return CardMentionHandler(CardInfoCommand(card_data))
+
+
+@pytest.mark.parametrize(
+    "content,expected",
+    [
+        ("Is [[Sol Ring]] better than [[ lightning  bolt ]]?", ["Sol Ring", "lightning bolt"]),
+        ("[[Sol Ring]] and [[sol ring]] again", ["Sol Ring"]),
+        ("[[]] and [not a card] and [[unclosed", []),
+    ],
+    ids=["several", "duplicates", "none"],
+)
+def test_extract_mentions(content, expected):
+    # Act
+
+    result = extract_mentions(content)
+
+    # Assert
+
+    assert result == expected
+
+
+def test_resolve_names_batch(card_data):
+    # Act
+
+    cards = card_data.resolve_names(["sol ring", "Atraxa Praetors Voice", "Lightning Blot", "Nothing Like It"])
+
+    # Assert
+
+    assert [card and card["name"] for card in cards] == [
+        "Sol Ring", "Atraxa, Praetors' Voice", "Lightning Bolt", None,
+    ]
+
+
+def test_handle_renders_one_embed_per_card(handler):
+    # Act
+
+    embeds = asyncio.run(handler.handle(1, "[[Sol Ring]] [[Counterspell]] [[Nothing Like It]]", now=0.0))
+
+    # Assert
+
+    assert [embed.title for embed in embeds[:2]] == ["Sol Ring {1}", "Counterspell {U}{U}"]
+    assert embeds[2].description == "Card not found: Nothing Like It"
+
+
+def test_handle_dedupes_per_channel(handler):
+    # Act
+
+    first = asyncio.run(handler.handle(1, "[[Sol Ring]]", now=0.0))
+    repeated = asyncio.run(handler.handle(1, "[[sol ring]] [[Sol Rings]]", now=10.0))
+    other_channel = asyncio.run(handler.handle(2, "[[Sol Ring]]", now=10.0))
+    expired = asyncio.run(handler.handle(1, "[[Sol Ring]]", now=handler.DEDUPE_SECONDS + 1))
+
+    # Assert
+
+    assert len(first) == 1
+    assert repeated == []
+    assert len(other_channel) == 1
+    assert len(expired) == 1
+
+
+def test_handle_caps_embeds(handler):
+    # Arrange
+
+    names = ["Sol Ring", "Counterspell", "Lightning Bolt", "Atraxa, Praetors' Voice", "Thrasios, Triton Hero",
+             "Tymna the Weaver", "Viscera Seer", "Forest"]
+    handler.MAX_EMBEDS = 5
+
+    # Act
+
+    embeds = asyncio.run(handler.handle(1, " ".join(f"[[{name}]]" for name in names), now=0.0))
+    remaining = asyncio.run(handler.handle(1, "[[Forest]]", now=1.0))
+
+    # Assert
+
+    assert len(embeds) == 5
+    # Cards cut by the cap were not shown, so they are not deduped
+    assert len(remaining) == 1
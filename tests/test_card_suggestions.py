@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from src.commands.card_info import (
+    CardInfoCommand, CardSuggestionView, parse_suggestion_custom_id, suggestion_custom_id,
+)
+
+
+class FakeResponse:
+    def __init__(self):
+        self.edited = []
+        self.sent = []
+
+    async def edit_message(self, **kwargs):
+        self.edited.append(kwargs)
+
+    async def send_message(self, content=None, **kwargs):
+        self.sent.append((content, kwargs))
+
+
+class FakeInteraction:
+    def __init__(self, custom_id: str):
+        self.data = {"custom_id": custom_id}
+        self.response = FakeResponse()
+
+
+@pytest.mark.parametrize(
+    "custom_id,expected",
+    [
+        ("card:abcd1234:42", ("abcd1234", 42)),
+        ("card_Sol Ring", None),
+        ("card:abcd1234:", None),
+        ("5f1b9a0e7c", None),
+    ],
+    ids=["suggestion", "legacy_name", "missing_id", "other_component"],
+)
+def test_parse_suggestion_custom_id(custom_id, expected):
+    # Act
+
+    result = parse_suggestion_custom_id(custom_id)
+
+    # Assert
+
+    assert result == expected
+
+
+def test_suggestion_view_is_compact_and_not_kept():
+    async def build():
+        return CardSuggestionView("abcd1234", [(3, "Atraxa, Praetors' Voice"), (31999, "X" * 141)])
+
+    # Act
+
+    view = asyncio.run(build())
+
+    # Assert
+
+    assert [item.custom_id for item in view.children] == ["card:abcd1234:3", "card:abcd1234:31999"]
+    assert len(view.children[1].label) == CardSuggestionView.MAX_LABEL
+    # A finished view is never stored per message by discord.py
+    assert view.is_finished()
+
+
+def test_handle_suggestion_shows_card(card_data):
+    # Arrange
+
+    command = CardInfoCommand(card_data)
+    interaction = FakeInteraction(suggestion_custom_id(card_data.version, card_data.card_ids["sol ring"]))
+
+    # Act
+
+    handled = asyncio.run(command.handle_suggestion(interaction))
+
+    # Assert
+
+    assert handled
+    assert interaction.response.edited[0]["embed"].title == "Sol Ring {1}"
+    assert interaction.response.edited[0]["view"] is None
+
+
+@pytest.mark.parametrize(
+    "custom_id,handled,replied",
+    [
+        ("card:stale000:0", True, True),
+        ("5f1b9a0e7c", False, False),
+    ],
+    ids=["stale_version", "other_component"],
+)
+def test_handle_suggestion_ignores_unknown(card_data, custom_id, handled, replied):
+    # Arrange
+
+    interaction = FakeInteraction(custom_id)
+
+    # Act
+
+    result = asyncio.run(CardInfoCommand(card_data).handle_suggestion(interaction))
+
+    # Assert
+
+    assert result == handled
+    assert bool(interaction.response.sent) == replied
+    assert interaction.response.edited == []
@@ -0,0 +1,135 @@
+import json
+import pytest
+from src.data.card_data import CardData
+from src.data.color_index import NO_PARTNER
+from tests.conftest import make_card
+
+
+def legend(name: str, colors, oracle_text: str = "", subtypes: str = "Human") -> dict:
+    return make_card(name, type_line=f"Legendary Creature — {subtypes}", color_identity=colors, oracle_text=oracle_text)
+
+
+PARTNER = "Partner (You can have two commanders if both have partner.)"
+FRIENDS = "Friends forever (You can have two commanders if both have friends forever.)"
+
+PAIRING_CARDS = [
+    legend("Thrasios, Triton Hero", ["G", "U"], PARTNER),
+    legend("Tymna the Weaver", ["W", "B"], f"Lifelink\n{PARTNER}"),
+    legend("Kraum, Ludevic's Opus", ["U", "R"], PARTNER),
+    legend("Cecily, Haunted Mage", ["U", "R"], FRIENDS),
+    legend("Will the Wise", ["B"], FRIENDS),
+    legend("Wilson, Refined Grizzly", ["G"], "Choose a Background (You can have a Background as a second commander.)"),
+    make_card("Candlekeep Sage", type_line="Legendary Enchantment — Background", color_identity=["U"]),
+    legend("The Tenth Doctor", ["U", "R", "W"], subtypes="Time Lord Doctor"),
+    legend("Rose Tyler", ["W"], "Doctor's companion (You can have two commanders if the other is the Doctor.)"),
+    legend("Pir, Imaginative Rascal", ["G"],
+           "Partner with Toothy, Imaginary Friend (When this creature enters, target player may put Toothy into their hand.)"),
+    legend("Toothy, Imaginary Friend", ["U"],
+           "Partner with Pir, Imaginative Rascal (When this creature enters, target player may put Pir into their hand.)"),
+    legend("Atraxa, Praetors' Voice", ["W", "U", "B", "G"]),
+    make_card("Lightning Bolt", color_identity=["R"]),
+]
+
+
+@pytest.fixture
+def card_data(tmp_path) -> CardData:
+    data_file = tmp_path / "oracle_cards.json"
+    data_file.write_text(json.dumps({card["name"].lower(): card for card in PAIRING_CARDS}), encoding="utf-8")
+    return CardData(data_file)
+
+
+def pairing_names(card_data: CardData, indices) -> set:
+    return {card_data.color_index.pairing_name(int(index)) for index in indices}
+
+
+def test_pairings(card_data):
+    # Act
+
+    index = card_data.color_index
+    pairs = pairing_names(card_data, [i for i in range(len(index)) if index.second[i] != NO_PARTNER])
+    singles = pairing_names(card_data, [i for i in range(len(index)) if index.second[i] == NO_PARTNER])
+
+    # Assert
+
+    assert pairs == {
+        "Kraum, Ludevic's Opus + Thrasios, Triton Hero",
+        "Kraum, Ludevic's Opus + Tymna the Weaver",
+        "Thrasios, Triton Hero + Tymna the Weaver",
+        "Cecily, Haunted Mage + Will the Wise",
+        "Wilson, Refined Grizzly + Candlekeep Sage",
+        "The Tenth Doctor + Rose Tyler",
+        "Pir, Imaginative Rascal + Toothy, Imaginary Friend",
+    }
+    # A Background only leads as half of a pair
+    assert "Candlekeep Sage" not in singles and "Atraxa, Praetors' Voice" in singles
+    assert "Lightning Bolt" not in singles
+
+
+@pytest.mark.parametrize(
+    "names,expected",
+    [
+        (["Wilson, Refined Grizzly", "Candlekeep Sage"], True),
+        (["Candlekeep Sage", "Wilson, Refined Grizzly"], True),
+        (["Toothy, Imaginary Friend", "Pir, Imaginative Rascal"], True),
+        (["Rose Tyler", "The Tenth Doctor"], True),
+        (["Candlekeep Sage"], False),
+        (["Thrasios, Triton Hero", "Cecily, Haunted Mage"], False),
+        (["Pir, Imaginative Rascal", "Thrasios, Triton Hero"], False),
+        (["Thrasios, Triton Hero", "Tymna the Weaver", "Kraum, Ludevic's Opus"], False),
+    ],
+    ids=["background", "background-reversed", "partner-with", "doctor", "background-alone",
+         "partner-with-friends-forever", "partner-with-other", "three"],
+)
+def test_find_pairing(card_data, names, expected):
+    # Arrange
+
+    card_ids = [card_data.card_ids[name.lower()] for name in names]
+
+    # Act
+
+    found = card_data.color_index.find_pairing(card_ids)
+
+    # Assert
+
+    assert (found is not None) == expected
+    if expected:
+        assert set(card_data.color_index.pairing_cards(found)) == set(card_ids)
+
+
+@pytest.mark.parametrize(
+    "colors,expected",
+    [
+        ("WUBG", {"Atraxa, Praetors' Voice", "Thrasios, Triton Hero + Tymna the Weaver"}),
+        ("WUR", {"The Tenth Doctor", "The Tenth Doctor + Rose Tyler", "Kraum, Ludevic's Opus + Tymna the Weaver"}),
+        ("GU", {"Thrasios, Triton Hero", "Atraxa, Praetors' Voice", "Kraum, Ludevic's Opus + Thrasios, Triton Hero",
+                "Thrasios, Triton Hero + Tymna the Weaver", "Wilson, Refined Grizzly + Candlekeep Sage",
+                "Pir, Imaginative Rascal + Toothy, Imaginary Friend"}),
+        (0b11111, set()),
+    ],
+    ids=["four-color", "doctor-or-partners", "simic", "five-color-mask"],
+)
+def test_legal_commanders(card_data, colors, expected):
+    # Act
+
+    pairings = card_data.color_index.legal_commanders(colors)
+
+    # Assert
+
+    assert pairing_names(card_data, pairings) == expected
+
+
+def test_identity_helpers(card_data):
+    # Arrange
+
+    index = card_data.color_index
+    ids = card_data.card_ids
+
+    # Act
+
+    mask = index.identity_mask([ids["thrasios, triton hero"], ids["tymna the weaver"]])
+
+    # Assert
+
+    assert mask == 0b10111 and index.identity_mask([]) == 0
+    assert index.is_legal_under(ids["candlekeep sage"], mask)
+    assert not index.is_legal_under(ids["lightning bolt"], mask)
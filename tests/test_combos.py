@@ -0,0 +1,135 @@
+import json
+import random
+import numpy as np
+import pytest
+from benchmarks.bench_combos import make_combos
+from src.commands.deck import DeckCommand
+from src.data.combos import Combo, ComboIndex, load_or_ingest, parse_spellbook_dump
+
+
+def variant(variant_id: str, cards, results=("Infinite mana",), **fields) -> dict:
+    """Build a Commander Spellbook shaped variant."""
+    data = {
+        "id": variant_id,
+        "status": "OK",
+        "uses": [{"card": {"name": name}} for name in cards],
+        "requires": [],
+        "produces": [{"feature": {"name": result}} for result in results],
+    }
+    data.update(fields)
+    return data
+
+
+DUMP = {"variants": [
+    variant("1-2", ["Thrasios, Triton Hero", "Sol Ring"]),
+    variant("3-4", ["Viscera Seer", "Tymna the Weaver", "Counterspell"], ("Infinite lifegain",)),
+    variant("5-6", ["Sol Ring", "Forest"], requires=[{"template": {"name": "Any sacrifice outlet"}}]),
+    variant("7-8", ["Sol Ring", "Not A Real Card"]),
+]}
+
+
+def test_parse_skips_template_variants():
+    # Act
+
+    combos, skipped = parse_spellbook_dump(DUMP)
+
+    # Assert
+
+    assert [combo.combo_id for combo in combos] == ["1-2", "3-4", "7-8"]
+    assert combos[1].results == ["Infinite lifegain"]
+    assert skipped == 1
+
+
+def test_load_or_ingest_caches_the_parsed_dump(tmp_path):
+    # Arrange
+
+    dump = tmp_path / "variants.json"
+    dump.write_text(json.dumps(DUMP), encoding="utf-8")
+
+    # Act
+
+    ingested = load_or_ingest(dump)
+    cached = load_or_ingest(dump)
+
+    # Assert
+
+    assert cached == ingested
+    assert len(list(tmp_path.glob("combos_index_*.json"))) == 1
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [json.dumps(DUMP)[:40], json.dumps({"variants": [{"id": "1", "uses": [{"card": {}}, {"card": {}}]}]})],
+    ids=["truncated", "card-without-name"],
+)
+def test_bad_dump_disables_combos(tmp_path, contents):
+    # Arrange
+
+    dump = tmp_path / "variants.json"
+    dump.write_text(contents, encoding="utf-8")
+
+    # Act
+
+    combos = load_or_ingest(dump)
+
+    # Assert
+
+    assert combos is None
+    assert not list(tmp_path.glob("combos_index_*.json"))
+
+
+def test_match_complete_and_near_combos(card_data):
+    # Arrange
+
+    combos, _ = parse_spellbook_dump(DUMP)
+    index = ComboIndex.for_card_data(combos, card_data)
+    deck = card_data.resolve_decklist("1 Thrasios, Triton Hero\n1 Sol Ring\n1 Viscera Seer\n1 Counterspell")
+
+    # Act
+
+    matches = index.match(deck.section("commander", "main")[0])
+
+    # Assert
+
+    assert len(index) == 2
+    assert [index.combos[i].combo_id for i in matches.complete] == ["1-2"]
+    assert [index.combos[i].combo_id for i in matches.near] == ["3-4"]
+    assert card_data.get_card_by_id(int(matches.missing[0]))["name"] == "Tymna the Weaver"
+
+
+def test_match_agrees_with_naive_subset_scan():
+    # Arrange
+
+    rng = random.Random(4)
+    card_ids = {f"card {card_id:05d}": card_id for card_id in range(2000)}
+    combos = make_combos(3000, 2000, rng)
+    index = ComboIndex(combos, card_ids, 2000)
+    deck = np.array(rng.sample(range(100), 60) + rng.sample(range(2000), 40), dtype=np.int32)
+
+    # Act
+
+    matches = index.match(deck)
+
+    # Assert
+
+    deck_set = set(deck.tolist())
+    expected = [i for i, combo in enumerate(combos) if {card_ids[name.lower()] for name in combo.cards} <= deck_set]
+    assert matches.complete.tolist() == expected
+    assert all(index.combo_cards(i).tolist().count(card) == 1 for i, card in zip(matches.near, matches.missing))
+
+
+def test_combos_command(card_data):
+    # Arrange
+
+    deck_command = DeckCommand(card_data)
+    deck_command.combos = ComboIndex.for_card_data([Combo("1", ["Sol Ring", "Forest"], ["Infinite mana"])], card_data)
+    deck_command.import_deck(1, "1 Sol Ring\n1 Forest")
+
+    # Act
+
+    embeds = deck_command.find_combos(1)
+
+    # Assert
+
+    assert embeds[0].title == "Deck combos: 1"
+    assert embeds[0].fields[0].value == "Sol Ring + Forest: Infinite mana"
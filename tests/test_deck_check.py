@@ -0,0 +1,125 @@
+import json
+import pytest
+from src.commands.deck import DeckCommand
+from src.data.card_data import CardData
+from src.data.card_table import ANY_NUMBER, copy_limit
+from src.data.deck_check import check_deck
+from tests.conftest import SAMPLE_CARDS, make_card
+
+
+@pytest.mark.parametrize(
+    "card,expected",
+    [
+        (make_card("Counterspell"), 1),
+        (make_card("Snow-Covered Forest", type_line="Basic Snow Land — Forest"), ANY_NUMBER),
+        (make_card("Relentless Rats", oracle_text="A deck can have any number of cards named Relentless Rats."),
+         ANY_NUMBER),
+        (make_card("Seven Dwarves", oracle_text="A deck can have up to seven cards named Seven Dwarves."), 7),
+    ],
+    ids=["singleton", "basic", "any-number", "up-to-seven"],
+)
+def test_copy_limit(card, expected):
+    # Act
+
+    limit = copy_limit(card)
+
+    # Assert
+
+    assert limit == expected
+
+
+def test_legal_deck_has_no_violations(card_data):
+    # Arrange
+
+    deck = card_data.resolve_decklist(
+        "1 Thrasios, Triton Hero *CMDR*\n1 Tymna the Weaver *CMDR*\n1 Counterspell\n1 Sol Ring\n96 Forest"
+    )
+
+    # Act
+
+    violations = check_deck(card_data, deck)
+
+    # Assert
+
+    assert violations == []
+
+
+BACKGROUND_CARDS = SAMPLE_CARDS + [
+    make_card("Wilson, Refined Grizzly", type_line="Legendary Creature — Bear Warrior", color_identity=["G"],
+              oracle_text="Reach, trample, ward {2}\nChoose a Background (You can have a Background as a second commander.)"),
+    make_card("Candlekeep Sage", type_line="Legendary Enchantment — Background", color_identity=["U"],
+              oracle_text="Commander creatures you own have \"When this creature enters, draw a card.\""),
+]
+
+
+@pytest.mark.parametrize(
+    "commanders,expected",
+    [
+        (["Wilson, Refined Grizzly", "Candlekeep Sage"], []),
+        (["Candlekeep Sage"], [("commander", "Can't be a commander", ["Candlekeep Sage"]),
+                               ("color_identity", "Outside the commander's color identity", ["Forest"])]),
+        (["Thrasios, Triton Hero", "Candlekeep Sage"], [("commander", "Can't be a commander", ["Candlekeep Sage"])]),
+    ],
+    ids=["choose-a-background", "background-alone", "background-with-partner"],
+)
+def test_background_commanders(tmp_path, commanders, expected):
+    # Arrange
+
+    data_file = tmp_path / "oracle_cards.json"
+    data_file.write_text(json.dumps({card["name"].lower(): card for card in BACKGROUND_CARDS}), encoding="utf-8")
+    card_data = CardData(data_file)
+    lines = [f"1 {name} *CMDR*" for name in commanders] + [f"{100 - len(commanders)} Forest"]
+    deck = card_data.resolve_decklist("\n".join(lines))
+
+    # Act
+
+    violations = check_deck(card_data, deck)
+
+    # Assert
+
+    assert [(violation.rule, violation.message, [card_data.get_card_by_id(card_id)["name"]
+                                                 for card_id in violation.card_ids])
+            for violation in violations] == expected
+
+
+def test_violations_list_offending_cards(card_data):
+    # Arrange
+
+    deck = card_data.resolve_decklist(
+        "Commander\n1 Atraxa, Praetors' Voice\n1 Thrasios, Triton Hero\n"
+        "Deck\n1 Sol Ring\n1 Sol Ring\n1 Lightning Bolt\n90 Forest"
+    )
+    names = lambda violation: [card_data.get_card_by_id(card_id)["name"] for card_id in violation.card_ids]
+
+    # Act
+
+    violations = {violation.rule: violation for violation in check_deck(card_data, deck)}
+
+    # Assert
+
+    assert set(violations) == {"size", "commander", "singleton", "color_identity"}
+    assert "95 cards" in violations["size"].message
+    assert names(violations["commander"]) == ["Atraxa, Praetors' Voice", "Thrasios, Triton Hero"]
+    assert names(violations["singleton"]) == ["Sol Ring"]
+    assert names(violations["color_identity"]) == ["Lightning Bolt"]
+
+
+def test_banned_cards_and_check_command(tmp_path):
+    # Arrange
+
+    cards = SAMPLE_CARDS + [make_card("Mana Crypt", type_line="Artifact",
+                                      legalities={"commander": "banned", "modern": "not_legal"})]
+    data_file = tmp_path / "oracle_cards.json"
+    data_file.write_text(json.dumps({card["name"].lower(): card for card in cards}), encoding="utf-8")
+    deck_command = DeckCommand(CardData(data_file))
+    deck_command.import_deck(1, "1 Atraxa, Praetors' Voice *CMDR*\n1 Mana Crypt\n98 Forest")
+
+    # Act
+
+    embeds = deck_command.check(1)
+
+    # Assert
+
+    assert embeds[0].title == "Deck check: 1 problem"
+    assert embeds[0].fields[0].name == "Not legal in Commander"
+    assert embeds[0].fields[0].value == "Mana Crypt"
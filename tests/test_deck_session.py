@@ -0,0 +1,178 @@
+import json
+import numpy as np
+import pytest
+from src.commands.build import BuildCommand
+from src.data.card_data import CardData
+from src.data.deck_session import SessionStore
+from src.data.edhrec_lists import encode_cardlists
+from src.data.synergy import SynergyIndex
+from tests.conftest import SAMPLE_CARDS
+
+
+def _cardlist(*views):
+    """An EDHREC cardlist of (name, synergy, num_decks) rows out of 100 potential decks."""
+    return [{"tag": "topcards", "header": "Top Cards", "cardviews": [
+        {"name": name, "synergy": synergy, "num_decks": num_decks, "potential_decks": 100}
+        for name, synergy, num_decks in views
+    ]}]
+
+
+EDHREC_DATA = {
+    "Atraxa, Praetors' Voice": _cardlist(("Sol Ring", 0.5, 50), ("Counterspell", 0.1, 10), ("Viscera Seer", 0.35, 10)),
+    "Thrasios, Triton Hero": _cardlist(("Sol Ring", 0.0, 80), ("Counterspell", 0.4, 60), ("Forest", 0.0, 10)),
+    "Tymna the Weaver": _cardlist(("Viscera Seer", 0.5, 50), ("Sol Ring", 0.3, 90)),
+}
+
+
+@pytest.fixture
+def synergy_data(tmp_path) -> CardData:
+    """CardData whose commanders carry EDHREC cardlists."""
+    cards = {}
+    for card in SAMPLE_CARDS:
+        card = dict(card)
+        if card["name"] in EDHREC_DATA:
+            card["edhrec_data"] = {"potential_decks": 100, "cardlists": encode_cardlists(EDHREC_DATA[card["name"]])}
+        cards[card["name"].lower()] = card
+    data_file = tmp_path / "oracle_cards.json"
+    with open(data_file, "w", encoding="utf-8") as f:
+        json.dump(cards, f)
+    return CardData(data_file)
+
+
+@pytest.fixture
+def store(tmp_path, synergy_data) -> SessionStore:
+    return SessionStore(tmp_path / "deck_sessions.json", synergy_data, SynergyIndex(synergy_data))
+
+
+def test_incremental_scores_match_rescoring(synergy_data, store):
+    # Arrange
+
+    ids = synergy_data.card_ids
+    session = store.get(1, create=True)
+
+    # Act / Assert
+
+    for name in ["sol ring", "counterspell", "viscera seer", "forest"]:
+        session.add(ids[name])
+        assert np.array_equal(session.scores, store.index.score(session.cards))
+    session.add(ids["sol ring"], 2)
+    assert session.remove(ids["sol ring"], 1) == 1
+    assert np.array_equal(session.scores, store.index.score(session.cards))
+    assert session.remove(ids["counterspell"]) == 1
+    assert np.array_equal(session.scores, store.index.score(session.cards))
+    assert session.remove(ids["lightning bolt"]) == 0
+
+
+@pytest.mark.parametrize(
+    "names,expected",
+    [
+        (["sol ring", "counterspell"], [("thrasios, triton hero", 8.75), ("atraxa, praetors' voice", 7.5)]),
+        (["sol ring", "viscera seer"], [("tymna the weaver", 10.0), ("atraxa, praetors' voice", 8.75)]),
+        (["sol ring", "lightning bolt"], []),
+        ([], []),
+    ],
+    ids=["blue", "black", "no-commander-covers-red", "empty"],
+)
+def test_recommendations_respect_color_identity(synergy_data, store, names, expected):
+    # Arrange
+
+    ids = synergy_data.card_ids
+    session = store.get(1, create=True)
+    for name in names:
+        session.add(ids[name])
+
+    # Act
+
+    recommended = session.recommend(5)
+
+    # Assert
+
+    assert recommended == [(ids[name], pytest.approx(fit)) for name, fit in expected]
+
+
+def test_store_evicts_least_recent_and_idle_sessions(store):
+    # Arrange
+
+    store.MAX_SESSIONS = 2
+    store.get(1, create=True)
+    store.get(2, create=True)
+    store.get(1)
+
+    # Act
+
+    store.get(3, create=True)
+    store.sessions[1].touched -= store.IDLE_SECONDS + 1
+    store.get(3)
+
+    # Assert
+
+    assert list(store.sessions) == [3]
+
+
+def test_saved_sessions_rebuild_scores(tmp_path, synergy_data, store):
+    # Arrange
+
+    ids = synergy_data.card_ids
+    session = store.get(7, create=True)
+    session.add(ids["viscera seer"])
+    session.add(ids["forest"], 30)
+    store.save_if_dirty()
+    reloaded = SessionStore(store.path, synergy_data, SynergyIndex(synergy_data))
+
+    # Act
+
+    reloaded.load()
+
+    # Assert
+
+    assert not store.dirty
+    restored = reloaded.get(7)
+    assert restored.cards == session.cards
+    assert np.array_equal(restored.scores, session.scores)
+
+
+def test_build_command_add_show_clear(synergy_data, store):
+    # Arrange
+
+    command = BuildCommand(synergy_data)
+    unavailable = command.show(1)
+    command.sessions = store
+
+    # Act
+
+    added = command.add(1, "Sol Ring")
+    command.add(1, "Counterspel")
+    shown = command.show(1)
+    missing = command.remove(1, "Forest")
+    command.clear(1)
+
+    # Assert
+
+    assert "still loading" in unavailable[0].description
+    assert added[0].title == "Added Sol Ring"
+    assert shown[0].description == "2 cards in your deck (U)"
+    assert shown[0].fields[0].value.startswith("Thrasios, Triton Hero: fit 8.8")
+    assert shown[0].fields[1].value == "1 Counterspell\n1 Sol Ring"
+    assert missing[0].description == "Forest isn't in your deck."
+    assert command.show(1)[0].description.startswith("Your deck is empty")
+
+
+def test_user_returning_after_expiry_starts_fresh(synergy_data, store):
+    # Arrange
+
+    ids = synergy_data.card_ids
+    store.get(1, create=True).add(ids["sol ring"])
+    store.sessions[1].touched -= store.IDLE_SECONDS + 1
+
+    # Act
+
+    missing = store.get(1)
+    session = store.get(1, create=True)
+    session.add(ids["counterspell"])
+
+    # Assert
+
+    assert missing is None
+    assert session.cards == {ids["counterspell"]: 1}
+    assert store.sessions[1] is session
+    assert np.array_equal(session.scores, store.index.score(session.cards))
@@ -0,0 +1,86 @@
+import pytest
+from src.commands.deck import DeckCommand
+from src.data.card_table import TYPE_BITS, count_pips, type_mask
+from src.data.deck_stats import deck_stats
+
+
+@pytest.mark.parametrize(
+    "mana_cost,expected",
+    [
+        ("{2}{W}{U}", [1, 1, 0, 0, 0, 0]),
+        ("{B}{B}{B}", [0, 0, 3, 0, 0, 0]),
+        ("{W/U}{2/R}{G/P}", [1, 1, 0, 1, 1, 0]),
+        ("{C}{X}", [0, 0, 0, 0, 0, 1]),
+        ("", [0, 0, 0, 0, 0, 0]),
+    ],
+    ids=["plain", "heavy", "hybrid-phyrexian", "colorless", "empty"],
+)
+def test_count_pips(mana_cost, expected):
+    # Act
+
+    counts = count_pips(mana_cost)
+
+    # Assert
+
+    assert counts == expected
+
+
+@pytest.mark.parametrize(
+    "type_line,expected",
+    [
+        ("Legendary Artifact Creature — Golem", TYPE_BITS["Artifact"] | TYPE_BITS["Creature"]),
+        ("Basic Land — Forest", TYPE_BITS["Land"]),
+        ("Creature — Elf // Land", TYPE_BITS["Creature"]),
+    ],
+    ids=["multiple", "land", "front-face"],
+)
+def test_type_mask(type_line, expected):
+    # Act
+
+    mask = type_mask(type_line)
+
+    # Assert
+
+    assert mask == expected
+
+
+def test_deck_stats(card_data):
+    # Arrange
+
+    deck = card_data.resolve_decklist(
+        "Commander\n1 Atraxa, Praetors' Voice\nDeck\n1 Sol Ring\n1 Counterspell\n2 Viscera Seer\n36 Forest"
+    )
+    card_ids, quantities = deck.section("commander", "main")
+
+    # Act
+
+    stats = deck_stats(card_data.table, card_ids, quantities)
+
+    # Assert
+
+    assert (stats.cards, stats.lands) == (41, 36)
+    assert stats.curve.tolist() == [0, 3, 1, 0, 1, 0, 0, 0]
+    assert stats.average_mana_value == pytest.approx(9 / 5)
+    assert stats.pips == {"W": 1, "U": 3, "B": 3, "G": 1}
+    assert stats.heaviest["U"] == 2
+    assert stats.types == {"Creature": 3, "Artifact": 1, "Instant": 1, "Land": 36}
+
+
+def test_stats_command(card_data):
+    # Arrange
+
+    deck_command = DeckCommand(card_data)
+    deck_command.import_deck(1, "1 Sol Ring\n1 Lightning Bolt\n1 Forest")
+
+    # Act
+
+    embeds = deck_command.stats(1)
+    missing = deck_command.stats(2)
+
+    # Assert
+
+    fields = {field.name: field.value for field in embeds[0].fields}
+    assert embeds[0].title == "Deck stats: 3 cards"
+    assert "1 lands (33%)" in embeds[0].description
+    assert fields["Color pips"].startswith("R 1 (100%")
+    assert "/deck import" in missing[0].description
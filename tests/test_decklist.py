@@ -0,0 +1,127 @@
+import pytest
+from src.commands.deck import DeckCommand
+from src.data.decklist import NO_CARD, DeckEntry, parse_decklist
+
+
+@pytest.mark.parametrize(
+    "line,expected",
+    [
+        ("1 Sol Ring", DeckEntry(1, "Sol Ring", "main")),
+        ("2x Lightning Bolt", DeckEntry(2, "Lightning Bolt", "main")),
+        ("Counterspell", DeckEntry(1, "Counterspell", "main")),
+        ("1 Sol Ring (C21) 263 *F*", DeckEntry(1, "Sol Ring", "main", "c21", "263")),
+        ("1x Sol Ring (c21) 263 [Ramp] ^Have,#37d67a^", DeckEntry(1, "Sol Ring", "main", "c21", "263")),
+        ("1 Atraxa, Praetors' Voice *CMDR*", DeckEntry(1, "Atraxa, Praetors' Voice", "commander")),
+        ("1x Thrasios, Triton Hero [Commander{top}]", DeckEntry(1, "Thrasios, Triton Hero", "commander")),
+        ("SB: 1 Counterspell", DeckEntry(1, "Counterspell", "sideboard")),
+    ],
+    ids=["plain", "x-quantity", "bare-name", "arena", "archidekt", "cmdr-marker", "commander-tag", "sb-prefix"],
+)
+def test_parse_line_formats(line, expected):
+    # Act
+
+    entries = parse_decklist(line)
+
+    # Assert
+
+    assert entries == [expected]
+
+
+def test_parse_sections():
+    # Arrange
+
+    text = "\n".join([
+        "About", "Name Four Color Goodstuff", "",
+        "Commander", "1 Atraxa, Praetors' Voice", "",
+        "Creatures (1)", "1 Viscera Seer",
+        "// Instants", "1 Counterspell", "# a comment",
+        "Sideboard", "1 Lightning Bolt",
+        "Maybeboard", "1 Forest",
+    ])
+
+    # Act
+
+    entries = parse_decklist(text)
+
+    # Assert
+
+    assert [(entry.name, entry.section) for entry in entries] == [
+        ("Atraxa, Praetors' Voice", "commander"),
+        ("Viscera Seer", "main"),
+        ("Counterspell", "main"),
+        ("Lightning Bolt", "sideboard"),
+        ("Forest", "maybeboard"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("1 Sol Ring\n97 Forest\n\n1 Thrasios, Triton Hero\n1 Tymna the Weaver\n",
+         ["main", "main", "commander", "commander"]),
+        ("4 Lightning Bolt\n56 Forest\n\n2 Counterspell\n1 Sol Ring\n", ["main", "main", "sideboard", "sideboard"]),
+        ("1 Sol Ring\n\n1 Forest\n\n1 Counterspell\n", ["main", "main", "main"]),
+        ("1 Sol Ring\n\nSideboard\n1 Counterspell\n", ["main", "sideboard"]),
+        ("\n1 Sol Ring\n98 Forest\n\n\n", ["main", "main"]),
+    ],
+    ids=["mtgo-commander", "mtgo-sideboard", "several-breaks", "headed", "surrounding-blank-lines"],
+)
+def test_parse_mtgo_blank_line_split(text, expected):
+    # Act
+
+    entries = parse_decklist(text)
+
+    # Assert
+
+    assert [entry.section for entry in entries] == expected
+
+
+def test_fuzzy_matches_agree_with_decklist_resolution(card_data):
+    # Act
+
+    matches = card_data.fuzzy_matches("Counterspel", 3)
+    card_ids, _ = card_data.resolve_name_ids(["Counterspel"])
+
+    # Assert
+
+    assert matches[0][0] == "counterspell" == card_data.names[card_ids[0]]
+    assert matches[0][1] >= card_data.FUZZY_MATCH_SCORE and len(matches) == 3
+
+
+def test_resolve_decklist_batch(card_data):
+    # Arrange
+
+    text = "Commander\n1 Atraxa Praetors Voice\nDeck\n1 sol ring\n1 Lightning Blot\n30 Forest\n1 Nothing Like It"
+
+    # Act
+
+    deck = card_data.resolve_decklist(text)
+    main_ids, quantities = deck.section("commander", "main")
+
+    # Assert
+
+    assert deck.version == card_data.version
+    assert deck.matches == ["normalized", "exact", "fuzzy", "exact", ""]
+    assert deck.card_ids[-1] == NO_CARD
+    assert [card_data.get_card_by_id(card_id)["name"] for card_id in deck.commander_ids] == ["Atraxa, Praetors' Voice"]
+    assert len(main_ids) == 4 and quantities.sum() == 33
+    assert [entry.name for entry in deck.unresolved] == ["Nothing Like It"]
+
+
+def test_import_summarizes_and_keeps_deck(card_data):
+    # Arrange
+
+    deck_command = DeckCommand(card_data)
+
+    # Act
+
+    embeds = deck_command.import_deck(7, "1 Thrasios, Triton Hero *CMDR*\n1 Tymna the Weaver *CMDR*\n1 Lightning Blot")
+
+    # Assert
+
+    fields = {field.name: field.value for field in embeds[0].fields}
+    assert embeds[0].title == "Deck imported: 3 cards"
+    assert fields["Commanders"] == "Thrasios, Triton Hero, Tymna the Weaver"
+    assert fields["Corrected"] == "Lightning Blot → Lightning Bolt"
+    assert len(deck_command.get_deck(7).commander_ids) == 2
+    assert deck_command.get_deck(8) is None
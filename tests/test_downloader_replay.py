@@ -0,0 +1,91 @@
+import asyncio
+import json
+from benchmarks.fake_services import Cassette, FakeServices
+from benchmarks.synthetic_corpus import CorpusGenerator
+from src.data.card_data_downloader import CardDataDownloader
+
+
+def raw_cards() -> list:
+    return list(CorpusGenerator(scale=0.005, seed=2).raw_cards())
+
+
+async def download(services: FakeServices, data_dir) -> CardDataDownloader:
+    downloader = CardDataDownloader(
+        data_dir=data_dir,
+        scryfall_api=services.scryfall_api,
+        edhrec_api=services.edhrec_api,
+    )
+    downloader.RETRY_DELAY = 0
+    await downloader.download()
+    return downloader
+
+
+def test_download_retries_rate_limits_and_errors(tmp_path):
+    # Arrange
+
+    cards = raw_cards()
+    services = FakeServices(cards, rate_limit_rate=0.15, error_rate=0.15, retry_after=0, seed=5)
+
+    async def run() -> CardDataDownloader:
+        await services.start()
+        try:
+            return await download(services, tmp_path)
+        finally:
+            await services.stop()
+
+    # Act
+
+    downloader = asyncio.run(run())
+    saved = json.loads((tmp_path / "oracle_cards.json").read_text(encoding="utf-8"))
+
+    # Assert
+
+    assert services.stats["rate_limited"] and services.stats["errors"]
+    assert downloader.retries == services.stats["rate_limited"] + services.stats["errors"]
+    assert len(saved) == len(cards)
+    commanders = [card for card in saved.values() if CardDataDownloader._is_commander(card)]
+    assert commanders and all("edhrec_data" in card for card in commanders)
+    assert not (tmp_path / "oracle_cards.download").exists()
+
+
+def test_record_then_replay_offline(tmp_path):
+    # Arrange
+
+    cassette_dir = tmp_path / "cassette"
+    upstream = FakeServices(raw_cards())
+
+    async def record():
+        await upstream.start()
+        recorder = FakeServices(cassette=Cassette(cassette_dir), record=True, upstreams={
+            "scryfall": f"{upstream.base_url}/scryfall",
+            "scryfall-data": f"{upstream.base_url}/scryfall-data",
+            "edhrec": f"{upstream.base_url}/edhrec",
+        })
+        await recorder.start()
+        try:
+            await download(recorder, tmp_path / "recorded")
+        finally:
+            await recorder.stop()
+            await upstream.stop()
+
+    async def replay() -> FakeServices:
+        replayer = FakeServices(cassette=Cassette(cassette_dir))
+        await replayer.start()
+        try:
+            await download(replayer, tmp_path / "replayed")
+        finally:
+            await replayer.stop()
+        return replayer
+
+    # Act
+
+    asyncio.run(record())
+    replayer = asyncio.run(replay())
+
+    # Assert
+
+    recorded = (tmp_path / "recorded" / "oracle_cards.json").read_text(encoding="utf-8")
+    replayed = (tmp_path / "replayed" / "oracle_cards.json").read_text(encoding="utf-8")
+    assert replayed == recorded
+    assert replayer.stats["replayed"] == replayer.stats["requests"] > 0
+    assert replayer.stats["synthesized"] == 0
@@ -0,0 +1,66 @@
+import json
+import pytest
+from src.data.edhrec_lists import EdhrecCard, EdhrecLists, encode_cardlists
+
+CARDLISTS = [
+    {"tag": "highsynergycards", "header": "High Synergy Cards", "cardviews": [
+        {"name": "Fire // Ice", "synergy": 0.31, "num_decks": 120, "potential_decks": 400},
+        {"name": "Sol Ring", "synergy": -0.05, "inclusion": 390, "potential_decks": 400},
+        {"name": "Wear // Tear", "synergy": None, "num_decks": 0, "potential_decks": 0},
+        {"synergy": 0.5},
+    ]},
+    {"tag": "newcards", "header": "New Cards", "cardviews": []},
+    {"header": "Untagged", "cardviews": [{"name": "Forest", "synergy": 0.0, "num_decks": 7, "potential_decks": 10}]},
+]
+
+
+def test_cardlists_round_trip():
+    # Arrange
+
+    stored = json.loads(json.dumps({"cardlists": encode_cardlists(CARDLISTS), "potential_decks": 400}))
+
+    # Act
+
+    lists = EdhrecLists(stored)
+
+    # Assert
+
+    assert lists.tags == ["highsynergycards", "newcards", "section2"]
+    assert lists.header("highsynergycards") == "High Synergy Cards"
+    assert lists.section("highsynergycards") == [
+        EdhrecCard("Fire // Ice", 0.31, 120, 400),
+        EdhrecCard("Sol Ring", -0.05, 390, 400),
+        EdhrecCard("Wear // Tear", 0.0, 0, 0),
+    ]
+    assert lists.section("newcards") == []
+    assert lists.section("section2")[0].inclusion == pytest.approx(0.7)
+    assert lists.section("highsynergycards")[2].inclusion == 0.0
+    assert lists.section("missing") == [] and lists.find("missing", "newcards") == "newcards"
+    assert lists.potential_decks == 400
+
+
+def test_section_limit():
+    # Act
+
+    encoded = encode_cardlists(CARDLISTS, limit=1)
+
+    # Assert
+
+    assert [card.name for card in EdhrecLists({"cardlists": encoded}).section("highsynergycards")] == ["Fire // Ice"]
+
+
+@pytest.mark.parametrize(
+    "synergies,expected_tags",
+    [(CARDLISTS[0], ["highsynergycards"]), ([], [])],
+    ids=["raw-synergy-list", "empty"],
+)
+def test_legacy_synergies_fallback(synergies, expected_tags):
+    # Act
+
+    lists = EdhrecLists({"synergies": synergies})
+
+    # Assert
+
+    assert lists.tags == expected_tags
+    if expected_tags:
+        assert [card.name for card in lists.section(expected_tags[0])] == ["Fire // Ice", "Sol Ring", "Wear // Tear"]
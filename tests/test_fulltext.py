@@ -0,0 +1,79 @@
+import pytest
+from src.data.fulltext import FullTextIndex, tokenize
+
+DOCUMENTS = [
+    ("Whenever you sacrifice a creature, draw a card.", "Enchantment"),
+    ("Sacrifice a creature: Scry 1.", "Creature — Vampire Wizard"),
+    ("Whenever a creature you control dies, you may sacrifice it.", "Creature — Zombie"),
+    ("Draw two cards.", "Sorcery"),
+    ("Flying\nWhenever you sacrifice a permanent, each opponent loses 1 life.", "Creature — Demon"),
+]
+
+
+@pytest.fixture
+def index() -> FullTextIndex:
+    return FullTextIndex(DOCUMENTS)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("Draw a card.", ["draw", "a", "card"]),
+        ("Urza’s Saga", ["urza's", "saga"]),
+        ("{T}: Add {C}{C}.", ["t", "add", "c", "c"]),
+    ],
+    ids=["punctuation", "curly_apostrophe", "mana_symbols"],
+)
+def test_tokenize(text: str, expected: list):
+    # Act
+
+    result = tokenize(text)
+
+    # Assert
+
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ('"whenever you sacrifice"', {0, 4}),
+        ("sacrifice creature", {0, 1, 2, 4}),
+        ('"sacrifice a creature" draw', {0}),
+        ("creature", {0, 1, 2, 4}),
+        ('"creature flying"', set()),
+        ("nonexistentword", set()),
+    ],
+    ids=["phrase", "all_terms", "phrase_and_term", "type_line", "no_cross_field_phrase", "unknown_term"],
+)
+def test_search_matches(index: FullTextIndex, query: str, expected: set):
+    # Act
+
+    card_ids, scores = index.search(query)
+
+    # Assert
+
+    assert set(card_ids.tolist()) == expected
+    assert len(scores) == len(card_ids)
+
+
+def test_search_ranks_by_bm25(index: FullTextIndex):
+    # Act
+
+    card_ids, scores = index.search("sacrifice")
+
+    # Assert
+
+    assert list(scores) == sorted(scores, reverse=True)
+    # The shortest document mentioning the term ranks first
+    assert card_ids[0] == 1
+
+
+def test_card_data_search_text(card_data):
+    # Act
+
+    result = card_data.search_text('"scry 1"', limit=5)
+
+    # Assert
+
+    assert {card["name"] for card in result} == {"Thrasios, Triton Hero", "Viscera Seer"}
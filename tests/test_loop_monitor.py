@@ -0,0 +1,57 @@
+import asyncio
+import time
+from src.monitoring.loop_monitor import LoopMonitor
+
+
+async def blocking_handler():
+    # CPU work on the event loop, like a large fuzzy match
+    time.sleep(0.3)
+
+
+def test_loop_monitor_traces_blocking_coroutine(tmp_path):
+    # Arrange
+
+    log_file = tmp_path / "logs" / "loop_monitor.log"
+    monitor = LoopMonitor(threshold=0.1, interval=0.02, log_file=log_file)
+
+    async def run():
+        monitor.start()
+        try:
+            await asyncio.sleep(0.05)
+            await asyncio.create_task(blocking_handler())
+            await asyncio.sleep(0.05)
+        finally:
+            monitor.stop()
+
+    # Act
+
+    asyncio.run(run())
+
+    # Assert
+
+    assert [stall.coroutine for stall in monitor.stalls] == ["blocking_handler"]
+    assert "time.sleep(0.3)" in monitor.stalls[0].stack
+    log = log_file.read_text()
+    assert "Slow callback in blocking_handler" in log
+    assert "Event loop blocked for" in log
+
+
+def test_loop_monitor_quiet_loop(tmp_path):
+    # Arrange
+
+    monitor = LoopMonitor(threshold=0.1, interval=0.01)
+
+    async def run():
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+        finally:
+            monitor.stop()
+
+    # Act
+
+    asyncio.run(run())
+
+    # Assert
+
+    assert list(monitor.stalls) == []
@@ -0,0 +1,130 @@
+import asyncio
+import aiohttp
+import pytest
+from src.monitoring.metrics import Registry, _Metric, start_metrics_server
+
+
+@pytest.fixture
+def registry() -> Registry:
+    return Registry()
+
+
+def test_histogram_render(registry):
+    # Arrange
+
+    histogram = registry.histogram("stage_seconds", "Stage latency", ("stage",), buckets=(0.01, 0.1))
+
+    # Act
+
+    for value in (0.005, 0.01, 0.05, 3.0):
+        histogram.labels("fuzzy").observe(value)
+    lines = registry.render().splitlines()
+
+    # Assert
+
+    assert lines == [
+        "# HELP stage_seconds Stage latency",
+        "# TYPE stage_seconds histogram",
+        'stage_seconds_bucket{stage="fuzzy",le="0.01"} 2',
+        'stage_seconds_bucket{stage="fuzzy",le="0.1"} 3',
+        'stage_seconds_bucket{stage="fuzzy",le="+Inf"} 4',
+        'stage_seconds_sum{stage="fuzzy"} 3.065',
+        'stage_seconds_count{stage="fuzzy"} 4',
+    ]
+
+
+def test_counter_and_timer(registry):
+    # Arrange
+
+    counter = registry.counter("lookups_total", "Lookups", ("tier",))
+    histogram = registry.histogram("seconds", "Latency")
+
+    # Act
+
+    counter.labels("exact").inc()
+    counter.labels("exact").inc()
+    counter.labels("fuzzy_single").inc()
+    with histogram.labels().time() as timer:
+        pass
+    output = registry.render()
+
+    # Assert
+
+    assert 'lookups_total{tier="exact"} 2' in output
+    assert 'lookups_total{tier="fuzzy_single"} 1' in output
+    assert "seconds_count 1" in output and timer.elapsed >= 0
+    with pytest.raises(ValueError):
+        counter.labels("exact", "extra")
+
+
+def test_histogram_capture_samples(registry):
+    # Arrange
+
+    histogram = registry.histogram("stage_seconds", "Stage latency", ("stage",))
+    histogram.labels("fuzzy").observe(1.0)
+
+    # Act
+
+    histogram.capture_samples()
+    histogram.labels("fuzzy").observe(0.2)
+    histogram.labels("defer").observe(0.3)
+    captured = histogram.samples()
+    histogram.capture_samples(False)
+    histogram.labels("fuzzy").observe(0.4)
+
+    # Assert
+
+    assert captured == {("fuzzy",): [0.2], ("defer",): [0.3]}
+    assert histogram.samples() == {}
+    assert histogram.labels("fuzzy").count == 3
+
+
+def test_metrics_endpoint(registry):
+    # Arrange
+
+    registry.counter("requests_total", "Requests").inc(3)
+
+    async def scrape() -> str:
+        runner = await start_metrics_server("127.0.0.1", 0, registry)
+        try:
+            port = runner.addresses[0][1]
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{port}/metrics") as response:
+                    return await response.text()
+        finally:
+            await runner.cleanup()
+
+    # Act
+
+    body = asyncio.run(scrape())
+
+    # Assert
+
+    assert "requests_total 3" in body
+
+
+def test_metrics_server_skips_a_busy_port(registry):
+    # Arrange
+
+    async def start_twice():
+        first = await start_metrics_server("127.0.0.1", 0, registry)
+        try:
+            port = first.addresses[0][1]
+            return await start_metrics_server("127.0.0.1", port, registry)
+        finally:
+            await first.cleanup()
+
+    # Act
+
+    second = asyncio.run(start_twice())
+
+    # Assert
+
+    assert second is None
+
+
+def test_metric_families_must_render_children():
+    # Act / Assert
+
+    with pytest.raises(TypeError, match="abstract"):
+        _Metric("incomplete", "Missing the child hooks")
@@ -0,0 +1,68 @@
+import pytest
+from benchmarks.micro import compare
+
+
+def make_results(calibration: float, **seconds_per_op: float) -> dict:
+    return {
+        "fixture": "abc123",
+        "calibration": calibration,
+        "results": {name: {"seconds_per_op": seconds} for name, seconds in seconds_per_op.items()},
+    }
+
+
+@pytest.mark.parametrize(
+    "current, expected_status",
+    [
+        (1.2, "ok"),
+        (1.3, "regression"),
+        (0.7, "faster"),
+    ],
+    ids=["within_tolerance", "regression", "faster"],
+)
+def test_compare_uses_tolerance(current, expected_status):
+    # Arrange
+
+    baseline = make_results(1.0, get_card=1.0)
+    results = make_results(1.0, get_card=current)
+
+    # Act
+
+    comparisons = compare(results, baseline, tolerance=0.25)
+
+    # Assert
+
+    assert [comparison.status for comparison in comparisons] == [expected_status]
+
+
+def test_compare_reports_scaled_ratio_and_new():
+    # Arrange
+
+    baseline = make_results(1.0, load_cards=1.0)
+    # Everything ran twice as slowly, including the calibration workload
+    results = make_results(2.0, load_cards=2.2, fuzzy_execute=0.5)
+
+    # Act
+
+    comparisons = compare(results, baseline, tolerance=0.25)
+
+    # Assert
+
+    assert [(comparison.name, comparison.status) for comparison in comparisons] == [
+        ("load_cards", "regression"),
+        ("fuzzy_execute", "new"),
+    ]
+    assert comparisons[0].ratio == pytest.approx(2.2)
+    assert comparisons[0].scaled_ratio == pytest.approx(1.1)
+    assert comparisons[1].ratio is None and comparisons[1].scaled_ratio is None
+
+
+def test_compare_rejects_other_fixture():
+    # Arrange
+
+    baseline = make_results(1.0, get_card=1.0)
+    results = {**make_results(1.0, get_card=1.0), "fixture": "def456"}
+
+    # Act / Assert
+
+    with pytest.raises(ValueError, match="--update-baseline"):
+        compare(results, baseline)
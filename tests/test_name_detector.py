@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from src.commands.card_info import CardInfoCommand
+from src.commands.card_mentions import CardMentionHandler
+from src.data.name_detector import NameDetector
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("is sol ring better than LIGHTNING BOLT?", ["Sol Ring", "Lightning Bolt"]),
+        ("Atraxa Praetors' Voice and Atraxa, Praetors’ Voice", ["Atraxa, Praetors' Voice"]),
+        ("I tapped a forest for counterspells", []),
+        ("solring and bolt", []),
+    ],
+    ids=["several", "punctuation_and_repeats", "common_and_partial_words", "no_whole_words"],
+)
+def test_detect(card_data, text, expected):
+    # Arrange
+
+    detector = NameDetector(card_data)
+
+    # Act
+
+    names = [card_data.names[card_id] for card_id in detector.detect(text)]
+
+    # Assert
+
+    assert [card_data.get_card(name)["name"] for name in names] == expected
+
+
+def test_detector_built_once_per_version(card_data):
+    # Act
+
+    first = NameDetector.for_card_data(card_data)
+    second = NameDetector.for_card_data(card_data)
+
+    # Assert
+
+    assert first is second and first.version == card_data.version
+
+
+def test_handler_detects_only_in_opted_in_channels(card_data):
+    # Arrange
+
+    handler = CardMentionHandler(CardInfoCommand(card_data), detect_channels=[1])
+
+    # Act
+
+    opted_in = asyncio.run(handler.handle(1, "sol ring is great", now=0.0))
+    other = asyncio.run(handler.handle(2, "sol ring is great", now=0.0))
+
+    # Assert
+
+    assert [embed.title for embed in opted_in] == ["Sol Ring {1}"]
+    assert other == []
@@ -0,0 +1,113 @@
+import numpy as np
+import pytest
+from src.commands.deck import DeckCommand
+from src.data.combos import Combo, ComboIndex
+from src.data.power import BracketEstimator, power_features, tag_power_features
+from tests.conftest import make_card
+
+
+@pytest.mark.parametrize(
+    "card,expected",
+    [
+        (make_card("Sol Ring", type_line="Artifact", cmc=1.0, oracle_text="{T}: Add {C}{C}."), ["fast_mana"]),
+        (make_card("Dark Ritual", cmc=1.0, oracle_text="Add {B}{B}{B}."), ["fast_mana"]),
+        (make_card("Mox Opal", type_line="Legendary Artifact", cmc=0.0,
+                   oracle_text="Metalcraft — {T}: Add one mana of any color."), ["fast_mana"]),
+        (make_card("Arcane Signet", type_line="Artifact", cmc=2.0,
+                   oracle_text="{T}: Add one mana of any color in your commander's color identity."), []),
+        (make_card("Ancient Tomb", type_line="Land", oracle_text="{T}: Add {C}{C}."), []),
+        (make_card("Demonic Tutor", type_line="Sorcery", cmc=2.0,
+                   oracle_text="Search your library for a card, put that card into your hand, then shuffle."),
+         ["tutor"]),
+        (make_card("Cultivate", type_line="Sorcery", cmc=3.0,
+                   oracle_text="Search your library for up to two basic land cards, reveal those cards."), []),
+        (make_card("Wooded Foothills", type_line="Land",
+                   oracle_text="{T}, Pay 1 life, Sacrifice Wooded Foothills: Search your library for a Mountain or "
+                               "Forest card, put it onto the battlefield, then shuffle."), []),
+        (make_card("Marsh Flats", type_line="Land",
+                   oracle_text="{T}, Pay 1 life, Sacrifice Marsh Flats: Search your library for a Plains or "
+                               "Swamp card, put it onto the battlefield, then shuffle."), []),
+        (make_card("Nature's Lore", type_line="Sorcery", cmc=2.0,
+                   oracle_text="Search your library for a Forest card, put that card onto the battlefield, "
+                               "then shuffle."), []),
+        (make_card("Mystical Tutor", type_line="Instant", cmc=1.0,
+                   oracle_text="Search your library for an instant or sorcery card, reveal it, then shuffle and "
+                               "put that card on top."), ["tutor"]),
+        (make_card("Landfall Tutor", type_line="Sorcery", cmc=2.0,
+                   oracle_text="Search your library for a card with landfall, reveal it, put it into your hand, "
+                               "then shuffle."), ["tutor"]),
+        (make_card("Time Warp", type_line="Sorcery", cmc=5.0, oracle_text="Target player takes an extra turn after this one."),
+         ["extra_turn"]),
+        (make_card("Armageddon", type_line="Sorcery", cmc=4.0, oracle_text="Destroy all lands."),
+         ["mass_land_denial"]),
+    ],
+    ids=["sol-ring", "ritual", "mox", "signet", "land", "tutor", "land-search", "fetch-land",
+         "fetch-land-plains", "natures-lore", "instant-tutor", "landfall-tutor", "extra-turn", "armageddon"],
+)
+def test_power_features(card, expected):
+    # Act
+
+    features = power_features(card)
+
+    # Assert
+
+    assert features == expected
+
+
+def test_snapshot_tags_are_preferred(tmp_path, card_data):
+    # Arrange
+
+    cards = [make_card("Sol Ring", cmc=1.0, oracle_text="{T}: Add {C}{C}.")]
+
+    # Act
+
+    tagged = tag_power_features(cards)
+
+    # Assert
+
+    assert tagged == 1 and cards[0]["power_features"] == ["fast_mana"]
+    sol_ring = card_data.card_ids["sol ring"]
+    assert card_data.table.power[sol_ring] == 1
+
+
+def test_estimate_sums_features_and_applies_minimums(card_data):
+    # Arrange
+
+    table = card_data.table
+    sol_ring, forest = card_data.card_ids["sol ring"], card_data.card_ids["forest"]
+    table.power[forest] = 8  # Pretend Forest is mass land denial
+    table.edhrec_rank[sol_ring] = 1
+    estimator = BracketEstimator(table, combo_pieces=np.isin(np.arange(table.size), [sol_ring]))
+
+    # Act
+
+    casual = estimator.estimate(np.array([card_data.card_ids["counterspell"]]), np.array([1]))
+    estimate = estimator.estimate(np.array([sol_ring, forest]), np.array([1, 1]))
+
+    # Assert
+
+    assert (casual.bracket, casual.score) == (1, 0.0)
+    assert estimate.counts == {"fast_mana": 1, "tutor": 0, "extra_turn": 0, "mass_land_denial": 1,
+                               "combo_piece": 1, "staple": 1}
+    assert estimate.score == pytest.approx(3.0 + 4.0 + 1.5 + 0.25)
+    assert estimate.bracket == 4 and estimate.reasons == ["mass land denial"]
+
+
+def test_bracket_command_uses_combo_pieces(card_data):
+    # Arrange
+
+    deck_command = DeckCommand(card_data)
+    deck_command.import_deck(1, "1 Sol Ring\n1 Viscera Seer\n1 Forest")
+    without_combos = deck_command.bracket(1)
+    deck_command.combos = ComboIndex.for_card_data([Combo("1", ["Viscera Seer", "Forest"], [])], card_data)
+
+    # Act
+
+    embeds = deck_command.bracket(1)
+
+    # Assert
+
+    assert embeds[0].title == "Deck bracket: 2 (Core)"
+    assert embeds[0].description.startswith("Power score 6.0")
+    assert "Two-card combo pieces: 2" in embeds[0].fields[0].value
+    assert without_combos[0].description.startswith("Power score 3.0")
@@ -0,0 +1,99 @@
+import asyncio
+import threading
+import time
+from src.commands.debug import DebugCommand
+from src.monitoring.profiler import MAX_INTERVAL, SamplingProfiler
+
+
+def busy_work(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_profile_samples_other_threads(tmp_path):
+    # Arrange
+
+    stop = threading.Event()
+    worker = threading.Thread(target=busy_work, args=(stop,), name="worker")
+    worker.start()
+
+    # Act
+
+    try:
+        result = SamplingProfiler().profile(0.2)
+    finally:
+        stop.set()
+        worker.join()
+    path = result.write_collapsed(tmp_path / "profile.folded")
+
+    # Assert
+
+    assert result.samples > 0 and 0.2 <= result.duration < 1
+    assert any(stack.startswith("worker;") and "busy_work (test_profiler.py" in stack for stack in result.stacks)
+    assert any("busy_work" in frame for frame, _ in result.top(5, inclusive=True))
+    line = path.read_text().splitlines()[0]
+    assert line.rsplit(" ", 1)[1].isdigit()
+
+
+def test_profile_caps_duration(monkeypatch):
+    # Arrange
+
+    monkeypatch.setattr("src.monitoring.profiler.MAX_SECONDS", 0.05)
+    started = time.perf_counter()
+
+    # Act
+
+    result = SamplingProfiler().profile(3600)
+
+    # Assert
+
+    assert time.perf_counter() - started < 1 and result.duration < 1
+
+
+def test_debug_profile_command(tmp_path):
+    # Arrange
+
+    command = DebugCommand(tmp_path / "profiles")
+
+    # Act
+
+    embed, path = asyncio.run(command.profile(0.1))
+
+    # Assert
+
+    assert embed.title.startswith("Profile:")
+    assert [field.name for field in embed.fields] == ["Top functions (self)", "Top functions (total)"]
+    assert path.exists() and path.suffix == ".folded"
+
+
+def test_profile_stops_when_over_budget(monkeypatch):
+    # Arrange
+
+    monkeypatch.setattr("src.monitoring.profiler.MAX_OVERHEAD", 0.0)
+
+    # Act
+
+    result = SamplingProfiler().profile(5)
+
+    # Assert
+
+    assert result.over_budget and result.duration < 1
+    assert result.interval == MAX_INTERVAL
+
+
+def test_debug_profile_rejects_overlapping_runs(tmp_path):
+    # Arrange
+
+    command = DebugCommand(tmp_path / "profiles")
+
+    async def profile_twice():
+        return await asyncio.gather(command.profile(0.1), command.profile(0.1))
+
+    # Act
+
+    (first, first_path), (second, second_path) = asyncio.run(profile_twice())
+
+    # Assert
+
+    assert first.title.startswith("Profile:") and first_path.exists()
+    assert second.description == "A profile is already running." and second_path is None
@@ -0,0 +1,122 @@
+import asyncio
+import numpy as np
+import pytest
+from src.commands.search import SearchCommand
+from src.data.query import And, Not, Or, QueryError, Term, parse_query
+
+
+def _names(card_data, query):
+    return {card_data.get_card_by_id(int(card_id))["name"] for card_id in card_data.query_engine.search(query)}
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("t:creature", Term("type", ":", "creature")),
+        ('o:"draw a card"', Term("oracle", ":", "draw a card")),
+        ("mv>=3", Term("mv", ">=", "3")),
+        ("sol ring", And([Term("name", ":", "sol"), Term("name", ":", "ring")])),
+        ("-t:land", Not(Term("type", ":", "land"))),
+        ("t:elf or t:goblin", Or([Term("type", ":", "elf"), Term("type", ":", "goblin")])),
+        (
+            "(t:elf OR t:goblin) id<=rg",
+            And([Or([Term("type", ":", "elf"), Term("type", ":", "goblin")]), Term("identity", "<=", "rg")]),
+        ),
+    ],
+    ids=["type", "quoted_oracle", "comparison", "implicit_and", "negation", "or", "parentheses"],
+)
+def test_parse_query(query: str, expected):
+    # Act
+
+    result = parse_query(query)
+
+    # Assert
+
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "query",
+    ["", "foo:bar", "(t:elf", "t:elf)", "or", 'o:""', 'name:""', '""'],
+    ids=["empty", "unknown_keyword", "missing_close", "missing_open", "dangling_or",
+         "empty_oracle", "empty_name", "empty_quoted_word"],
+)
+def test_parse_query_errors(query: str):
+    # Act & Assert
+
+    with pytest.raises(QueryError):
+        parse_query(query)
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("t:legendary t:creature", {"Atraxa, Praetors' Voice", "Thrasios, Triton Hero", "Tymna the Weaver"}),
+        ('o:partner -o:"partner with"', {"Thrasios, Triton Hero", "Tymna the Weaver"}),
+        ("id<=ub", {"Sol Ring", "Counterspell", "Viscera Seer"}),
+        ("id>=wb", {"Atraxa, Praetors' Voice", "Tymna the Weaver"}),
+        ("id=c", {"Sol Ring"}),
+        ("mv>=3 is:commander", {"Atraxa, Praetors' Voice", "Tymna the Weaver"}),
+        ("r>=rare t:creature", {"Atraxa, Praetors' Voice", "Thrasios, Triton Hero", "Tymna the Weaver"}),
+        ("-f:modern", {"Sol Ring"}),
+        ("s:c21", {"Sol Ring"}),
+        ("bolt or o:scry", {"Lightning Bolt", "Thrasios, Triton Hero", "Viscera Seer"}),
+        ("t:wizard (id:b or id:r)", {"Viscera Seer"}),
+    ],
+    ids=[
+        "types", "partner_not_partner_with", "identity_subset", "identity_superset", "colorless",
+        "mana_value_commander", "rarity", "not_legal", "set", "name_or_oracle", "nested",
+    ],
+)
+def test_query_engine_search(card_data, query: str, expected: set):
+    # Act
+
+    result = _names(card_data, query)
+
+    # Assert
+
+    assert result == expected
+
+
+def test_query_engine_unknown_format(card_data):
+    # Act & Assert
+
+    with pytest.raises(QueryError):
+        card_data.query_engine.search("f:notaformat")
+
+
+@pytest.mark.parametrize(
+    "query",
+    ['o:""', 'name:""', '""'],
+    ids=["empty_oracle", "empty_name", "empty_quoted_word"],
+)
+def test_search_command_reports_empty_values(card_data, query: str):
+    # Arrange
+
+    command = SearchCommand(card_data)
+
+    # Act
+
+    embeds, _ = asyncio.run(command.execute(query))
+
+    # Assert
+
+    assert embeds[0].title == "Invalid Search"
+
+
+def test_text_column_empty_needle(card_data):
+    # Arrange
+
+    column = card_data.table.oracle_text
+    candidates = np.zeros(card_data.table.size, dtype=bool)
+    candidates[0] = True
+
+    # Act
+
+    everything = column.contains("")
+    some = column.contains("", candidates)
+
+    # Assert
+
+    assert everything.all() and everything.shape == (card_data.table.size,)
+    assert some.tolist() == candidates.tolist()
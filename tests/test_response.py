@@ -0,0 +1,104 @@
+import asyncio
+import discord
+import pytest
+from src.commands.response import EMPTY_RESPONSE, pack_embeds, send_embeds
+
+
+class FakeResponse:
+    def __init__(self, deferred: bool):
+        self.deferred = deferred
+        self.sent = []
+
+    def is_done(self) -> bool:
+        return self.deferred or bool(self.sent)
+
+    async def send_message(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, **kwargs):
+        self.sent.append(kwargs)
+
+
+class FakeInteraction:
+    def __init__(self, deferred: bool = True):
+        self.response = FakeResponse(deferred)
+        self.followup = FakeFollowup()
+
+
+@pytest.mark.parametrize(
+    "sizes,expected",
+    [
+        ([100] * 3, [3]),
+        ([100] * 23, [10, 10, 3]),
+        ([2500, 2500, 2500, 100], [2, 2]),
+        ([], []),
+    ],
+    ids=["one_message", "embed_count_limit", "character_limit", "empty"],
+)
+def test_pack_embeds(sizes, expected):
+    # Arrange
+
+    embeds = [discord.Embed(description="x" * size) for size in sizes]
+
+    # Act
+
+    messages = pack_embeds(embeds)
+
+    # Assert
+
+    assert [len(message) for message in messages] == expected
+    assert [embed for message in messages for embed in message] == embeds
+
+
+def test_send_embeds_attaches_view_once():
+    # Arrange
+
+    interaction = FakeInteraction(deferred=True)
+    embeds = [discord.Embed(description="x" * 100) for _ in range(12)]
+    view = object()
+
+    # Act
+
+    calls = asyncio.run(send_embeds(interaction, embeds, view))
+
+    # Assert
+
+    sent = interaction.followup.sent
+    assert calls == 3  # The defer plus two followups
+    assert [len(message["embeds"]) for message in sent] == [10, 2]
+    assert "view" not in sent[0] and sent[1]["view"] is view
+
+
+def test_send_embeds_without_defer():
+    # Arrange
+
+    interaction = FakeInteraction(deferred=False)
+
+    # Act
+
+    calls = asyncio.run(send_embeds(interaction, [discord.Embed(title="Sol Ring")]))
+
+    # Assert
+
+    assert calls == 1
+    assert len(interaction.response.sent) == 1 and interaction.followup.sent == []
+
+
+def test_send_embeds_answers_with_no_embeds():
+    # Arrange
+
+    interaction = FakeInteraction(deferred=True)
+
+    # Act
+
+    calls = asyncio.run(send_embeds(interaction, []))
+
+    # Assert
+
+    assert calls == 2
+    assert [message["embeds"][0].description for message in interaction.followup.sent] == [EMPTY_RESPONSE]
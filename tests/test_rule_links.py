@@ -0,0 +1,113 @@
+import pytest
+from src.data.aho_corasick import AhoCorasick
+from src.data.rules_index import RulesIndex
+from src.data.rule_links import RuleLinker, keyword_patterns
+
+
+@pytest.fixture
+def rules_index() -> RulesIndex:
+    rules = {
+        "701": "Keyword Actions",
+        "701.1": "Most actions described in a card's rules text use the normal English definitions of the verbs.",
+        "701.2": "Tap and Untap",
+        "701.2a": "To tap a permanent, turn it sideways from an upright position.",
+        "701.3": "Sacrifice",
+        "702": "Keyword Abilities",
+        "702.2": "Deathtouch",
+        "702.7": "First Strike",
+        "702.15": "Lifelin k",
+    }
+    glossary = {
+        "Deathtouch": "A keyword ability that causes damage dealt by an object to be especially effective. "
+                      "See rule 702.2, “Deathtouch.”",
+        "First Strike": "A keyword ability that lets a creature deal its combat damage before other creatures. "
+                        "See rule 702.7, “First Strike.”",
+        "Lifelink": "A keyword ability that causes a player to gain life. See rule 702.15 , “Lifelink.”",
+        # Extraction merged the next entry into this one
+        "Blocking Creature": "A creature that has been declared as a blocker. Bloodthirst A keyword ability "
+                             "that can have a creature enter with counters. See rule 702.2.",
+    }
+    return RulesIndex.from_rules("hash", rules, glossary)
+
+
+def test_aho_corasick_finds_overlapping_patterns():
+    # Arrange
+
+    automaton = AhoCorasick({"he": 1, "she": 2, "hers": 3})
+
+    # Act
+
+    matches = list(automaton.iter("ushers", whole_words=False))
+
+    # Assert
+
+    assert matches == [(1, 4, 2), (2, 4, 1), (2, 6, 3)]
+
+
+def test_aho_corasick_whole_words():
+    # Arrange
+
+    automaton = AhoCorasick({"strike": "s", "first strike": "fs"})
+
+    # Act
+
+    matches = [value for _, _, value in automaton.iter("first strike, double-striker, strike")]
+
+    # Assert
+
+    assert matches == ["fs", "s", "s"]
+
+
+def test_keyword_patterns(rules_index):
+    # Act
+
+    patterns = keyword_patterns(rules_index)
+
+    # Assert
+
+    assert patterns["first strike"] == "702.7"
+    assert patterns["lifelink"] == "702.15"
+    assert patterns["sacrificed"] == "701.3"
+    assert patterns["tapped"] == patterns["untaps"] == "701.2"
+    assert "blocking creature" not in patterns
+    assert not any(" " in pattern and pattern.replace(" ", "") in patterns for pattern in patterns)
+
+
+@pytest.mark.parametrize(
+    "oracle_text,expected",
+    [
+        ("First strike, deathtouch", ["702.2", "702.7"]),
+        ("Sacrifice a creature: Untap target land.", ["701.2", "701.3"]),
+        ("Lifelink\nWhenever this creature deals damage, you gain that much life.", ["702.15"]),
+        ("Draw a card.", []),
+    ],
+    ids=["abilities", "actions", "mangled_title", "none"],
+)
+def test_link(rules_index, oracle_text, expected):
+    # Arrange
+
+    linker = RuleLinker(rules_index)
+
+    # Act
+
+    numbers = linker.link(oracle_text)
+
+    # Assert
+
+    assert numbers == expected
+
+
+def test_link_cards(rules_index):
+    # Arrange
+
+    cards = [{"oracle_text": "Deathtouch"}, {"oracle_text": "Draw a card.", "rule_refs": ["702.2"]}]
+
+    # Act
+
+    linked = RuleLinker(rules_index).link_cards(cards)
+
+    # Assert
+
+    assert linked == 1
+    assert cards[0]["rule_refs"] == ["702.2"]
+    assert "rule_refs" not in cards[1]
@@ -0,0 +1,201 @@
+from pathlib import Path
+import pytest
+from src.commands.response import MAX_EMBED_CHARS
+from src.commands.rule import RuleCommand
+from src.data.rules_index import RulesIndex
+from src.data.rules_ingest import parse_rules
+
+RULES_TEXT = """Contents
+702. Keyword Abilities
+903. Commander
+
+Introduction mentions 704.5k is followed by 704.5m, for example.
+
+702.1. Most abilities describe exactly what they do in the card's rules text.
+702.2. Deathtouch
+702.2a Deathtouch is a static ability.
+702.2b A creature with toughness greater than 0 that's been dealt damage by a source with deathtouch since
+the last time state-based actions were checked is destroyed. See rule
+704.5h for more.
+702.2c Multiple instances of deathtouch on the same object are redundant.
+702.3. Vigilance
+702.3a Vigilance is a static ability that modifies the rules for the declare attackers step.
+903.1. In the Commander variant, each deck is led by a legendary creature designated as that deck's commander.
+
+Glossary
+
+Deathtouch
+A keyword ability that causes damage dealt by an object to be especially effective. See rule 702.2, "Deathtouch."
+
+Vigilance
+A keyword ability that lets a creature attack without tapping. See rule 702.3, "Vigilance."
+
+Credits
+"""
+
+
+@pytest.fixture
+def rules_index() -> RulesIndex:
+    rules, glossary = parse_rules(RULES_TEXT)
+    return RulesIndex.from_rules("hash", rules, glossary)
+
+
+def test_parse_rules_numbers_and_wrapped_lines():
+    # Act
+
+    rules, glossary = parse_rules(RULES_TEXT)
+
+    # Assert
+
+    assert list(rules) == [
+        "702", "702.1", "702.2", "702.2a", "702.2b", "702.2c", "702.3", "702.3a", "903", "903.1",
+    ]
+    assert rules["702"] == "Keyword Abilities"
+    # A wrapped line that starts with a rule number stays part of the rule
+    assert rules["702.2b"].endswith("See rule 704.5h for more.")
+    assert set(glossary) == {"Deathtouch", "Vigilance"}
+
+
+@pytest.mark.parametrize(
+    "number,expected",
+    [
+        ("702.2", ["702.2a", "702.2b", "702.2c"]),
+        ("702.2a", []),
+        ("702", ["702.1", "702.2", "702.2a", "702.2b", "702.2c", "702.3", "702.3a"]),
+        ("999.1", []),
+    ],
+    ids=["rule", "subrule", "section", "missing"],
+)
+def test_subrules(rules_index: RulesIndex, number: str, expected: list):
+    # Act
+
+    result = [child for child, _ in rules_index.subrules(number)]
+
+    # Assert
+
+    assert result == expected
+
+
+@pytest.mark.parametrize(
+    "query,expected",
+    [
+        ("deathtouch", ["702.2", "702.2a", "702.2b", "702.2c"]),
+        ("static ability", ["702.2a", "702.3a"]),
+        ('"static ability that"', ["702.3a"]),
+        ("legendary commander", ["903.1"]),
+        ("banding", []),
+    ],
+    ids=["single_word", "all_words", "phrase", "section_nine", "no_match"],
+)
+def test_search(rules_index: RulesIndex, query: str, expected: list):
+    # Act
+
+    result = rules_index.search(query)
+
+    # Assert
+
+    assert result == expected
+
+
+def test_round_trip_keeps_lookups(tmp_path, rules_index: RulesIndex):
+    # Arrange
+
+    path = tmp_path / "rules_index.json"
+
+    # Act
+
+    rules_index.save(path)
+    loaded = RulesIndex.load(path)
+
+    # Assert
+
+    assert loaded.get_rule("702.3") == "Vigilance"
+    assert loaded.search("deathtouch") == rules_index.search("deathtouch")
+    assert RulesIndex.is_rule_number("702.2b") and not RulesIndex.is_rule_number("flying")
+
+
+def test_lookup_cross_references():
+    # Arrange
+
+    rules = {
+        "509": "Declare Blockers Step",
+        "509.1": "First, the defending player declares blockers.",
+        "702": "Keyword Abilities",
+        "702.9": "Flying",
+        "702.9b": "A creature with flying can't be blocked except by creatures with flying and/or reach. "
+                  "(See rule 509, \"Declare Blockers Step,\" and rule 702.17, \"Reach.\")",
+        "702.17": "Reach",
+        "702.17b": "A creature with flying can't be blocked except by creatures with flying and/or reach. "
+                   "See rules 702.9 and 702.9b and rule 999.1.",
+    }
+    index = RulesIndex.from_rules("hash", rules, {})
+
+    # Act
+
+    context = index.lookup("702.9b")
+    section = index.lookup("702")
+
+    # Assert
+
+    assert context.parents == ["702", "702.9"]
+    assert context.cites == ["509", "702.17"]
+    assert context.cited_by == ["702.17b"]
+    assert index.lookup("702.17b").cites == ["702.9", "702.9b"]
+    assert index.lookup("509").cited_by == ["702.9b"]
+    assert section.parents == [] and index.lookup("999.1") is None
+
+
+def test_round_trip_keeps_cross_references(tmp_path, rules_index: RulesIndex):
+    # Arrange
+
+    path = tmp_path / "rules_index.json"
+
+    # Act
+
+    rules_index.save(path)
+    loaded = RulesIndex.load(path)
+
+    # Assert
+
+    assert loaded.lookup("702.2b") == rules_index.lookup("702.2b")
+    assert loaded.lookup("702.2b").parents == ["702", "702.2"]
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Magic: The Gathering Comprehensive Rules\n100. General\n", "Glossary\nAbility\n1. Text.\n"],
+    ids=["no-glossary", "no-rules"],
+)
+def test_unparseable_pdf_disables_rules(tmp_path, monkeypatch, text):
+    # Arrange
+
+    pdf_path = tmp_path / "MagicCompRules_20990101.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    monkeypatch.setattr("src.data.rules_ingest.extract_text", lambda path: text)
+
+    # Act
+
+    index = RulesIndex.load_or_build(pdf_path)
+
+    # Assert
+
+    assert index is None
+    assert not list(tmp_path.glob("rules_index_*.json"))
+
+
+def test_every_rule_embed_fits_discord_limit():
+    # Arrange
+
+    rules_pdfs = sorted((Path(__file__).parent.parent / "reference").glob("MagicCompRules_*.pdf"))
+    rules = RulesIndex.load_or_build(rules_pdfs[-1]) if rules_pdfs else None
+    if rules is None:
+        pytest.skip("No comprehensive rules PDF to index")
+    command = RuleCommand(rules)
+
+    # Act
+
+    lengths = {number: len(command._format_rule(number)) for number in rules.numbers}
+
+    # Assert
+
+    assert max(lengths.values()) <= MAX_EMBED_CHARS
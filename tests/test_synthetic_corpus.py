@@ -0,0 +1,64 @@
+import json
+from benchmarks.micro import fixture_digest, load_fixture
+from benchmarks.synthetic_corpus import FIXTURE, FIXTURE_SCALE, CorpusGenerator, write_corpus, write_fixture
+from src.data.card_data import CardData
+
+
+def test_snapshot_loads_into_card_data(tmp_path):
+    # Arrange
+
+    path = tmp_path / "oracle_cards.json"
+
+    # Act
+
+    written = write_corpus(CorpusGenerator(scale=0.02, seed=1), path)
+    card_data = CardData(path)
+
+    # Assert
+
+    assert written == len(card_data.cards) == 640
+    commanders = [card for card in card_data.cards.values() if "edhrec_data" in card]
+    assert commanders
+    edhrec = card_data.get_edhrec_lists(commanders[0])
+    assert all(entry.name.lower() in card_data.cards for tag in edhrec.tags for entry in edhrec.section(tag))
+    assert card_data.get_card("Forest")["color_identity"] == ["G"]
+
+
+def test_raw_corpus_is_deterministic_and_scryfall_shaped(tmp_path):
+    # Arrange
+
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+
+    # Act
+
+    write_corpus(CorpusGenerator(scale=0.02, seed=3), first, raw=True)
+    write_corpus(CorpusGenerator(scale=0.02, seed=3), second, raw=True)
+    cards = json.loads(first.read_text(encoding="utf-8"))
+
+    # Assert
+
+    assert first.read_bytes() == second.read_bytes()
+    multi_face = [card for card in cards if "card_faces" in card]
+    assert multi_face and all(" // " in card["name"] for card in multi_face)
+    assert all({"name", "layout", "type_line", "legalities", "color_identity"} <= card.keys() for card in cards)
+    assert any("all_parts" in card for card in cards)
+
+
+def test_micro_fixture_is_reproducible(tmp_path):
+    # Arrange
+
+    path = tmp_path / "fixture_cards.json.gz"
+
+    # Act
+
+    written = write_fixture(CorpusGenerator(FIXTURE_SCALE, seed=0), path)
+    raw_cards, edhrec = load_fixture(path)
+
+    # Assert
+
+    assert written == len(raw_cards) == 2500
+    assert not any("edhrec_data" in card for card in raw_cards)
+    assert edhrec and all("cardlists" in edhrec_data for edhrec_data in edhrec.values())
+    # The committed fixture must come from the generator; after changing it, run
+    # python -m benchmarks.synthetic_corpus --fixture and record a new baseline
+    assert fixture_digest(path) == fixture_digest(FIXTURE)